@@ -6,6 +6,7 @@ This simulates interactive usage of the flight agent
 
 import sys
 import os
+import traceback
 
 # Add SDK to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'aim-sdk-python'))
@@ -53,6 +54,5 @@ if __name__ == "__main__":
         main()
     except Exception as e:
         print(f"\n❌ Error: {e}")
-        import traceback
         traceback.print_exc()
         sys.exit(1)
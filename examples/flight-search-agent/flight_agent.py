@@ -11,16 +11,28 @@ Usage:
     python flight_agent.py
 """
 
+import atexit
 import os
 import sys
 import json
 import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+from operator import itemgetter
 from typing import Dict, List, Optional
 
 # Add parent directory to path for AIM SDK
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../sdks/python'))
 
+# readline is optional (not available on Windows) - used for history and tab completion
+try:
+    import readline
+    READLINE_AVAILABLE = True
+except ImportError:
+    READLINE_AVAILABLE = False
+
 try:
     from aim_sdk import secure, register_agent
     from aim_sdk.client import AIMClient
@@ -105,6 +117,52 @@ MOCK_FLIGHTS = {
     ]
 }
 
+# Stops are static in the mock data, so render the display text once at load time
+for _flights in MOCK_FLIGHTS.values():
+    for _flight in _flights:
+        _flight['stops_text'] = 'Direct' if _flight['stops'] == 0 else f"{_flight['stops']} stop(s)"
+
+# Flights per destination pre-sorted by price (cheapest first), built once at load
+# time so searches don't re-sort and the cheapest fare is always index 0
+MOCK_FLIGHTS_BY_PRICE = {
+    destination: sorted(flights, key=itemgetter('price'))
+    for destination, flights in MOCK_FLIGHTS.items()
+}
+
+
+# Interactive mode command verbs (for tab completion)
+COMMANDS = ['search', 'status', 'help', 'quit', 'exit']
+
+# Interactive mode history (persisted between sessions)
+HISTORY_PATH = os.path.join(os.path.expanduser("~"), ".aim", "flight_agent_history")
+
+# Interactive mode help output (static, so rendered once)
+HELP_TEXT = (
+    "\n📚 Available Commands:\n"
+    + "=" * 60 + "\n"
+    "  search <destination>         - Search flights to destination\n"
+    "                                 Example: search NYC\n"
+    "  status                       - Show agent status\n"
+    "  help                         - Show this help message\n"
+    "  quit/exit                    - Exit the agent\n"
+    "\n"
+    "💡 Available destinations: NYC, SFO, MIA\n"
+    + "=" * 60 + "\n"
+    "\n"
+)
+
+
+@lru_cache(maxsize=128)
+def _lookup_flights(destination_code: str, departure_date: str, return_date: str) -> tuple:
+    """
+    Look up flights for a destination, cheapest first.
+
+    Memoized on (destination, dates) so repeat searches are a single cache hit.
+    Dates are unused by the mock data but are part of the key so real filtering
+    can be added here without changing callers.
+    """
+    return tuple(MOCK_FLIGHTS_BY_PRICE.get(destination_code, ()))
+
 
 class FlightAgent:
     """
@@ -117,6 +175,23 @@ class FlightAgent:
         self.agent_id: Optional[str] = None
         self.agent_name = "flight-search-agent"
 
+        # Set once registration succeeds; cleared if AIM becomes unreachable so
+        # later searches skip the verification round-trips entirely
+        self._aim_enabled = False
+
+        # Background pool for post-action logging so searches don't wait on it
+        self._log_pool = ThreadPoolExecutor(max_workers=2)
+
+        # Interactive command dispatch (verb -> handler(args); handler returns False to exit)
+        self._commands = {
+            'quit': self._quit,
+            'exit': self._quit,
+            'q': self._quit,
+            'help': lambda args: self._show_help(),
+            'status': lambda args: self._show_status(),
+            'search': self._do_search,
+        }
+
         print("\n🛫 Flight Search Agent with AIM Integration")
         print("=" * 60)
         print()
@@ -145,6 +220,7 @@ class FlightAgent:
 
             if self.client and self.client.agent_id:
                 self.agent_id = self.client.agent_id
+                self._aim_enabled = True
                 print(f"✅ Successfully registered with AIM")
                 print(f"   Agent ID: {self.agent_id}")
                 print(f"   Agent Name: {self.agent_name}")
@@ -181,7 +257,7 @@ class FlightAgent:
 
         # Verify action with AIM before executing
         verification_id = None
-        if self.client:
+        if self._aim_enabled:
             try:
                 print("🔐 Requesting verification from AIM...")
 
@@ -197,7 +273,12 @@ class FlightAgent:
                 )
 
                 verification_id = verification.get('verification_id')
-                print(f"✅ Verification requested (ID: {verification_id})")
+                if (verification.get('error') or '').startswith('Network error'):
+                    # AIM is unreachable - stop verifying for the rest of this session
+                    self._aim_enabled = False
+                    print("⚠️  AIM unreachable - continuing in standalone mode")
+                else:
+                    print(f"✅ Verification requested (ID: {verification_id})")
                 print()
 
                 # Note: In real usage, you'd wait for approval here
@@ -208,27 +289,30 @@ class FlightAgent:
                 print("   Proceeding without verification")
                 print()
 
-        # Simulate API call delay
-        time.sleep(0.5)
+        # Simulate API call delay (opt-in, e.g. FLIGHT_AGENT_SIMULATE_LATENCY=0.5)
+        if os.environ.get("FLIGHT_AGENT_SIMULATE_LATENCY"):
+            time.sleep(float(os.environ["FLIGHT_AGENT_SIMULATE_LATENCY"]))
 
         # Get flights for destination
         destination_code = destination.upper()
-        flights = MOCK_FLIGHTS.get(destination_code, [])
+        flights_sorted = list(_lookup_flights(
+            destination_code,
+            departure_date or "flexible",
+            return_date or "flexible"
+        ))
 
-        if not flights:
+        if not flights_sorted:
             print(f"   No flights found to {destination}")
             return []
 
-        # Sort by price (cheapest first)
-        flights_sorted = sorted(flights, key=lambda x: x['price'])
-
         print(f"   Found {len(flights_sorted)} flights to {destination}")
         print()
 
-        # Log successful action with AIM
-        if self.client and verification_id:
+        # Log successful action with AIM (asynchronously - don't block the search)
+        if self._aim_enabled and verification_id:
             try:
-                self.client.log_action_result(
+                self._log_pool.submit(
+                    self.client.log_action_result,
                     verification_id=verification_id,
                     success=True,
                     result_summary=f"Found {len(flights_sorted)} flights to {destination}. Cheapest: ${flights_sorted[0]['price']:.2f}" if flights_sorted else f"No flights found to {destination}"
@@ -244,18 +328,19 @@ class FlightAgent:
             print("No flights to display")
             return
 
-        print("\n✈️  Available Flights (sorted by price):")
-        print("=" * 100)
-
+        # Build the whole report and write it in one go
+        lines = ["\n✈️  Available Flights (sorted by price):", "=" * 100]
         for i, flight in enumerate(flights, 1):
-            stops_text = 'Direct' if flight['stops'] == 0 else f"{flight['stops']} stop(s)"
-            print(f"\n{i}. {flight['airline']} - {flight['flight_number']}")
-            print(f"   Route: {flight['departure']} → {flight['arrival']}")
-            print(f"   Time: {flight['departure_time']} - {flight['arrival_time']} ({flight['duration']})")
-            print(f"   Stops: {stops_text}")
-            print(f"   💰 Price: ${flight['price']:.2f}")
+            lines.append(
+                f"\n{i}. {flight['airline']} - {flight['flight_number']}\n"
+                f"   Route: {flight['departure']} → {flight['arrival']}\n"
+                f"   Time: {flight['departure_time']} - {flight['arrival_time']} ({flight['duration']})\n"
+                f"   Stops: {flight['stops_text']}\n"
+                f"   💰 Price: ${flight['price']:.2f}"
+            )
+        lines.append("\n" + "=" * 100)
 
-        print("\n" + "=" * 100)
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def interactive_mode(self):
         """Run the agent in interactive mode"""
@@ -263,6 +348,8 @@ class FlightAgent:
         print("   Type 'help' for commands, 'quit' to exit")
         print()
 
+        self._setup_readline()
+
         while True:
             try:
                 command = input("flightagent> ").strip()
@@ -270,34 +357,15 @@ class FlightAgent:
                 if not command:
                     continue
 
-                if command.lower() in ['quit', 'exit', 'q']:
-                    print("\n👋 Goodbye!")
-                    break
-
-                if command.lower() == 'help':
-                    self._show_help()
-                    continue
-
-                if command.lower().startswith('search '):
-                    # Parse search command
-                    parts = command.split()
-                    if len(parts) < 2:
-                        print("❌ Usage: search <destination> [departure_date] [return_date]")
-                        continue
-
-                    destination = parts[1]
-                    departure_date = parts[2] if len(parts) > 2 else None
-                    return_date = parts[3] if len(parts) > 3 else None
-
-                    flights = self.search_flights(destination, departure_date, return_date)
-                    self.display_flights(flights)
-                    continue
+                verb, _, args = command.partition(' ')
+                handler = self._commands.get(verb.lower())
 
-                if command.lower() == 'status':
-                    self._show_status()
+                if handler is None:
+                    print("❌ Unknown command. Type 'help' for available commands.")
                     continue
 
-                print("❌ Unknown command. Type 'help' for available commands.")
+                if handler(args) is False:
+                    break
 
             except KeyboardInterrupt:
                 print("\n\n👋 Goodbye!")
@@ -305,19 +373,56 @@ class FlightAgent:
             except Exception as e:
                 print(f"❌ Error: {e}")
 
+    def _setup_readline(self):
+        """Enable command history and tab completion of commands/destinations"""
+        if not READLINE_AVAILABLE:
+            return
+
+        words = COMMANDS + list(MOCK_FLIGHTS)
+
+        def complete(text, state):
+            matches = [w for w in words if w.startswith(text) or w.lower().startswith(text)]
+            return matches[state] if state < len(matches) else None
+
+        readline.set_completer(complete)
+        readline.parse_and_bind('tab: complete')
+
+        try:
+            readline.read_history_file(HISTORY_PATH)
+        except (FileNotFoundError, OSError):
+            pass  # No history yet
+
+        def save_history():
+            try:
+                os.makedirs(os.path.dirname(HISTORY_PATH), exist_ok=True)
+                readline.write_history_file(HISTORY_PATH)
+            except OSError:
+                pass  # History is a convenience - never fail on exit
+
+        atexit.register(save_history)
+
+    def _quit(self, args: str) -> bool:
+        """Leave interactive mode"""
+        print("\n👋 Goodbye!")
+        return False
+
+    def _do_search(self, args: str):
+        """Handle 'search <destination> [departure_date] [return_date]'"""
+        parts = args.split()
+        if not parts:
+            print("❌ Usage: search <destination> [departure_date] [return_date]")
+            return
+
+        destination = parts[0]
+        departure_date = parts[1] if len(parts) > 1 else None
+        return_date = parts[2] if len(parts) > 2 else None
+
+        flights = self.search_flights(destination, departure_date, return_date)
+        self.display_flights(flights)
+
     def _show_help(self):
         """Show available commands"""
-        print("\n📚 Available Commands:")
-        print("=" * 60)
-        print("  search <destination>         - Search flights to destination")
-        print("                                 Example: search NYC")
-        print("  status                       - Show agent status")
-        print("  help                         - Show this help message")
-        print("  quit/exit                    - Exit the agent")
-        print()
-        print("💡 Available destinations: NYC, SFO, MIA")
-        print("=" * 60)
-        print()
+        sys.stdout.write(HELP_TEXT)
 
     def _show_status(self):
         """Show agent status"""
@@ -340,7 +445,6 @@ def main():
         agent.interactive_mode()
     except Exception as e:
         print(f"\n❌ Fatal error: {e}")
-        import traceback
         traceback.print_exc()
         sys.exit(1)
 
@@ -7,12 +7,41 @@ This simulates what happens when a user downloads SDK from portal
 import requests
 import json
 import zipfile
-import io
+import shutil
+import tempfile
+import traceback
 import os
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson is optional - fall back to stdlib json when it isn't installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _json_loads(data):
+    """Parse JSON from bytes or str (orjson when available)"""
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def _json_dumps_pretty(obj) -> bytes:
+    """Serialize to indented JSON bytes (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
 
 API_URL = "http://localhost:8080"
 
+# Single session so refresh, download request and ZIP fetch share one keep-alive connection
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=Retry(total=3, backoff_factor=0.2))
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
 print("="*80)
 print("GETTING FRESH SDK WITH PROPER OAUTH")
 print("="*80 + "\n")
@@ -38,32 +67,41 @@ try:
     # Load existing tokens
     creds_path = Path.home() / ".aim" / "credentials.json"
     if creds_path.exists():
-        with open(creds_path, 'r') as f:
-            creds = json.load(f)
+        creds = _json_loads(creds_path.read_bytes())
 
         # Try to use refresh token to get new access token
         print("Found existing credentials, attempting token refresh...")
 
         # Call refresh endpoint
-        response = requests.post(
+        response = SESSION.post(
             f"{API_URL}/api/v1/auth/refresh",
             json={"refresh_token": creds.get("refresh_token")},
             timeout=10
         )
 
         if response.status_code == 200:
-            data = response.json()
+            data = _json_loads(response.content)
             access_token = data['access_token']
             new_refresh_token = data['refresh_token']
+            SESSION.headers.update({"Authorization": f"Bearer {access_token}"})
 
             print(f"✅ Got fresh access token!")
             print(f"✅ Got new refresh token (token rotation)")
 
             # Update credentials with new tokens
             creds['refresh_token'] = new_refresh_token
-            with open(creds_path, 'w') as f:
-                json.dump(creds, f, indent=2)
-            os.chmod(creds_path, 0o600)
+            # Write atomically so an interrupted run never leaves a truncated credentials file;
+            # the temp file is unique and owner-only from creation
+            fd, tmp_path = tempfile.mkstemp(dir=creds_path.parent, prefix='.credentials-', suffix='.tmp')
+            try:
+                if hasattr(os, 'fchmod'):
+                    os.fchmod(fd, 0o600)
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(_json_dumps_pretty(creds))
+                os.replace(tmp_path, creds_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
 
             print(f"✅ Saved new refresh token")
             print()
@@ -72,15 +110,14 @@ try:
             print("Step 3: Downloading Fresh SDK...")
             print("-" * 80)
 
-            response = requests.post(
+            response = SESSION.post(
                 f"{API_URL}/api/v1/sdk/download/python",
-                headers={"Authorization": f"Bearer {access_token}"},
                 json={"device_name": "Flight Agent - Fresh Download"},
                 timeout=30
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = _json_loads(response.content)
                 download_url = data.get('download_url')
 
                 if download_url:
@@ -88,29 +125,33 @@ try:
                     print(f"✅ SDK download URL obtained")
                     print(f"   Downloading SDK...")
 
-                    sdk_response = requests.get(download_url, timeout=60)
-                    if sdk_response.status_code == 200:
-                        # Extract to current directory
-                        with zipfile.ZipFile(io.BytesIO(sdk_response.content)) as zip_file:
-                            zip_file.extractall("./fresh-sdk")
-
-                        print(f"✅ SDK downloaded and extracted to ./fresh-sdk/")
-                        print()
-                        print("="*80)
-                        print("SUCCESS!")
-                        print("="*80)
-                        print()
-                        print("Fresh SDK with new OAuth credentials ready at:")
-                        print("  ./fresh-sdk/aim-sdk-python/")
-                        print()
-                        print("The new credentials include:")
-                        print("  - Fresh refresh_token")
-                        print("  - New SDK token ID")
-                        print("  - Valid for verification flow")
-                        print()
-                        print("Next: Update flight agent to use fresh credentials")
-                    else:
-                        print(f"❌ Failed to download SDK: {sdk_response.status_code}")
+                    with SESSION.get(download_url, stream=True, timeout=60) as sdk_response:
+                        if sdk_response.status_code == 200:
+                            # Stream to a spooled temp file (spills to disk above 8MB) and extract
+                            sdk_response.raw.decode_content = True
+                            with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as tmp:
+                                shutil.copyfileobj(sdk_response.raw, tmp)
+                                tmp.seek(0)
+                                with zipfile.ZipFile(tmp) as zip_file:
+                                    zip_file.extractall("./fresh-sdk")
+
+                            print(f"✅ SDK downloaded and extracted to ./fresh-sdk/")
+                            print()
+                            print("="*80)
+                            print("SUCCESS!")
+                            print("="*80)
+                            print()
+                            print("Fresh SDK with new OAuth credentials ready at:")
+                            print("  ./fresh-sdk/aim-sdk-python/")
+                            print()
+                            print("The new credentials include:")
+                            print("  - Fresh refresh_token")
+                            print("  - New SDK token ID")
+                            print("  - Valid for verification flow")
+                            print()
+                            print("Next: Update flight agent to use fresh credentials")
+                        else:
+                            print(f"❌ Failed to download SDK: {sdk_response.status_code}")
                 else:
                     print(f"❌ No download URL in response")
                     print(f"   Response: {data}")
@@ -138,5 +179,4 @@ try:
 
 except Exception as e:
     print(f"❌ Error: {e}")
-    import traceback
     traceback.print_exc()
@@ -6,6 +6,7 @@ This tests the complete flow: registration, verification, flight search
 
 import sys
 import os
+import traceback
 
 # Add SDK to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'aim-sdk-python'))
@@ -60,6 +61,5 @@ if __name__ == "__main__":
         sys.exit(0 if success else 1)
     except Exception as e:
         print(f"\n❌ ERROR: {e}")
-        import traceback
         traceback.print_exc()
         sys.exit(1)
@@ -56,15 +56,41 @@ Agent Management (Generic SDK Pattern):
     client.delete_agent(agent_id)
 """
 
+import importlib
+
 from .client import AIMClient, register_agent
 
 # Alias for enterprise security
 secure = register_agent
 
-from .exceptions import AIMError, AuthenticationError, VerificationError, ActionDeniedError
-from .detection import MCPDetector, auto_detect_mcps, track_mcp_call
-from .capability_detection import CapabilityDetector, auto_detect_capabilities
-from .protocol_detection import ProtocolDetector, auto_detect_protocol
+from .exceptions import AIMError, AuthenticationError, VerificationError, ApprovalTimeoutError, ApprovalCapacityError, ActionDeniedError
+
+# Detection helpers are loaded on first access (PEP 562) so `from aim_sdk import secure`
+# doesn't pay for modules the agent never uses.
+_LAZY_IMPORTS = {
+    "MCPDetector": ".detection",
+    "auto_detect_mcps": ".detection",
+    "track_mcp_call": ".detection",
+    "CapabilityDetector": ".capability_detection",
+    "auto_detect_capabilities": ".capability_detection",
+    "ProtocolDetector": ".protocol_detection",
+    "auto_detect_protocol": ".protocol_detection",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 
 __version__ = "1.0.0"
 __all__ = [
@@ -74,6 +100,8 @@ __all__ = [
     "AIMError",
     "AuthenticationError",
     "VerificationError",
+    "ApprovalTimeoutError",
+    "ApprovalCapacityError",
     "ActionDeniedError",
     "MCPDetector",
     "auto_detect_mcps",
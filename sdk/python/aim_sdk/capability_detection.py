@@ -10,17 +10,192 @@ This module automatically detects agent capabilities through various methods:
 Detection results can be used during agent registration or reported separately.
 """
 
-import ast
+import functools
 import os
+import re
 import sys
 import json
+import tempfile
+import types
 import pathlib
-import inspect
-from typing import List, Set, Optional, Dict, Any
-from datetime import datetime, timezone
+from typing import TYPE_CHECKING, List, Set, Optional, Dict, Any
+
+# ast and datetime are imported lazily where used to keep `import aim_sdk` light
+if TYPE_CHECKING:
+    import ast
 
 __version__ = "1.0.0"
 
+# Directory of the aim_sdk package - frames from here are skipped when
+# looking for the user's module
+_SDK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Cheap byte-level prefilter: files without any perform_action(...) call can't
+# contain a matching decorator, so they are never parsed
+_PERFORM_ACTION_RE = re.compile(rb'perform_action\s*\(')
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_cached(file_path: str, mtime_ns: int, size: int) -> "Optional[ast.Module]":
+    """
+    Parse a Python source file, memoized by (path, mtime, size).
+
+    The stat fields are part of the cache key so an edited file is re-parsed,
+    while repeated scans of an unchanged file skip both the read and the parse.
+
+    Returns None (without parsing) if the source has no perform_action call.
+    """
+    with open(file_path, 'rb') as f:
+        source = f.read()
+
+    if not _PERFORM_ACTION_RE.search(source):
+        return None
+
+    import ast
+    return ast.parse(source)
+
+
+@functools.lru_cache(maxsize=1)
+def _config_path() -> pathlib.Path:
+    """Resolve ~/.aim/capabilities.json once per process (Path.home() hits env/passwd)"""
+    return pathlib.Path.home() / ".aim" / "capabilities.json"
+
+
+# Parsed config file contents: path -> ((st_mtime_ns, st_size), capabilities)
+_CONFIG_CACHE: Dict[str, tuple] = {}
+
+
+def _load_config_capabilities(config_path: str) -> List[str]:
+    """
+    Read the capabilities list from a config file, memoized by mtime and size.
+
+    Missing or invalid files yield an empty list.
+    """
+    try:
+        st = os.stat(config_path)
+    except OSError:
+        return []
+
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _CONFIG_CACHE.get(config_path)
+    if cached and cached[0] == key:
+        return cached[1]
+
+    capabilities: List[str] = []
+    try:
+        with open(config_path, 'rb') as f:
+            config = json.loads(f.read())
+
+        # Extract capabilities list
+        configured = config.get("capabilities", [])
+        if isinstance(configured, list):
+            capabilities = configured
+
+    except Exception:
+        # Silently fail - don't break agent execution
+        pass
+
+    _CONFIG_CACHE[config_path] = (key, capabilities)
+    return capabilities
+
+
+def _iter_defs(body):
+    """
+    Yield function definitions at module level and inside (nested) classes.
+
+    Decorated agent actions live at these levels, so this avoids ast.walk()
+    visiting every expression node in the file.
+    """
+    import ast
+
+    for node in body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            yield node
+        elif isinstance(node, ast.ClassDef):
+            yield from _iter_defs(node.body)
+
+
+# Map common Python packages to capabilities (built once, read-only)
+_IMPORT_TO_CAP = types.MappingProxyType({
+    # File System
+    "os": "read_files",
+    "shutil": "write_files",
+    "pathlib": "read_files",
+
+    # Email
+    "smtplib": "send_email",
+    "email": "send_email",
+    "imaplib": "read_email",
+
+    # Database
+    "psycopg2": "access_database",
+    "pymongo": "access_database",
+    "mysql": "access_database",
+    "sqlite3": "access_database",
+    "sqlalchemy": "access_database",
+
+    # HTTP/API
+    "requests": "make_api_calls",
+    "urllib": "make_api_calls",
+    "aiohttp": "make_api_calls",
+    "httpx": "make_api_calls",
+
+    # Code Execution
+    "subprocess": "execute_code",
+    "exec": "execute_code",
+    "eval": "execute_code",
+
+    # Cloud Services
+    "boto3": "access_cloud_services",
+    "google.cloud": "access_cloud_services",
+    "azure": "access_cloud_services",
+
+    # Web Scraping
+    "beautifulsoup4": "web_scraping",
+    "bs4": "web_scraping",
+    "scrapy": "web_scraping",
+    "selenium": "web_automation",
+    "playwright": "web_automation",
+
+    # Data Processing
+    "pandas": "data_processing",
+    "numpy": "data_processing",
+
+    # AI/ML
+    "openai": "ai_model_access",
+    "anthropic": "ai_model_access",
+    "langchain": "ai_agent_framework",
+    "crewai": "ai_agent_framework",
+
+    # File Operations
+    "json": "read_files",
+    "yaml": "read_files",
+    "csv": "read_files",
+    "pickle": "read_files",
+})
+
+# Common action patterns to capability mapping (built once, read-only)
+_ACTION_TO_CAP = types.MappingProxyType({
+    "read_database": "access_database",
+    "write_database": "access_database",
+    "query_database": "access_database",
+    "send_email": "send_email",
+    "read_email": "read_email",
+    "read_file": "read_files",
+    "write_file": "write_files",
+    "delete_file": "write_files",
+    "execute_command": "execute_code",
+    "run_code": "execute_code",
+    "make_request": "make_api_calls",
+    "call_api": "make_api_calls",
+    "web_search": "web_scraping",
+    "browse_web": "web_automation",
+})
+
+# Module names worth looking up in sys.modules (includes dotted names like
+# "google.cloud", which are checked as full module keys)
+_INTERESTING_MODULES = frozenset(_IMPORT_TO_CAP)
+
 
 class CapabilityDetector:
     """
@@ -38,84 +213,15 @@ class CapabilityDetector:
         print(f"Detected capabilities: {capabilities}")
     """
 
+    import_to_capability = _IMPORT_TO_CAP
+    action_to_capability = _ACTION_TO_CAP
+
     def __init__(self):
         """Initialize the capability detector."""
-        # Map common Python packages to capabilities
-        self.import_to_capability = {
-            # File System
-            "os": "read_files",
-            "shutil": "write_files",
-            "pathlib": "read_files",
-
-            # Email
-            "smtplib": "send_email",
-            "email": "send_email",
-            "imaplib": "read_email",
-
-            # Database
-            "psycopg2": "access_database",
-            "pymongo": "access_database",
-            "mysql": "access_database",
-            "sqlite3": "access_database",
-            "sqlalchemy": "access_database",
-
-            # HTTP/API
-            "requests": "make_api_calls",
-            "urllib": "make_api_calls",
-            "aiohttp": "make_api_calls",
-            "httpx": "make_api_calls",
-
-            # Code Execution
-            "subprocess": "execute_code",
-            "exec": "execute_code",
-            "eval": "execute_code",
-
-            # Cloud Services
-            "boto3": "access_cloud_services",
-            "google.cloud": "access_cloud_services",
-            "azure": "access_cloud_services",
-
-            # Web Scraping
-            "beautifulsoup4": "web_scraping",
-            "bs4": "web_scraping",
-            "scrapy": "web_scraping",
-            "selenium": "web_automation",
-            "playwright": "web_automation",
-
-            # Data Processing
-            "pandas": "data_processing",
-            "numpy": "data_processing",
-
-            # AI/ML
-            "openai": "ai_model_access",
-            "anthropic": "ai_model_access",
-            "langchain": "ai_agent_framework",
-            "crewai": "ai_agent_framework",
-
-            # File Operations
-            "json": "read_files",
-            "yaml": "read_files",
-            "csv": "read_files",
-            "pickle": "read_files",
-        }
-
-        # Common action patterns to capability mapping
-        self.action_to_capability = {
-            "read_database": "access_database",
-            "write_database": "access_database",
-            "query_database": "access_database",
-            "send_email": "send_email",
-            "read_email": "read_email",
-            "read_file": "read_files",
-            "write_file": "write_files",
-            "delete_file": "write_files",
-            "execute_command": "execute_code",
-            "run_code": "execute_code",
-            "make_request": "make_api_calls",
-            "call_api": "make_api_calls",
-            "web_search": "web_scraping",
-            "browse_web": "web_automation",
-        }
+        # Memoized import + config detection, valid while (number of loaded
+        # modules, config file mtime) is unchanged
+        self._cache: Optional[Set[str]] = None
+        self._cache_key = None
 
     def detect_all(self) -> List[str]:
         """
@@ -124,17 +230,20 @@ class CapabilityDetector:
         Returns:
             List of unique capability strings
         """
-        capabilities: Set[str] = set()
-
-        # 1. Detect from imports
-        import_caps = self.detect_from_imports()
-        capabilities.update(import_caps)
-
-        # 2. Detect from config file
-        config_caps = self.detect_from_config()
-        capabilities.update(config_caps)
-
-        # 3. Detect from decorators (if called from within agent code)
+        # 1 + 2. Detect from imports and config file (memoized - both only
+        # change when new modules are imported or the config file is edited)
+        key = (len(sys.modules), self._config_mtime())
+        if self._cache is None or key != self._cache_key:
+            cached: Set[str] = set()
+            cached.update(self.detect_from_imports())
+            cached.update(self.detect_from_config())
+            self._cache = cached
+            self._cache_key = key
+
+        capabilities: Set[str] = set(self._cache)
+
+        # 3. Detect from decorators (if called from within agent code). Not
+        # memoized here since it depends on the caller; parsed files are cached.
         try:
             decorator_caps = self.detect_from_decorators()
             capabilities.update(decorator_caps)
@@ -154,17 +263,14 @@ class CapabilityDetector:
         Returns:
             List of detected capabilities
         """
-        capabilities: Set[str] = set()
-
-        # Scan currently loaded modules
-        for module_name in sys.modules.keys():
-            # Extract top-level package name
-            top_level = module_name.split('.')[0]
-
-            # Check if this package maps to a capability
-            if top_level in self.import_to_capability:
-                capability = self.import_to_capability[top_level]
-                capabilities.add(capability)
+        # Intersect the (small) set of known packages with sys.modules in one
+        # C-level set operation rather than scanning every loaded module.
+        # Importing a submodule always loads its parent package, so matching
+        # the top-level names is sufficient.
+        capabilities: Set[str] = {
+            self.import_to_capability[name]
+            for name in sys.modules.keys() & _INTERESTING_MODULES
+        }
 
         return list(capabilities)
 
@@ -179,23 +285,10 @@ class CapabilityDetector:
         """
         config_path = self._get_capabilities_config_path()
 
-        if not config_path or not config_path.exists():
+        if not config_path:
             return []
 
-        try:
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-
-            # Extract capabilities list
-            capabilities = config.get("capabilities", [])
-            if isinstance(capabilities, list):
-                return capabilities
-
-        except Exception:
-            # Silently fail - don't break agent execution
-            pass
-
-        return []
+        return list(_load_config_capabilities(str(config_path)))
 
     def detect_from_decorators(self) -> List[str]:
         """
@@ -210,23 +303,19 @@ class CapabilityDetector:
         capabilities: Set[str] = set()
 
         try:
-            # Get the calling module's frame
-            frame = inspect.currentframe()
-            if not frame:
-                return []
-
-            # Navigate up the call stack to find the user's module
-            caller_frame = frame.f_back
-            while caller_frame:
-                caller_module = inspect.getmodule(caller_frame)
-                if caller_module and hasattr(caller_module, '__file__'):
-                    source_file = caller_module.__file__
-                    if source_file and not source_file.endswith('aim_sdk'):
-                        # Found user module - scan its source
-                        caps = self._scan_file_for_decorators(source_file)
-                        capabilities.update(caps)
-                        break
-                caller_frame = caller_frame.f_back
+            # Navigate up the call stack to find the user's module. Read __file__
+            # straight from each frame's globals rather than inspect.getmodule(),
+            # which scans sys.modules on every call.
+            frame = sys._getframe(1)
+            while frame is not None:
+                source_file = frame.f_globals.get('__file__')
+                # Compare with a trailing separator so siblings like aim_sdk_extras/ aren't skipped
+                if source_file and not source_file.startswith(_SDK_DIR + os.sep):
+                    # Found user module - scan its source
+                    caps = self._scan_file_for_decorators(source_file)
+                    capabilities.update(caps)
+                    break
+                frame = frame.f_back
 
         except Exception:
             # AST parsing might fail - that's okay
@@ -249,26 +338,25 @@ class CapabilityDetector:
         capabilities: Set[str] = set()
 
         try:
-            with open(file_path, 'r') as f:
-                source_code = f.read()
-
-            # Parse AST
-            tree = ast.parse(source_code)
-
-            # Find all function definitions with decorators
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    for decorator in node.decorator_list:
-                        # Check if decorator is agent.perform_action(...)
-                        if self._is_perform_action_decorator(decorator):
-                            action_type = self._extract_action_type(decorator)
-                            if action_type:
-                                # Map action type to capability
-                                capability = self.action_to_capability.get(
-                                    action_type,
-                                    action_type  # Use action_type as capability if no mapping
-                                )
-                                capabilities.add(capability)
+            # Parse AST (cached until the file changes)
+            st = os.stat(file_path)
+            tree = _parse_cached(file_path, st.st_mtime_ns, st.st_size)
+            if tree is None:
+                return capabilities
+
+            # Find decorated function definitions at module/class level
+            for node in _iter_defs(tree.body):
+                for decorator in node.decorator_list:
+                    # Check if decorator is agent.perform_action(...)
+                    if self._is_perform_action_decorator(decorator):
+                        action_type = self._extract_action_type(decorator)
+                        if action_type:
+                            # Map action type to capability
+                            capability = self.action_to_capability.get(
+                                action_type,
+                                action_type  # Use action_type as capability if no mapping
+                            )
+                            capabilities.add(capability)
 
         except Exception:
             # AST parsing can fail - that's okay
@@ -276,16 +364,20 @@ class CapabilityDetector:
 
         return capabilities
 
-    def _is_perform_action_decorator(self, decorator: ast.AST) -> bool:
+    def _is_perform_action_decorator(self, decorator: "ast.AST") -> bool:
         """Check if decorator is @agent.perform_action or @client.perform_action"""
+        import ast
+
         if isinstance(decorator, ast.Call):
             func = decorator.func
             if isinstance(func, ast.Attribute):
                 return func.attr == "perform_action"
         return False
 
-    def _extract_action_type(self, decorator: ast.Call) -> Optional[str]:
+    def _extract_action_type(self, decorator: "ast.Call") -> Optional[str]:
         """Extract action_type argument from @agent.perform_action() call"""
+        import ast
+
         # Check positional arguments
         if decorator.args and len(decorator.args) > 0:
             arg = decorator.args[0]
@@ -300,23 +392,36 @@ class CapabilityDetector:
 
         return None
 
+    def _config_mtime(self) -> int:
+        """Modification time (ns) of the config file, or -1 if there is none"""
+        config_path = self._get_capabilities_config_path()
+        if not config_path:
+            return -1
+        try:
+            return os.stat(config_path).st_mtime_ns
+        except OSError:
+            return -1
+
     def _get_capabilities_config_path(self) -> Optional[pathlib.Path]:
         """Get path to .aim/capabilities.json config file
 
         Always uses home directory (~/.aim/) for config - never project directory.
         This ensures configs are user-specific and not accidentally committed to version control.
+        The file may not exist; callers handle that when opening/stat-ing it.
         """
-        home = pathlib.Path.home()
-        config_path = home / ".aim" / "capabilities.json"
-        return config_path if config_path.exists() else None
+        return _config_path()
+
+
+# Shared detector used by auto_detect_capabilities() so its cache survives calls
+_DEFAULT_DETECTOR = CapabilityDetector()
 
 
 def auto_detect_capabilities() -> List[str]:
     """
     Convenience function for quick capability detection.
 
-    This is a helper function that creates a CapabilityDetector
-    and runs all detection methods.
+    This is a helper function that runs all detection methods on a shared
+    CapabilityDetector, so repeat calls reuse its cached results.
 
     Returns:
         List of detected capabilities
@@ -327,8 +432,7 @@ def auto_detect_capabilities() -> List[str]:
         capabilities = auto_detect_capabilities()
         print(f"Your agent has these capabilities: {capabilities}")
     """
-    detector = CapabilityDetector()
-    return detector.detect_all()
+    return _DEFAULT_DETECTOR.detect_all()
 
 
 def save_capabilities_config(capabilities: List[str]) -> None:
@@ -349,6 +453,8 @@ def save_capabilities_config(capabilities: List[str]) -> None:
             "access_database"
         ])
     """
+    from datetime import datetime, timezone
+
     home = pathlib.Path.home()
     aim_dir = home / ".aim"
     aim_dir.mkdir(exist_ok=True)
@@ -361,7 +467,16 @@ def save_capabilities_config(capabilities: List[str]) -> None:
         "version": "1.0.0"
     }
 
-    with open(config_path, 'w') as f:
-        json.dump(config, f, indent=2)
-
-    os.chmod(config_path, 0o600)  # Secure permissions
+    # Serialize once, write to a uniquely named temp file with secure permissions
+    # (owner read/write only), then atomically swap it into place
+    data = json.dumps(config, indent=2).encode('utf-8')
+    fd, tmp_path = tempfile.mkstemp(dir=aim_dir, prefix='.capabilities-', suffix='.tmp')
+    try:
+        if hasattr(os, 'fchmod'):
+            os.fchmod(fd, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, config_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
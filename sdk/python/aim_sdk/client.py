@@ -4,24 +4,648 @@ AIM Client - Core SDK functionality for automatic identity verification
 
 import base64
 import functools
+import gzip
 import hashlib
+import hmac
+import inspect
 import json
+import logging
+import math
+import re
+import reprlib
+import threading
 import time
-from typing import Any, Callable, Optional, Dict, List
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Dict, Iterable, Iterator, List, Tuple
+from urllib.parse import urlencode
 from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 
 import requests
+from requests.adapters import HTTPAdapter
 from nacl.signing import SigningKey, VerifyKey
-from nacl.encoding import Base64Encoder
+from nacl.bindings import crypto_sign, crypto_sign_BYTES, crypto_sign_keypair, crypto_sign_seed_keypair
 
 from .exceptions import (
     AuthenticationError,
     VerificationError,
+    ApprovalTimeoutError,
+    ApprovalCapacityError,
     ActionDeniedError,
     ConfigurationError
 )
 from .oauth import OAuthTokenManager, load_sdk_credentials
-from .capability_detection import auto_detect_capabilities
+
+try:
+    import pybase64 as _base64  # Optional SIMD base64, same API as the stdlib module
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    _base64 = base64
+    PYBASE64_AVAILABLE = False
+
+try:
+    import orjson  # Optional fast JSON for request and response bodies
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import httpx  # Optional HTTP/2 transport (use_http2=True)
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# Transport errors for whichever HTTP client sends the request
+_TIMEOUT_ERRORS = (requests.exceptions.Timeout,) + ((httpx.TimeoutException,) if HTTPX_AVAILABLE else ())
+_CONNECTION_ERRORS = (requests.exceptions.ConnectionError,) + (
+    (httpx.NetworkError, httpx.RemoteProtocolError) if HTTPX_AVAILABLE else ()
+)
+_REQUEST_ERRORS = (requests.exceptions.RequestException,) + ((httpx.HTTPError,) if HTTPX_AVAILABLE else ())
+_HOP_BY_HOP_HEADERS = frozenset(('connection', 'keep-alive', 'transfer-encoding', 'upgrade'))
+
+_USER_AGENT = 'AIM-Python-SDK/1.0.0'
+
+# Seconds an identical SDK integration / MCP registration report is answered
+# from the previous response instead of being sent again
+_REPORT_DEDUP_TTL = 300.0
+
+# Seconds report_detection waits to coalesce single detections into one request
+_DETECTION_BATCH_DELAY = 0.025
+
+# Seconds background_logging waits to collect action results into one request
+_RESULT_BATCH_DELAY = 0.05
+
+# (connect, read) timeouts in seconds for register_agent's registration request
+_REGISTRATION_TIMEOUT = (10, 30)
+
+# Registration bodies larger than this (bytes) are sent gzip-compressed
+_REGISTRATION_GZIP_MIN = 1024
+
+# Most verifications track_action(verification_ttl=...) keeps for reuse per client
+_REUSABLE_VERIFICATIONS_MAX = 1024
+
+# Backoff (seconds) between polls while verify_action waits: 0.1s doubling up to 5s
+_POLL_DELAY_MIN = 0.1
+_POLL_DELAY_MAX = 5.0
+
+# Backoff bounds (seconds) for polling verifications submitted via submit_for_approval
+_APPROVAL_POLL_MIN = 0.5
+_APPROVAL_POLL_MAX = 10.0
+
+# Bounded repr for the args/kwargs decorated functions attach to verification
+# context, so large arguments (file contents, data frames) are not serialized
+_CONTEXT_REPR = reprlib.Repr()
+_CONTEXT_REPR.maxstring = 200
+_CONTEXT_REPR.maxother = 200
+_CONTEXT_REPR.maxlist = _CONTEXT_REPR.maxtuple = _CONTEXT_REPR.maxdict = 10
+_CONTEXT_REPR.maxset = _CONTEXT_REPR.maxfrozenset = 10
+
+# Errors that mean a capability is already granted.
+# The backend returns 500 for duplicate key violations.
+_DUP_RE = re.compile(r"duplicate|already exists|unique constraint|\b500\b", re.IGNORECASE)
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=16)
+def _parse_private_key(private_key: str) -> Tuple[SigningKey, bytes, bytes]:
+    """
+    Decode a Base64 Ed25519 private key into (SigningKey, public key, libsodium secret key).
+
+    Cached so that constructing many clients with the same credentials only
+    decodes and derives the key pair once.
+    """
+    private_key_bytes = _base64.b64decode(private_key)
+    # Ed25519 private key from Go is 64 bytes (32-byte seed + 32-byte public key)
+    # PyNaCl SigningKey expects only the 32-byte seed
+    if len(private_key_bytes) == 64:
+        # Extract seed (first 32 bytes)
+        seed = private_key_bytes[:32]
+    elif len(private_key_bytes) == 32:
+        # Already just the seed
+        seed = private_key_bytes
+    else:
+        raise ValueError(f"Invalid private key length: {len(private_key_bytes)} bytes (expected 32 or 64)")
+    public_key_bytes, secret_key_bytes = crypto_sign_seed_keypair(seed)
+    return SigningKey(seed), public_key_bytes, secret_key_bytes
+
+
+class _RetryGuard:
+    """
+    Suspends retries while most recent requests are failing.
+
+    Outcomes are kept for a sliding window of `window` seconds. Once at
+    least `min_samples` are recorded and the failure rate reaches
+    `rejection_threshold`, retries stop for `cooldown` seconds so a
+    struggling server isn't hit with extra traffic.
+    """
+
+    def __init__(
+        self,
+        window: float = 30.0,
+        rejection_threshold: float = 0.5,
+        cooldown: float = 15.0,
+        min_samples: int = 10
+    ):
+        self.window = window
+        self.rejection_threshold = rejection_threshold
+        self.cooldown = cooldown
+        self.min_samples = min_samples
+        self._outcomes = deque()
+        self._failures = 0
+        self._cooldown_until = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, ok: bool) -> bool:
+        """Record one request outcome and return whether retrying is allowed."""
+        now = time.monotonic()
+        with self._lock:
+            if now < self._cooldown_until:
+                # Start a fresh window once the cooldown is over
+                return False
+            self._outcomes.append((now, ok))
+            if not ok:
+                self._failures += 1
+            cutoff = now - self.window
+            while self._outcomes[0][0] < cutoff:
+                if not self._outcomes.popleft()[1]:
+                    self._failures -= 1
+
+            total = len(self._outcomes)
+            if total >= self.min_samples and self._failures / total >= self.rejection_threshold:
+                self._cooldown_until = now + self.cooldown
+                self._outcomes.clear()
+                self._failures = 0
+                return False
+            return True
+
+
+class _ApprovalWaiter:
+    """
+    Waits for pending verifications on one background thread per client.
+
+    Each pending verification is polled with exponential backoff (0.5s
+    doubling up to 10s), so any number of outstanding approvals costs a
+    single thread and no held-open connections. When the server has a
+    batch status endpoint, every pending verification is checked with one
+    request whenever any of them is due. With stream_approvals=True, the
+    thread instead holds one status event stream open and resolves
+    verifications as the server pushes decisions.
+    """
+
+    def __init__(self, client: "AIMClient"):
+        self._client = client
+        # verification_id -> [future, deadline, next_poll, interval, timeout_seconds]
+        self._pending: Dict[str, list] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        """Number of verifications still waiting for a decision."""
+        return len(self._pending)
+
+    def wait(self, verification_id: str, timeout_seconds: float) -> Future:
+        """Return a future resolved with the verify_action result once decided."""
+        future: Future = Future()
+        now = time.monotonic()
+        with self._condition:
+            self._pending[verification_id] = [
+                future, now + timeout_seconds, now + _APPROVAL_POLL_MIN, _APPROVAL_POLL_MIN, timeout_seconds
+            ]
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="aim-approvals", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return future
+
+    def _run(self) -> None:
+        finished = False
+        try:
+            self._run_until_idle()
+            finished = True
+        finally:
+            if not finished:
+                self._abandon()
+
+    def _abandon(self) -> None:
+        """Fail every pending verification after the waiter thread died, so the next wait() starts a new one."""
+        with self._condition:
+            pending = list(self._pending.values())
+            self._pending.clear()
+            self._thread = None
+        for entry in pending:
+            if not entry[0].done():
+                entry[0].set_exception(VerificationError("Approval waiter stopped unexpectedly"))
+
+    def _run_until_idle(self) -> None:
+        while True:
+            with self._condition:
+                if not self._pending:
+                    self._thread = None
+                    return
+                streaming = self._client._stream_supported
+            if streaming and self._stream():
+                continue
+
+            with self._condition:
+                now = time.monotonic()
+                due = [vid for vid, entry in self._pending.items() if entry[2] <= now]
+                if not due:
+                    self._condition.wait(min(entry[2] for entry in self._pending.values()) - now)
+                    continue
+                if self._client._batch_status_supported:
+                    # One request covers everything, so check all pending verifications
+                    due = list(self._pending)
+
+            statuses = self._client._poll_verifications_batch(due) if len(due) > 1 else None
+            for verification_id in due:
+                self._poll(verification_id, statuses)
+
+    def _stream(self) -> bool:
+        """
+        Resolve pending verifications from the server's status event stream.
+
+        Returns once nothing is pending, the stream ends or the read timeout
+        passes (to enforce deadlines). Returns False if no stream could be
+        opened, so the caller polls instead.
+        """
+        with self._condition:
+            nearest_deadline = min(entry[1] for entry in self._pending.values())
+        read_timeout = min(max(nearest_deadline - time.monotonic(), 0.1), 30)
+        try:
+            response = self._client._open_verification_stream(read_timeout)
+        except Exception as e:
+            logger.warning("Could not open verification status stream: %s", e)
+            return False
+        if response is None:
+            return False
+
+        try:
+            # Catch up on decisions made before the stream was open
+            with self._condition:
+                due = list(self._pending)
+            statuses = self._client._poll_verifications_batch(due) if len(due) > 1 else None
+            for verification_id in due:
+                self._poll(verification_id, statuses)
+
+            for status in _iter_sse_data(response):
+                verification_id = status.get("id") if isinstance(status, dict) else None
+                with self._condition:
+                    waiting = verification_id in self._pending
+                if waiting and status.get("status") in ("approved", "denied"):
+                    try:
+                        result = self._client._approval_result(verification_id, status)
+                    except Exception as e:
+                        self._resolve(verification_id, error=e)
+                    else:
+                        self._resolve(verification_id, result=result)
+                self._expire()
+                with self._condition:
+                    if not self._pending:
+                        break
+        except requests.RequestException:
+            pass  # Read timeout or dropped connection - check deadlines and reconnect
+        finally:
+            response.close()
+        self._expire()
+        return True
+
+    def _expire(self) -> None:
+        """Fail verifications whose deadline has passed."""
+        now = time.monotonic()
+        with self._condition:
+            expired = [(vid, entry[4]) for vid, entry in self._pending.items() if entry[1] <= now]
+        for verification_id, timeout_seconds in expired:
+            self._resolve(
+                verification_id, error=ApprovalTimeoutError(f"Verification timeout after {timeout_seconds} seconds")
+            )
+
+    def _poll(self, verification_id: str, statuses: Optional[Dict[str, Dict]]) -> None:
+        with self._condition:
+            future, deadline, _, interval, timeout_seconds = self._pending[verification_id]
+        try:
+            if statuses is not None:
+                status = statuses.get(verification_id)
+            else:
+                status = self._client._poll_verification(verification_id)
+            if status is not None and status.get("status") in ("approved", "denied"):
+                self._resolve(verification_id, result=self._client._approval_result(verification_id, status))
+                return
+        except Exception as e:
+            self._resolve(verification_id, error=e)
+            return
+
+        now = time.monotonic()
+        if now >= deadline:
+            self._resolve(
+                verification_id, error=ApprovalTimeoutError(f"Verification timeout after {timeout_seconds} seconds")
+            )
+            return
+        interval = min(interval * 2, _APPROVAL_POLL_MAX)
+        with self._condition:
+            self._pending[verification_id][2:4] = [min(now + interval, deadline), interval]
+
+    def _resolve(self, verification_id: str, result: Optional[Dict] = None, error: Optional[BaseException] = None) -> None:
+        with self._condition:
+            future = self._pending.pop(verification_id)[0]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+
+class _ResultBatcher:
+    """
+    Sends decorator action results in batches from one background thread per client.
+
+    Results queued within 50ms of each other (up to batch_size) go out in one
+    request, in the order they were queued. The thread exits once the queue
+    is empty and is not a daemon, so queued results are still sent when the
+    interpreter exits.
+    """
+
+    def __init__(self, client: "AIMClient", batch_size: int):
+        self._client = client
+        self.batch_size = batch_size
+        # (verification_id, result body) in submission order
+        self._queue: List[Tuple[str, Dict[str, Any]]] = []
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._flushing = False
+
+    def enqueue(self, verification_id: str, body: Dict[str, Any]) -> None:
+        with self._condition:
+            self._queue.append((verification_id, body))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="aim-results")
+                self._thread.start()
+            elif len(self._queue) >= self.batch_size:
+                self._condition.notify_all()
+
+    def flush(self) -> None:
+        """Send queued results now and wait until they have been sent."""
+        with self._condition:
+            self._flushing = True
+            self._condition.notify_all()
+            while self._thread is not None:
+                self._condition.wait()
+            self._flushing = False
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._queue:
+                    self._thread = None
+                    self._condition.notify_all()
+                    return
+                deadline = time.monotonic() + _RESULT_BATCH_DELAY
+                while len(self._queue) < self.batch_size and not self._flushing:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                batch = self._queue[:self.batch_size]
+                del self._queue[:self.batch_size]
+
+            self._client._send_action_results(batch)
+
+
+def _iter_sse_data(response: requests.Response) -> Iterator[Any]:
+    """
+    Parse a streamed text/event-stream response into the JSON data of each event.
+
+    Yields None for keep-alive comments so readers can do periodic work
+    while the server is quiet. Events whose data isn't valid JSON (e.g.
+    truncated by a proxy) are logged and skipped.
+    """
+    data: List[bytes] = []
+    for line in response.iter_lines(chunk_size=None):
+        if not line:
+            if data:
+                payload = b"\n".join(data)
+                data = []
+                try:
+                    event = _loads(payload)
+                except ValueError:
+                    logger.warning("Skipping malformed status event: %r", payload[:200])
+                    continue
+                yield event
+        elif line.startswith(b":"):
+            yield None
+        elif line.startswith(b"data:"):
+            value = line[5:]
+            data.append(value[1:] if value.startswith(b" ") else value)
+
+
+def _poll_delays() -> Iterator[float]:
+    """Sleep before each status poll: fast at first for quick approvals, then plateauing."""
+    delay = _POLL_DELAY_MIN
+    while True:
+        yield delay
+        delay = min(delay * 2, _POLL_DELAY_MAX)
+
+
+def _generate_keypair() -> Tuple[bytes, bytes]:
+    """
+    Generate a new Ed25519 key pair as (32-byte public key, 64-byte private key).
+
+    The private key is libsodium's secret key, which is already the Go
+    layout (seed + public key), so no SigningKey object or concat is needed.
+    """
+    return crypto_sign_keypair()
+
+
+def _new_agent_registration(
+    name: str,
+    display_name: Optional[str] = None,
+    description: Optional[str] = None,
+    agent_type: str = "ai_agent",
+    version: Optional[str] = None,
+    repository_url: Optional[str] = None,
+    documentation_url: Optional[str] = None,
+    capabilities: Optional[List[str]] = None,
+    talks_to: Optional[List[str]] = None
+) -> Tuple[Dict[str, Any], str]:
+    """Registration payload for a new agent with a fresh key pair, plus its Base64 private key."""
+    # Generate Ed25519 keypair for the new agent
+    # For Go compatibility, the private key is 64 bytes (seed + public key)
+    public_key_bytes, private_key_full = _generate_keypair()
+    private_key_b64 = _base64.b64encode(private_key_full).decode('ascii')
+    public_key_b64 = _base64.b64encode(public_key_bytes).decode('ascii')
+
+    # Prepare registration payload; optional fields are only sent when set
+    registration_data = {
+        "name": name,
+        "displayName": display_name or name,
+        "description": description or f"Agent {name} created via AIM SDK",
+        "agentType": agent_type,
+        "publicKey": public_key_b64,
+        **{
+            field: value for field, value in (
+                ("version", version),
+                ("repositoryUrl", repository_url),
+                ("documentationUrl", documentation_url),
+                ("capabilities", capabilities),
+                ("talksTo", talks_to)
+            ) if value
+        }
+    }
+    return registration_data, private_key_b64
+
+
+def _with_new_agent_keys(result: Dict, public_key_b64: str, private_key_b64: str) -> Dict:
+    """Add the generated keys to a created agent returned by the backend."""
+    # Add the private key to the result (backend doesn't store it)
+    if result:
+        result["private_key"] = private_key_b64
+
+        # CRITICAL: Use the backend's public key (what's in database), not what we generated
+        # The backend's public key is the source of truth since it's stored in the database
+        backend_pub_key = result.get('public_key') or result.get('publicKey')
+        if backend_pub_key:
+            result["public_key"] = backend_pub_key
+        else:
+            # Fallback: use generated key if backend didn't return one
+            result["public_key"] = public_key_b64
+
+        # Normalize agent_id field
+        if "id" in result and "agent_id" not in result:
+            result["agent_id"] = result["id"]
+
+    return result
+
+
+def _httpx_timeout(timeout: Any) -> Any:
+    """Convert a requests-style (connect, read) timeout tuple for httpx, which doesn't accept that form."""
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return timeout
+
+
+def _retry_after_seconds(response: Any) -> Optional[float]:
+    """Delay requested by a 429/503 response's Retry-After header (seconds or HTTP date), if any."""
+    if response.status_code not in (429, 503):
+        return None
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def _action_error(action: str, status: str, error_type: str, error_message: str) -> Dict[str, Any]:
+    """Result returned by track_action/require_approval instead of raising."""
+    return {
+        "error": True,
+        "error_type": error_type,
+        "error_message": error_message,
+        "action": action,
+        "status": status
+    }
+
+
+def _action_result_body(
+    success: bool,
+    result_summary: Optional[str] = None,
+    error_message: Optional[str] = None
+) -> Dict[str, Any]:
+    """Request body reporting how a verified action went."""
+    return {
+        "result": "success" if success else "failure",
+        "result_summary": result_summary,
+        "error_message": error_message,
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def _default_sdk_token_id() -> Optional[str]:
+    """SDK token ID from the SDK credentials file, read once per process."""
+    sdk_creds = load_sdk_credentials(use_secure_storage=False)  # Disable secure storage for speed
+    if sdk_creds and 'sdk_token_id' in sdk_creds:
+        return sdk_creds['sdk_token_id']
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def _signing_prefix(method: str, endpoint: str) -> bytes:
+    """The constant head of a signed request message: b"METHOD\\nENDPOINT\\n"."""
+    return f"{method.upper()}\n{endpoint}\n".encode('utf-8')
+
+
+def _dumps_sorted(data: Any) -> bytes:
+    """Serialize a request body to compact, key-sorted UTF-8 JSON (sent and signed as-is)."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            pass  # e.g. non-str keys or big ints - let the stdlib handle (or reject) them
+    return json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+def _dumps(data: Any) -> bytes:
+    """Serialize an unsigned request body to compact UTF-8 JSON."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            pass  # e.g. non-str keys or big ints - let the stdlib handle (or reject) them
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def _is_plain_json(value: Any) -> bool:
+    """True for data built only from JSON's own types (exact types, finite floats, str keys)."""
+    kind = type(value)
+    if kind is str or kind is int or kind is bool or value is None:
+        return True
+    if kind is float:
+        return math.isfinite(value)
+    if kind is list:
+        return all(_is_plain_json(item) for item in value)
+    if kind is dict:
+        return all(type(key) is str and _is_plain_json(item) for key, item in value.items())
+    return False
+
+
+def _call_digest(args: tuple, kwargs: Dict[str, Any]) -> Optional[bytes]:
+    """
+    Digest that identifies a call's arguments exactly, or None if it can't.
+
+    Only plain JSON data is canonical: reprs of arrays, data frames and custom
+    objects can be equal for different values, so such calls get no digest.
+    """
+    args = list(args)
+    if not (_is_plain_json(args) and _is_plain_json(kwargs)):
+        return None
+    return hashlib.blake2b(_dumps_sorted([args, kwargs]), digest_size=16).digest()
+
+
+def _loads(content: bytes) -> Any:
+    """Parse a JSON response body."""
+    return orjson.loads(content) if ORJSON_AVAILABLE else json.loads(content)
+
+
+def _auto_detect_mcps() -> List[Dict[str, Any]]:
+    """Auto-detect MCP servers (loads the MCP detector on first use)."""
+    from . import detection  # Looked up per call so aim_sdk.detection can be patched
+    return detection.auto_detect_mcps()
+
+
+def auto_detect_capabilities() -> List[str]:
+    """Auto-detect agent capabilities (loads the capability detector on first use)."""
+    from .capability_detection import auto_detect_capabilities as _auto_detect_capabilities
+    return _auto_detect_capabilities()
 
 
 class AIMClient:
@@ -39,6 +663,20 @@ class AIMClient:
         timeout: HTTP request timeout in seconds (default: 30)
         auto_retry: Whether to automatically retry failed requests (default: True)
         max_retries: Maximum number of retry attempts (default: 3)
+        agent_cache_ttl: Seconds get_agent_details results are reused (default: 30, 0 disables)
+        background_logging: Log decorator action results from a background thread instead of
+                            before the decorated call returns, batching results that arrive
+                            close together into one request (default: False)
+        result_batch_size: Most action results sent in one background_logging request (default: 100)
+        approval_timeout: Default seconds require_approval waits for a decision before
+                          treating the action as denied (default: 3600)
+        max_pending_approvals: Most actions that may wait for approval at once; further
+                               require_approval calls are denied (default: 256)
+        stream_approvals: Follow pending approvals over one server-sent event stream
+                          instead of polling; falls back to polling if the server
+                          has no stream endpoint (default: False)
+        use_http2: Send API requests over one multiplexed HTTP/2 connection
+                   (requires aim-sdk[http2], default: False)
 
     Example:
         client = AIMClient(
@@ -64,7 +702,14 @@ class AIMClient:
         auto_retry: bool = True,
         max_retries: int = 3,
         sdk_token_id: Optional[str] = None,
-        oauth_token_manager: Optional[Any] = None
+        oauth_token_manager: Optional[Any] = None,
+        agent_cache_ttl: float = 30.0,
+        background_logging: bool = False,
+        result_batch_size: int = 100,
+        approval_timeout: int = 3600,
+        max_pending_approvals: int = 256,
+        stream_approvals: bool = False,
+        use_http2: bool = False
     ):
         # Validate required parameters
         if not agent_id:
@@ -86,49 +731,105 @@ class AIMClient:
         self.auto_retry = auto_retry
         self.max_retries = max_retries
         self.oauth_token_manager = oauth_token_manager
+        self.agent_cache_ttl = agent_cache_ttl
+        self.background_logging = background_logging
+        self.approval_timeout = approval_timeout
+        self.max_pending_approvals = max_pending_approvals
 
         # Initialize Ed25519 signing key (only if using cryptographic mode)
         self.signing_key = None
+        self._sk_bytes = None
         self.public_key = public_key
 
         if private_key and public_key:
             try:
-                private_key_bytes = base64.b64decode(private_key)
-                # Ed25519 private key from Go is 64 bytes (32-byte seed + 32-byte public key)
-                # PyNaCl SigningKey expects only the 32-byte seed
-                if len(private_key_bytes) == 64:
-                    # Extract seed (first 32 bytes)
-                    seed = private_key_bytes[:32]
-                    self.signing_key = SigningKey(seed)
-                elif len(private_key_bytes) == 32:
-                    # Already just the seed
-                    self.signing_key = SigningKey(private_key_bytes)
-                else:
-                    raise ValueError(f"Invalid private key length: {len(private_key_bytes)} bytes (expected 32 or 64)")
+                # _sk_bytes: expanded 64-byte libsodium secret key, signed with directly in _sign_message
+                self.signing_key, derived_public_key, self._sk_bytes = _parse_private_key(private_key)
             except Exception as e:
                 raise ConfigurationError(f"Invalid private key format: {e}")
 
-            # Verify public key matches
+            # Verify public key matches (raw 32-byte compare, no re-encoding)
             try:
-                expected_public_key = self.signing_key.verify_key.encode(encoder=Base64Encoder).decode('utf-8')
-                if expected_public_key != public_key:
-                    raise ConfigurationError("Public key does not match private key")
+                public_key_bytes = _base64.b64decode(public_key)
             except Exception as e:
                 raise ConfigurationError(f"Key validation failed: {e}")
+            if not hmac.compare_digest(derived_public_key, public_key_bytes):
+                raise ConfigurationError("Public key does not match private key")
 
         # Load SDK token ID from credentials if not provided (only in OAuth mode)
         # Skip if using API key mode to avoid unnecessary credential loading
         if not sdk_token_id and not api_key:
-            sdk_creds = load_sdk_credentials(use_secure_storage=False)  # Disable secure storage for speed
-            if sdk_creds and 'sdk_token_id' in sdk_creds:
-                sdk_token_id = sdk_creds['sdk_token_id']
+            manager_creds = getattr(oauth_token_manager, 'credentials', None)
+            if isinstance(manager_creds, dict) and manager_creds.get('sdk_token_id'):
+                # Token manager already holds the credentials in memory
+                sdk_token_id = manager_creds['sdk_token_id']
+            else:
+                sdk_token_id = _default_sdk_token_id()
 
         self.sdk_token_id = sdk_token_id
 
-        # Session for connection pooling
+        # Auth mode for _make_request never changes after construction, so pick it once:
+        # Ed25519 signature (highest priority), then API key, then OAuth
+        if self.signing_key and self.public_key and self.agent_id:
+            self._auth_for_request = self._ed25519_auth
+        elif self.api_key:
+            self._auth_for_request = self._api_key_auth
+        elif self.oauth_token_manager:
+            self._auth_for_request = self._oauth_auth
+        else:
+            self._auth_for_request = self._no_auth
+
+        # (access_token, headers) for _build_auth_headers
+        self._auth_headers_cache = None
+
+        # Cleared after the server answers 404/405 on the long-poll endpoint
+        self._long_poll_supported = True
+        # Cleared after the server answers 404/405 on the capability batch endpoint
+        self._bulk_capabilities_supported = True
+        # Cleared after the server answers 404/405 on the agent bulk endpoint
+        self._bulk_agents_supported = True
+        # Cleared after the server answers 404/405 on the verification batch status endpoint
+        self._batch_status_supported = True
+        # Pending approvals are followed over the status event stream until it answers 404/405
+        self._stream_supported = stream_approvals
+        # Shared by every request so retries back off during error storms
+        self._retry_guard = _RetryGuard()
+        # Resolves submit_for_approval futures; starts its thread on first use
+        self._approval_waiter = _ApprovalWaiter(self)
+        # agent_id -> (expires_at, details) for get_agent_details
+        self._agent_cache: Dict[str, Tuple[float, Dict]] = {}
+        # (action, resource[, args digest]) -> (expires_at, verification_id) for track_action(verification_ttl=...)
+        self._reusable_verifications: Dict[tuple, Tuple[float, Any]] = {}
+        # Detections queued by report_detection until the coalescing timer fires
+        self._detection_buffer: List[Dict[str, Any]] = []
+        self._detection_lock = threading.Lock()
+        self._detection_timer: Optional[threading.Timer] = None
+        # report key -> (expires_at, response), see _send_report_once
+        self._sent_reports: Dict[bytes, Tuple[float, Dict]] = {}
+        # Cleared after the server answers 404/405 on the action result batch endpoint
+        self._batch_results_supported = True
+        # Queues decorator action results; its thread only starts on first use
+        self._result_batcher = _ResultBatcher(self, result_batch_size) if background_logging else None
+
+        # Verification uses cryptographic signature authentication (Ed25519), so
+        # its headers never carry auth tokens and can be built once
+        self._verify_headers = {
+            'Content-Type': 'application/json',
+            'User-Agent': _USER_AGENT
+        }
+        if sdk_token_id:
+            # SDK token header is for usage tracking only, not auth
+            self._verify_headers['X-SDK-Token'] = sdk_token_id
+
+        # Session for connection pooling. Concurrent callers (verify_actions_batch,
+        # report_capabilities) share one host, so allow more than the default 10
+        # pooled connections. Retries are handled by _make_request.
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         headers = {
-            'User-Agent': f'AIM-Python-SDK/1.0.0',
+            'User-Agent': _USER_AGENT,
             'Content-Type': 'application/json'
         }
 
@@ -138,6 +839,25 @@ class AIMClient:
 
         self.session.headers.update(headers)
 
+        # Optional HTTP/2 client for _make_request; requests are still prepared by
+        # the session, then sent as multiplexed streams on one connection
+        self._http2_client = None
+        if use_http2:
+            if not HTTPX_AVAILABLE:
+                raise ConfigurationError("use_http2 requires httpx. Install with: pip install 'aim-sdk[http2]'")
+            try:
+                self._http2_client = httpx.Client(
+                    http2=True,
+                    timeout=timeout,
+                    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+                )
+            except ImportError as e:
+                # httpx is installed without the h2 package
+                raise ConfigurationError(f"use_http2 requires httpx[http2]: {e}")
+
+        # (method, endpoint) -> (PreparedRequest template, send() settings), see _prepared_template
+        self._prep_cache: Dict[tuple, tuple] = {}
+
     def _sign_message(self, message: str) -> str:
         """
         Sign a message using Ed25519 private key.
@@ -148,27 +868,39 @@ class AIMClient:
         Returns:
             Base64-encoded signature
         """
-        message_bytes = message.encode('utf-8')
-        signed = self.signing_key.sign(message_bytes)
-        signature = signed.signature
-        return base64.b64encode(signature).decode('utf-8')
+        return self._sign_bytes(message.encode('utf-8'))
+
+    def _sign_bytes(self, message: bytes) -> str:
+        """Sign already-encoded message bytes; returns the Base64-encoded signature."""
+        signature = crypto_sign(message, self._sk_bytes)[:crypto_sign_BYTES]
+        return _base64.b64encode(signature).decode('ascii')
 
     def _make_request(
         self,
         method: str,
         endpoint: str,
         data: Optional[Dict] = None,
-        retry_count: int = 0,
-        custom_headers: Optional[Dict] = None
+        custom_headers: Optional[Dict] = None,
+        timeout: Optional[Any] = None,
+        retry: bool = True
     ) -> Dict:
         """
         Make authenticated HTTP request to AIM server.
 
+        Timeouts, connection errors, 429 and 5xx responses are retried with
+        exponential backoff (up to max_retries) when auto_retry is enabled,
+        unless the retry guard has seen most recent requests fail. A
+        Retry-After header on a 429/503 replaces the backoff (capped at 30s).
+        The signed headers are reused across attempts; the server accepts
+        timestamps within a 5 minute window.
+
         Args:
             method: HTTP method (GET, POST, etc.)
             endpoint: API endpoint path
             data: Request payload (for POST/PUT)
-            retry_count: Current retry attempt number
+            timeout: Seconds or a (connect, read) tuple for this request
+                (default: the client's timeout)
+            retry: Set False to send this request once even when auto_retry is enabled
 
         Returns:
             Response JSON data
@@ -177,86 +909,54 @@ class AIMClient:
             AuthenticationError: If authentication fails
             VerificationError: If request fails after retries
         """
-        url = f"{self.aim_url}{endpoint}"
-
-        # Prepare additional headers (merge with session headers)
-        additional_headers = {}
+        # Per-request auth headers; requests merges them over the session headers
+        # (additional_headers take precedence)
+        additional_headers, json_body = self._auth_for_request(method, endpoint, data)
+
+        template, send_kwargs = self._prepared_template(method, endpoint)
+        prepared = template.copy()
+        prepared.headers.update(additional_headers)
+        # CRITICAL: If we have pre-serialized JSON (for Ed25519 signing), use it directly
+        # Otherwise serialize here (orjson when available) rather than via requests' json=
+        if json_body is None and data is not None:
+            json_body = _dumps(data)
+            prepared.headers['Content-Type'] = 'application/json'
+        prepared.prepare_body(json_body, None)
+
+        if timeout is None:
+            timeout = self.timeout
+        if self._http2_client is not None:
+            timeout = _httpx_timeout(timeout)
+        attempts = max(self.max_retries, 0) + 1 if self.auto_retry and retry else 1
+        retry_after = None
+        for attempt in range(attempts):
+            if attempt:
+                # Server-requested delay, else exponential backoff; capped at 30s
+                time.sleep(min(2 ** (attempt - 1) if retry_after is None else retry_after, 30))
 
-        # Add Ed25519 signature authentication if signing key is available (highest priority)
-        if self.signing_key and self.public_key and self.agent_id:
             try:
-                import time
-                import json
-
-                # Create timestamp
-                timestamp = str(int(time.time()))
-
-                # Create message to sign: method + endpoint + timestamp + body
-                message_parts = [method.upper(), endpoint, timestamp]
-                json_body_str = None
-                if data:
-                    json_body_str = json.dumps(data, sort_keys=True)
-                    message_parts.append(json_body_str)
-                    print(f"🔍 SDK signing JSON body: {json_body_str[:200]}...")
-                message = '\n'.join(message_parts)
-                print(f"🔍 SDK signing full message:\n{message[:500]}...")
-
-                # Sign the message
-                signature = self.signing_key.sign(message.encode('utf-8')).signature
-                signature_b64 = Base64Encoder.encode(signature).decode('utf-8')
-
-                # Add Ed25519 signature headers
-                additional_headers['X-Agent-ID'] = self.agent_id
-                additional_headers['X-Signature'] = signature_b64
-                additional_headers['X-Timestamp'] = timestamp
-                additional_headers['X-Public-Key'] = self.public_key
-
-                # CRITICAL: Use pre-serialized JSON to ensure exact same format as signed
-                if json_body_str:
-                    additional_headers['Content-Type'] = 'application/json'
-
-            except Exception as e:
-                # If Ed25519 signing fails, fall back to other methods
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning(f"Ed25519 signing failed: {e}")
-
-        # Add API key authentication if available (fallback)
-        elif self.api_key:
-            additional_headers['X-API-Key'] = self.api_key
-
-        # Add OAuth authorization if token manager is available (fallback)
-        elif self.oauth_token_manager:
-            try:
-                access_token = self.oauth_token_manager.get_access_token()
-                if access_token:
-                    additional_headers['Authorization'] = f'Bearer {access_token}'
-            except Exception:
-                # If OAuth token fails, no authentication will be added
-                pass
+                if self._http2_client is None:
+                    response = self.session.send(prepared, timeout=timeout, **send_kwargs)
+                else:
+                    # HTTP/2 forbids connection-specific headers such as requests' Connection: keep-alive
+                    headers = {k: v for k, v in prepared.headers.items() if k.lower() not in _HOP_BY_HOP_HEADERS}
+                    response = self._http2_client.request(
+                        prepared.method, prepared.url, content=prepared.body, headers=headers, timeout=timeout
+                    )
+            except _TIMEOUT_ERRORS:
+                error = VerificationError("Request timeout")
+                if self._retry_guard.record(False):
+                    continue
+                break
+            except _CONNECTION_ERRORS:
+                error = VerificationError("Connection failed")
+                if self._retry_guard.record(False):
+                    continue
+                break
+            except _REQUEST_ERRORS as e:
+                raise VerificationError(f"Request failed: {e}")
 
-        # Merge session headers with additional headers (additional_headers take precedence)
-        merged_headers = {**self.session.headers, **additional_headers}
-
-        try:
-            # CRITICAL: If we have pre-serialized JSON (for Ed25519 signing), use it directly
-            # Otherwise use json=data to let requests serialize it
-            if 'json_body_str' in locals() and json_body_str is not None:
-                response = self.session.request(
-                    method=method,
-                    url=url,
-                    data=json_body_str,
-                    headers=merged_headers,
-                    timeout=self.timeout
-                )
-            else:
-                response = self.session.request(
-                    method=method,
-                    url=url,
-                    json=data,
-                    headers=merged_headers,
-                    timeout=self.timeout
-                )
+            retry_allowed = self._retry_guard.record(response.status_code < 500)
 
             # Handle authentication errors
             if response.status_code == 401:
@@ -266,39 +966,106 @@ class AIMClient:
             if response.status_code == 403:
                 raise AuthenticationError("Forbidden - insufficient permissions")
 
-            # Retry on server errors if enabled
-            if response.status_code >= 500 and self.auto_retry and retry_count < self.max_retries:
-                time.sleep(2 ** retry_count)  # Exponential backoff
-                return self._make_request(method, endpoint, data, retry_count + 1)
+            # Retry on rate limiting and server errors if enabled and the server
+            # isn't rejecting most requests
+            if (response.status_code >= 500 or response.status_code == 429) and attempt + 1 < attempts and retry_allowed:
+                retry_after = _retry_after_seconds(response)
+                continue
 
             # Debug 400 errors (disabled in production)
             # if response.status_code == 400:
             #     print(f"[DEBUG] 400 Bad Request - Response body: {response.text}")
 
-            response.raise_for_status()
-            return response.json()
+            try:
+                response.raise_for_status()
+                return _loads(response.content)
+            except _REQUEST_ERRORS + (ValueError,) as e:
+                # Chained so callers can inspect e.__cause__.response.status_code
+                raise VerificationError(f"Request failed: {e}") from e
 
-        except requests.exceptions.Timeout:
-            if self.auto_retry and retry_count < self.max_retries:
-                time.sleep(2 ** retry_count)
-                return self._make_request(method, endpoint, data, retry_count + 1)
-            raise VerificationError("Request timeout")
+        raise error
 
-        except requests.exceptions.ConnectionError:
-            if self.auto_retry and retry_count < self.max_retries:
-                time.sleep(2 ** retry_count)
-                return self._make_request(method, endpoint, data, retry_count + 1)
-            raise VerificationError("Connection failed")
+    def _ed25519_auth(self, method: str, endpoint: str, data: Optional[Dict]) -> Tuple[Dict[str, str], Optional[bytes]]:
+        """Ed25519 signature headers plus the exact body bytes that were signed."""
+        try:
+            # Create timestamp
+            timestamp = str(int(time.time()))
+
+            # Create message to sign: method + endpoint + timestamp + body
+            json_body = None
+            if data:
+                json_body = _dumps_sorted(data)
+                message = b''.join((_signing_prefix(method, endpoint), timestamp.encode(), b'\n', json_body))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("SDK signing JSON body: %s...", json_body[:200].decode('utf-8', 'replace'))
+            else:
+                message = _signing_prefix(method, endpoint) + timestamp.encode()
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("SDK signing full message:\n%s...", message[:500].decode('utf-8', 'replace'))
 
-        except requests.exceptions.RequestException as e:
-            raise VerificationError(f"Request failed: {e}")
+            headers = {
+                'X-Agent-ID': self.agent_id,
+                'X-Signature': self._sign_bytes(message),
+                'X-Timestamp': timestamp,
+                'X-Public-Key': self.public_key
+            }
+
+            # CRITICAL: Use pre-serialized JSON to ensure exact same format as signed
+            if json_body:
+                headers['Content-Type'] = 'application/json'
+            return headers, json_body
+
+        except Exception as e:
+            # If Ed25519 signing fails, the request is sent without authentication
+            logger.warning("Ed25519 signing failed: %s", e)
+            return {}, None
+
+    def _api_key_auth(self, method: str, endpoint: str, data: Optional[Dict]) -> Tuple[Dict[str, str], None]:
+        """API key header."""
+        return {'X-API-Key': self.api_key}, None
+
+    def _oauth_auth(self, method: str, endpoint: str, data: Optional[Dict]) -> Tuple[Dict[str, str], None]:
+        """OAuth bearer token header."""
+        try:
+            access_token = self.oauth_token_manager.get_access_token()
+            if access_token:
+                return {'Authorization': f'Bearer {access_token}'}, None
+        except Exception:
+            # If OAuth token fails, no authentication will be added
+            pass
+        return {}, None
+
+    def _no_auth(self, method: str, endpoint: str, data: Optional[Dict]) -> Tuple[Dict[str, str], None]:
+        """No authentication available."""
+        return {}, None
+
+    def _prepared_template(self, method: str, endpoint: str):
+        """
+        Get the cached PreparedRequest template and send() settings for (method, endpoint).
+
+        Templates carry the session headers, cookies and hooks as of first use, so
+        repeat calls skip URL parsing and session merging. Callers must copy() the
+        template before adding headers or a body.
+        """
+        key = (method.upper(), endpoint)
+        cached = self._prep_cache.get(key)
+        if cached is None:
+            if len(self._prep_cache) >= 64:
+                # Endpoints embed resource IDs - keep the cache bounded
+                self._prep_cache.clear()
+            url = f"{self.aim_url}{endpoint}"
+            template = self.session.prepare_request(requests.Request(method, url))
+            send_kwargs = self.session.merge_environment_settings(url, {}, None, None, None)
+            cached = self._prep_cache[key] = (template, send_kwargs)
+        return cached
 
     def verify_action(
         self,
         action_type: str,
         resource: Optional[str] = None,
         context: Optional[Dict[str, Any]] = None,
-        timeout_seconds: int = 300
+        timeout_seconds: int = 300,
+        wait: bool = True
     ) -> Dict:
         """
         Request verification for an action from AIM.
@@ -315,6 +1082,9 @@ class AIMClient:
             resource: Resource being accessed (e.g., "users_table", "admin@example.com")
             context: Additional context about the action
             timeout_seconds: Maximum time to wait for approval (default: 300s = 5min)
+            wait: Wait for a pending verification to be decided (default: True). With
+                  False, a pending verification returns {"verified": False,
+                  "verification_id": ..., "status": "pending"} immediately
 
         Returns:
             Verification result dict with keys:
@@ -328,35 +1098,31 @@ class AIMClient:
             VerificationError: If verification request fails
         """
         # Create verification request payload
-        timestamp = datetime.utcnow().isoformat() + 'Z'  # Match backend expected format
+        # Single timestamp shared by the signed message and the body. Same string as
+        # the old utcnow().isoformat() + 'Z' (utcnow is deprecated since 3.12)
+        timestamp = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
 
 
         # Create signature for Ed25519 verification
         # The backend verifies the signature by reconstructing the JSON payload
         # We need to create a signature of the JSON payload itself
-        signature_payload = {
+        payload = {
             "action_type": action_type,
             "agent_id": self.agent_id,
             "context": context or {},
             "resource": resource,
             "timestamp": timestamp
         }
-        
+
         # Create deterministic JSON (sorted keys, spaces after colons and commas)
-        signature_message = json.dumps(signature_payload, sort_keys=True, separators=(', ', ': '))
+        signature_message = json.dumps(payload, sort_keys=True, separators=(', ', ': '))
 
         # Sign with Ed25519
-        signature = self._sign_message(signature_message)
+        payload["signature"] = self._sign_message(signature_message)  # Ed25519 signature in body
+        payload["public_key"] = self.public_key  # Public key in body
 
-        request_payload = {
-            "agent_id": self.agent_id,
-            "action_type": action_type,
-            "resource": resource,
-            "context": context or {},
-            "timestamp": timestamp,
-            "signature": signature,  # Ed25519 signature in body
-            "public_key": self.public_key  # Public key in body
-        }
+        # Serialize the request body exactly once (sent pre-encoded below)
+        body = _dumps_sorted(payload)
 
         # SDK API endpoint
         endpoint = "/api/v1/sdk-api/verifications"
@@ -365,22 +1131,12 @@ class AIMClient:
         try:
             url = f"{self.aim_url}{endpoint}"
 
-            # Prepare headers - NO AUTH TOKENS for verification endpoint!
-            # Verification uses cryptographic signature authentication (Ed25519)
-            headers = {
-                'Content-Type': 'application/json',
-                'User-Agent': f'AIM-Python-SDK/1.0.0'
-            }
-
-            # Add SDK token header if available (for usage tracking only, not auth)
-            if self.sdk_token_id:
-                headers['X-SDK-Token'] = self.sdk_token_id
-            
+            # NO AUTH TOKENS for verification endpoint - headers precomputed in __init__
             response = self.session.request(
                 method="POST",
                 url=url,
-                json=request_payload,
-                headers=headers,
+                data=body,
+                headers=self._verify_headers,
                 timeout=self.timeout
             )
 
@@ -398,8 +1154,10 @@ class AIMClient:
 
             # Handle 404 - endpoint not found (server may not be running or endpoint doesn't exist)
             if response.status_code == 404:
-                print(f" Warning: AIM verification endpoint not found (404). Server may not be running.")
-                print(f"   Returning default 'pending' status. Action will be treated as requiring approval.")
+                logger.warning(
+                    "AIM verification endpoint not found (404). Server may not be running. "
+                    "Returning default 'pending' status. Action will be treated as requiring approval."
+                )
                 return {
                     "verified": False,
                     "verification_id": None,
@@ -416,8 +1174,9 @@ class AIMClient:
                 except:
                     error_msg = f"{error_msg}: {response.text[:200]}"
                 
-                print(f" Warning: Verification request failed: {error_msg}")
-                print(f"   Returning default 'pending' status.")
+                logger.warning(
+                    "Verification request failed: %s. Returning default 'pending' status.", error_msg
+                )
                 return {
                     "verified": False,
                     "verification_id": None,
@@ -426,7 +1185,7 @@ class AIMClient:
                 }
 
             response.raise_for_status()
-            result = response.json()
+            result = _loads(response.content)
 
             verification_id = result.get("id")
             status = result.get("status")
@@ -447,6 +1206,12 @@ class AIMClient:
 
             # If pending, poll for result
             if status == "pending":
+                if not wait:
+                    return {
+                        "verified": False,
+                        "verification_id": verification_id,
+                        "status": "pending"
+                    }
                 return self._wait_for_approval(verification_id, timeout_seconds)
 
             raise VerificationError(f"Unexpected verification status: {status}")
@@ -455,8 +1220,10 @@ class AIMClient:
             raise
         except requests.exceptions.RequestException as e:
             # Handle network errors (connection refused, timeout, etc.)
-            print(f" Warning: Network error during verification: {type(e).__name__}: {str(e)}")
-            print(f"   Returning default 'pending' status. Action will be treated as requiring approval.")
+            logger.warning(
+                "Network error during verification: %s: %s. Returning default 'pending' status. "
+                "Action will be treated as requiring approval.", type(e).__name__, e
+            )
             return {
                 "verified": False,
                 "verification_id": None,
@@ -465,8 +1232,9 @@ class AIMClient:
             }
         except json.JSONDecodeError as e:
             # Handle JSON parsing errors
-            print(f"  Warning: Invalid JSON response from server: {str(e)}")
-            print(f"   Returning default 'pending' status.")
+            logger.warning(
+                "Invalid JSON response from server: %s. Returning default 'pending' status.", e
+            )
             return {
                 "verified": False,
                 "verification_id": None,
@@ -475,8 +1243,10 @@ class AIMClient:
             }
         except Exception as e:
             # Catch all other exceptions
-            print(f"  Warning: Unexpected error during verification: {type(e).__name__}: {str(e)}")
-            print(f"   Returning default 'pending' status.")
+            logger.warning(
+                "Unexpected error during verification: %s: %s. Returning default 'pending' status.",
+                type(e).__name__, e
+            )
             return {
                 "verified": False,
                 "verification_id": None,
@@ -484,6 +1254,127 @@ class AIMClient:
                 "error": f"Unexpected error: {type(e).__name__}: {str(e)}"
             }
 
+    async def averify_action(
+        self,
+        action_type: str,
+        resource: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+        timeout_seconds: int = 300
+    ) -> Dict:
+        """
+        Async variant of verify_action for use inside an event loop.
+
+        Only the initial verification request runs in the loop's default
+        executor. A pending approval is then awaited on the client's shared
+        approval waiter (see submit_for_approval), so waiting ties up no
+        executor thread. Arguments, return value and exceptions match
+        verify_action, plus ApprovalCapacityError once max_pending_approvals
+        actions are already waiting.
+        """
+        import asyncio  # Already loaded by the caller's event loop
+        loop = asyncio.get_running_loop()
+        future = await loop.run_in_executor(
+            None,
+            functools.partial(self.submit_for_approval, action_type, resource, context, timeout_seconds)
+        )
+        return await asyncio.wrap_future(future)
+
+    def submit_for_approval(
+        self,
+        action_type: str,
+        resource: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+        timeout_seconds: Optional[int] = None
+    ) -> Future:
+        """
+        Request verification without blocking while it waits for approval.
+
+        The verification is created right away; if it is pending, one background
+        thread per client polls all pending verifications with backoff and
+        resolves the returned future once an admin decides.
+
+        Args:
+            action_type: Type of action (e.g., "delete_users")
+            resource: Resource being accessed
+            context: Additional context about the action
+            timeout_seconds: Maximum time to wait for approval (default: the client's approval_timeout)
+
+        Returns:
+            concurrent.futures.Future resolving to the verify_action result dict.
+            Use future.result() to block, or asyncio.wrap_future(future) to await.
+            The future raises ActionDeniedError if the action is denied,
+            ApprovalTimeoutError (a VerificationError) if approval times out and
+            ApprovalCapacityError (a VerificationError) if max_pending_approvals
+            actions are already waiting.
+
+        Example:
+            future = client.submit_for_approval("delete_all_users", resource="users")
+            ...  # do other work
+            result = future.result()
+        """
+        if timeout_seconds is None:
+            timeout_seconds = self.approval_timeout
+        future: Future = Future()
+        if len(self._approval_waiter) >= self.max_pending_approvals:
+            # Refuse before creating another verification the dashboard would have to clear
+            future.set_exception(ApprovalCapacityError(
+                f"Too many actions waiting for approval ({self.max_pending_approvals})"
+            ))
+            return future
+        try:
+            result = self.verify_action(action_type, resource, context, timeout_seconds, wait=False)
+        except Exception as e:
+            future.set_exception(e)
+            return future
+
+        if result.get("status") == "pending" and result.get("verification_id") and not result.get("error"):
+            return self._approval_waiter.wait(result["verification_id"], timeout_seconds)
+        future.set_result(result)
+        return future
+
+    def verify_actions_batch(
+        self,
+        actions: List[Dict[str, Any]],
+        timeout_seconds: int = 300,
+        max_workers: int = 8
+    ) -> List[Dict]:
+        """
+        Verify several actions concurrently.
+
+        Each action is signed and sent independently (the server verifies them
+        one by one), but requests share the session's connection pool and
+        pending approvals are awaited in parallel instead of back to back.
+
+        Args:
+            actions: Dicts with verify_action keyword arguments
+                (action_type, and optionally resource and context)
+            timeout_seconds: Maximum time to wait for each approval
+            max_workers: Maximum number of verifications in flight
+
+        Returns:
+            One verify_action result dict per action, in input order. Denied
+            actions are returned as {"verified": False, "status": "denied", ...}
+            instead of raising ActionDeniedError.
+
+        Raises:
+            AuthenticationError: If authentication fails
+        """
+        def verify(action: Dict[str, Any]) -> Dict:
+            try:
+                return self.verify_action(timeout_seconds=timeout_seconds, **action)
+            except ActionDeniedError as e:
+                return {
+                    "verified": False,
+                    "verification_id": None,
+                    "status": "denied",
+                    "error": str(e)
+                }
+
+        if len(actions) <= 1:
+            return [verify(action) for action in actions]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(actions))) as executor:
+            return list(executor.map(verify, actions))
+
     def _wait_for_approval(self, verification_id: str, timeout_seconds: int) -> Dict:
         """
         Poll AIM server for verification approval.
@@ -499,34 +1390,36 @@ class AIMClient:
             ActionDeniedError: If action is denied
             VerificationError: If timeout or polling fails
         """
-        start_time = time.time()
-        poll_interval = 2  # Start with 2 second polls
-
-        while time.time() - start_time < timeout_seconds:
+        start_time = time.monotonic()
+
+        # Prefer a single held-open request; fall back to polling if the server lacks it
+        if self._long_poll_supported:
+            while True:
+                remaining = timeout_seconds - (time.monotonic() - start_time)
+                if remaining <= 0:
+                    raise ApprovalTimeoutError(f"Verification timeout after {timeout_seconds} seconds")
+                result = self._long_poll_for_approval(verification_id, min(remaining, 60))
+                if result is None:
+                    break
+                if result.get("status") in ("approved", "denied"):
+                    return self._approval_result(verification_id, result)
+
+        # Use direct HTTP call to avoid signature issues
+        url = f"{self.aim_url}/api/v1/sdk-api/verifications/{verification_id}"
+
+        # Fetch auth once; only re-fetched after a 401
+        headers = self._build_auth_headers()
+        reauthenticated = False
+
+        delays = _poll_delays()
+
+        def pause() -> None:
+            # Back off, but never sleep past the deadline
+            remaining = timeout_seconds - (time.monotonic() - start_time)
+            time.sleep(max(min(next(delays), remaining), 0))
+
+        while time.monotonic() - start_time < timeout_seconds:
             try:
-                # Use direct HTTP call to avoid signature issues
-                url = f"{self.aim_url}/api/v1/sdk-api/verifications/{verification_id}"
-                
-                # Prepare headers - use API key if available, otherwise OAuth
-                headers = {
-                    'Content-Type': 'application/json',
-                    'User-Agent': f'AIM-Python-SDK/1.0.0'
-                }
-                
-                if self.api_key:
-                    headers['X-API-Key'] = self.api_key
-                elif self.oauth_token_manager:
-                    try:
-                        access_token = self.oauth_token_manager.get_access_token()
-                        if access_token:
-                            headers['Authorization'] = f'Bearer {access_token}'
-                    except Exception:
-                        pass  # Continue without OAuth if it fails
-                
-                # Add SDK token header if available
-                if self.sdk_token_id:
-                    headers['X-SDK-Token'] = self.sdk_token_id
-                
                 response = self.session.request(
                     method="GET",
                     url=url,
@@ -534,9 +1427,13 @@ class AIMClient:
                     timeout=self.timeout
                 )
                 
-                # Handle authentication errors
+                # Handle authentication errors - token may have expired mid-wait, retry once
                 if response.status_code == 401:
-                    raise AuthenticationError("Authentication failed - invalid agent credentials")
+                    if reauthenticated:
+                        raise AuthenticationError("Authentication failed - invalid agent credentials")
+                    headers = self._build_auth_headers()
+                    reauthenticated = True
+                    continue
 
                 # Handle forbidden errors
                 if response.status_code == 403:
@@ -544,7 +1441,7 @@ class AIMClient:
 
                 # Handle 404 - endpoint not found
                 if response.status_code == 404:
-                    print(f" Warning: Verification endpoint not found (404). Cannot poll for approval.")
+                    logger.warning("Verification endpoint not found (404). Cannot poll for approval.")
                     raise VerificationError("Verification endpoint not available - cannot complete approval process")
 
                 # Handle other HTTP errors
@@ -556,51 +1453,236 @@ class AIMClient:
                     except:
                         error_msg = f"{error_msg}: {response.text[:200]}"
                     # Continue polling on transient errors, but log the issue
-                    print(f" Warning: Error polling verification status: {error_msg}")
-                    time.sleep(poll_interval)
-                    poll_interval = min(poll_interval * 1.5, 10)
+                    logger.warning("Error polling verification status: %s", error_msg)
+                    pause()
                     continue
 
                 response.raise_for_status()
                 result = response.json()
 
-                status = result.get("status")
+                if result.get("status") in ("approved", "denied"):
+                    return self._approval_result(verification_id, result)
+
+                # Still pending, wait and retry
+                pause()
+
+            except (AuthenticationError, ActionDeniedError, VerificationError):
+                raise
+            except requests.exceptions.RequestException as e:
+                # Handle network errors - continue polling on transient network issues
+                logger.warning("Network error while polling: %s: %s", type(e).__name__, e)
+                pause()
+            except json.JSONDecodeError as e:
+                # Handle JSON parsing errors - continue polling
+                logger.warning("Invalid JSON response while polling: %s", e)
+                pause()
+            except Exception as e:
+                # Continue polling on any other transient errors
+                logger.warning("Unexpected error while polling: %s: %s", type(e).__name__, e)
+                pause()
+
+        raise ApprovalTimeoutError(f"Verification timeout after {timeout_seconds} seconds")
+
+    def _build_auth_headers(self) -> Dict[str, str]:
+        """
+        Headers for verification status and result requests - API key if available,
+        otherwise OAuth. The dict is cached and only rebuilt when the OAuth access
+        token changes, so callers must not modify it.
+        """
+        access_token = None
+        if not self.api_key and self.oauth_token_manager:
+            try:
+                access_token = self.oauth_token_manager.get_access_token()
+            except Exception:
+                pass  # Continue without OAuth if it fails
+
+        cached = self._auth_headers_cache
+        if cached is not None and cached[0] == access_token:
+            return cached[1]
+
+        headers = {
+            'Content-Type': 'application/json',
+            'User-Agent': _USER_AGENT
+        }
+
+        if self.api_key:
+            headers['X-API-Key'] = self.api_key
+        elif access_token:
+            headers['Authorization'] = f'Bearer {access_token}'
+
+        # Add SDK token header if available
+        if self.sdk_token_id:
+            headers['X-SDK-Token'] = self.sdk_token_id
+
+        self._auth_headers_cache = (access_token, headers)
+        return headers
+
+    def _long_poll_for_approval(self, verification_id: str, wait_seconds: float) -> Optional[Dict]:
+        """
+        Wait on the server for a verification decision with one held-open request.
+
+        Returns:
+            Verification JSON (status may still be "pending" if the wait elapsed),
+            or None if the caller should fall back to polling.
+        """
+        url = f"{self.aim_url}/api/v1/sdk-api/verifications/{verification_id}/wait"
+        # Token may expire during a long wait - re-fetch auth and retry once after a 401
+        for _ in range(2):
+            try:
+                response = self.session.get(
+                    url,
+                    params={"timeout": int(wait_seconds)},
+                    headers=self._build_auth_headers(),
+                    timeout=(self.timeout, wait_seconds + 5)
+                )
+            except requests.exceptions.RequestException:
+                return None
+            if response.status_code != 401:
+                break
+        else:
+            raise AuthenticationError("Authentication failed - invalid agent credentials")
+
+        if response.status_code in (404, 405):
+            # Server has no long-poll endpoint - don't try again for this client
+            self._long_poll_supported = False
+            return None
+        if response.status_code == 403:
+            raise AuthenticationError("Forbidden - insufficient permissions")
+        if response.status_code != 200:
+            return None
+
+        try:
+            result = response.json()
+        except ValueError:
+            return None
+        return result if isinstance(result, dict) else None
+
+    def _poll_verification(self, verification_id: str) -> Optional[Dict]:
+        """
+        Fetch a pending verification's status once, for _ApprovalWaiter.
+
+        Returns None on transient errors so the caller polls again later.
+        """
+        try:
+            response = self.session.get(
+                f"{self.aim_url}/api/v1/sdk-api/verifications/{verification_id}",
+                headers=self._build_auth_headers(),
+                timeout=self.timeout
+            )
+        except requests.exceptions.RequestException as e:
+            logger.warning("Error polling verification status: %s", e)
+            return None
+
+        if response.status_code in (401, 403):
+            raise AuthenticationError(f"Polling verification failed: HTTP {response.status_code}")
+        if response.status_code == 404:
+            raise VerificationError("Verification endpoint not available - cannot complete approval process")
+        if response.status_code >= 400:
+            logger.warning("Error polling verification status: HTTP %s error", response.status_code)
+            return None
+        try:
+            return _loads(response.content)
+        except ValueError:
+            return None
+
+    def _poll_verifications_batch(self, verification_ids: List[str]) -> Optional[Dict[str, Dict]]:
+        """
+        Fetch several pending verifications' statuses with one request.
+
+        Returns:
+            verification_id -> status dict (IDs missing from the response are
+            still pending), or None if the caller should poll one by one.
+        """
+        if not self._batch_status_supported:
+            return None
+        try:
+            result = self._make_request(
+                method="POST",
+                endpoint="/api/v1/sdk-api/verifications:batchStatus",
+                data={"ids": verification_ids}
+            )
+        except Exception as e:
+            response = getattr(e.__cause__, "response", None)
+            if response is not None and response.status_code in (404, 405):
+                # Server has no batch status endpoint - don't try again for this client
+                self._batch_status_supported = False
+            return None
+
+        verifications = result.get("verifications") if isinstance(result, dict) else None
+        if not isinstance(verifications, list):
+            return None
+        return {v.get("id"): v for v in verifications if isinstance(v, dict)}
+
+    def _open_verification_stream(self, read_timeout: float) -> Optional[requests.Response]:
+        """
+        Open the server-sent event stream of this agent's verification status changes.
+
+        Returns None (and stops trying for this client) if the server has no
+        stream endpoint.
+        """
+        response = self.session.request(
+            method="GET",
+            url=f"{self.aim_url}/api/v1/sdk-api/verifications:stream",
+            headers={**self._build_auth_headers(), 'Accept': 'text/event-stream'},
+            stream=True,
+            timeout=(self.timeout, read_timeout)
+        )
+        if response.status_code in (404, 405):
+            response.close()
+            self._stream_supported = False
+            return None
+        try:
+            response.raise_for_status()
+        except Exception:
+            response.close()
+            raise
+        return response
+
+    def stream_verifications(
+        self,
+        verification_ids: Optional[Iterable[str]] = None,
+        read_timeout: float = 60
+    ) -> Iterator[Dict]:
+        """
+        Yield verification status changes as the server pushes them.
 
-                if status == "approved":
-                    return {
-                        "verified": True,
-                        "verification_id": verification_id,
-                        "approved_by": result.get("approved_by"),
-                        "expires_at": result.get("expires_at")
-                    }
+        Args:
+            verification_ids: Only yield these verifications (default: all of this agent's)
+            read_timeout: Seconds without any data from the server before giving up
 
-                if status == "denied":
-                    reason = result.get("denial_reason", "Action denied")
-                    raise ActionDeniedError(f"Action denied: {reason}")
+        Yields:
+            Status dicts like the verification status endpoint returns
+            ({"id": ..., "status": ...})
 
-                # Still pending, wait and retry
-                time.sleep(poll_interval)
-                poll_interval = min(poll_interval * 1.5, 10)  # Exponential backoff up to 10s
+        Raises:
+            VerificationError: If the server doesn't support status streaming
+        """
+        wanted = set(verification_ids) if verification_ids is not None else None
+        response = self._open_verification_stream(read_timeout)
+        if response is None:
+            raise VerificationError("Verification status streaming is not supported by this server")
+        with response:
+            for status in _iter_sse_data(response):
+                if isinstance(status, dict) and (wanted is None or status.get("id") in wanted):
+                    yield status
+
+    def _approval_result(self, verification_id: str, result: Dict) -> Dict:
+        """Map a decided verification to the verify_action result dict (raises on denial)."""
+        status = result.get("status")
+
+        if status == "approved":
+            return {
+                "verified": True,
+                "verification_id": verification_id,
+                "approved_by": result.get("approved_by"),
+                "expires_at": result.get("expires_at")
+            }
 
-            except (AuthenticationError, ActionDeniedError, VerificationError):
-                raise
-            except requests.exceptions.RequestException as e:
-                # Handle network errors - continue polling on transient network issues
-                print(f"  Warning: Network error while polling: {type(e).__name__}: {str(e)}")
-                time.sleep(poll_interval)
-                poll_interval = min(poll_interval * 1.5, 10)
-            except json.JSONDecodeError as e:
-                # Handle JSON parsing errors - continue polling
-                print(f"  Warning: Invalid JSON response while polling: {str(e)}")
-                time.sleep(poll_interval)
-                poll_interval = min(poll_interval * 1.5, 10)
-            except Exception as e:
-                # Continue polling on any other transient errors
-                print(f"  Warning: Unexpected error while polling: {type(e).__name__}: {str(e)}")
-                time.sleep(poll_interval)
-                poll_interval = min(poll_interval * 1.5, 10)
+        if status == "denied":
+            reason = result.get("denial_reason", "Action denied")
+            raise ActionDeniedError(f"Action denied: {reason}")
 
-        raise VerificationError(f"Verification timeout after {timeout_seconds} seconds")
+        raise VerificationError(f"Unexpected verification status: {status}")
 
     def log_action_result(
         self,
@@ -620,40 +1702,20 @@ class AIMClient:
             result_summary: Brief summary of the result
             error_message: Error message if action failed
         """
+        self._post_action_result(
+            verification_id, _action_result_body(success, result_summary, error_message)
+        )
+
+    def _post_action_result(self, verification_id: str, body: Dict[str, Any]) -> None:
         try:
             # Use direct HTTP call to avoid signature issues
             url = f"{self.aim_url}/api/v1/sdk-api/verifications/{verification_id}/result"
-            
-            # Prepare headers - use API key if available, otherwise OAuth
-            headers = {
-                'Content-Type': 'application/json',
-                'User-Agent': f'AIM-Python-SDK/1.0.0'
-            }
-            
-            if self.api_key:
-                headers['X-API-Key'] = self.api_key
-            elif self.oauth_token_manager:
-                try:
-                    access_token = self.oauth_token_manager.get_access_token()
-                    if access_token:
-                        headers['Authorization'] = f'Bearer {access_token}'
-                except Exception:
-                    pass  # Continue without OAuth if it fails
-            
-            # Add SDK token header if available
-            if self.sdk_token_id:
-                headers['X-SDK-Token'] = self.sdk_token_id
-            
+
             response = self.session.request(
                 method="POST",
                 url=url,
-                json={
-                    "result": "success" if success else "failure",
-                    "result_summary": result_summary,
-                    "error_message": error_message,
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                },
-                headers=headers,
+                json=body,
+                headers=self._build_auth_headers(),
                 timeout=self.timeout
             )
             
@@ -663,6 +1725,50 @@ class AIMClient:
             # Don't fail the action if logging fails
             pass
 
+    def _submit_action_result(
+        self,
+        verification_id: str,
+        success: bool,
+        result_summary: Optional[str] = None,
+        error_message: Optional[str] = None
+    ) -> None:
+        """Log an action result for the decorators, in the background if background_logging is set."""
+        if self._result_batcher is None:
+            self.log_action_result(verification_id, success, result_summary, error_message)
+        else:
+            # Timestamp now, not when the batch goes out
+            self._result_batcher.enqueue(
+                verification_id, _action_result_body(success, result_summary, error_message)
+            )
+
+    def _send_action_results(self, results: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Send queued action results in one request, or one request each if the
+        server has no batch endpoint. Failures are dropped like log_action_result's.
+        """
+        if len(results) > 1 and self._batch_results_supported:
+            try:
+                response = self.session.request(
+                    method="POST",
+                    url=f"{self.aim_url}/api/v1/sdk-api/verifications/results:batch",
+                    json={"results": [
+                        dict(body, verification_id=verification_id) for verification_id, body in results
+                    ]},
+                    headers=self._build_auth_headers(),
+                    timeout=self.timeout
+                )
+                if response.status_code not in (404, 405):
+                    response.raise_for_status()
+                    return
+                self._batch_results_supported = False
+            except Exception as e:
+                # Runs on the batcher thread - nobody to raise to
+                logger.warning("Failed to log %d action results: %s", len(results), e)
+                return
+
+        for verification_id, body in results:
+            self._post_action_result(verification_id, body)
+
     def request_capability(
         self,
         capability_type: str,
@@ -726,7 +1832,7 @@ class AIMClient:
 
     def report_detections(
         self,
-        detections: list
+        detections: Iterable[Dict[str, Any]]
     ) -> Dict:
         """
         Report detected MCP servers to AIM.
@@ -735,7 +1841,7 @@ class AIMClient:
         through various detection methods (SDK imports, Claude config parsing, etc.).
 
         Args:
-            detections: List of detection events, each containing:
+            detections: Detection events (any iterable, e.g. a generator), each containing:
                 - mcpServer: str - Name/identifier of the MCP server
                 - detectionMethod: str - Method used to detect (sdk_import, claude_config, etc.)
                 - confidence: float - Confidence score (0-100)
@@ -777,7 +1883,8 @@ class AIMClient:
             result = self._make_request(
                 method="POST",
                 endpoint=f"/api/v1/detection/agents/{self.agent_id}/report",
-                data={"detections": detections}
+                # Materialized once; the body is serialized once and reused for signing
+                data={"detections": list(detections)}
             )
             return result
 
@@ -786,6 +1893,37 @@ class AIMClient:
         except Exception as e:
             raise VerificationError(f"Detection report failed: {e}")
 
+    def report_detection(self, detection: Dict[str, Any]) -> None:
+        """
+        Queue a single detection event for reporting.
+
+        Detections queued within a few milliseconds of each other are sent
+        together in one report_detections() request from a background timer.
+        Use report_detections() directly to send without delay and get the result.
+
+        Args:
+            detection: Detection event (same fields as report_detections)
+        """
+        with self._detection_lock:
+            self._detection_buffer.append(detection)
+            if self._detection_timer is None:
+                # Not a daemon, so queued detections are still sent at interpreter exit
+                self._detection_timer = threading.Timer(_DETECTION_BATCH_DELAY, self._flush_detections)
+                self._detection_timer.start()
+
+    def _flush_detections(self) -> None:
+        """Send all queued detections in one request."""
+        with self._detection_lock:
+            detections, self._detection_buffer = self._detection_buffer, []
+            self._detection_timer = None
+        if not detections:
+            return
+        try:
+            self.report_detections(detections)
+        except Exception as e:
+            # Runs on a timer thread - nobody to raise to
+            logger.warning("Failed to report %d queued detections: %s", len(detections), e)
+
     def register_mcp(
         self,
         mcp_server_id: str,
@@ -826,24 +1964,46 @@ class AIMClient:
             AuthenticationError: If authentication fails
             VerificationError: If request fails
         """
+        data = {
+            "mcp_server_ids": [mcp_server_id],
+            "detected_method": detection_method,
+            "confidence": confidence,
+            "metadata": metadata or {}
+        }
         try:
-            result = self._make_request(
-                method="POST",
-                endpoint=f"/api/v1/sdk-api/agents/{self.agent_id}/mcp-servers",
-                data={
-                    "mcp_server_ids": [mcp_server_id],
-                    "detected_method": detection_method,
-                    "confidence": confidence,
-                    "metadata": metadata or {}
-                }
+            return self._send_report_once(
+                b"mcp:" + _dumps_sorted(data),
+                lambda: self._make_request(
+                    method="POST",
+                    endpoint=f"/api/v1/sdk-api/agents/{self.agent_id}/mcp-servers",
+                    data=data
+                )
             )
-            return result
 
         except (AuthenticationError, VerificationError):
             raise
         except Exception as e:
             raise VerificationError(f"MCP registration failed: {e}")
 
+    def _send_report_once(self, key: bytes, send: Callable[[], Dict]) -> Dict:
+        """
+        Send an idempotent report, or reuse the response to an identical recent one.
+
+        Auto-detectors re-send the same SDK integration and MCP registration
+        reports; within _REPORT_DEDUP_TTL seconds the earlier response is returned.
+        """
+        now = time.monotonic()
+        cached = self._sent_reports.get(key)
+        if cached is not None and cached[0] > now:
+            return dict(cached[1])
+
+        result = send()
+        if isinstance(result, dict):
+            if len(self._sent_reports) >= 1024:
+                self._sent_reports.clear()
+            self._sent_reports[key] = (now + _REPORT_DEDUP_TTL, dict(result))
+        return result
+
     def report_capabilities(
         self,
         capabilities: List[str],
@@ -882,54 +2042,84 @@ class AIMClient:
 
         granted_count = 0
         total_count = len(capabilities)
+        scope = scope or {
+            "source": "python_sdk_auto_detection",
+            "detectedAt": datetime.now(timezone.utc).isoformat()
+        }
 
-        # Temporarily disable auto-retry for capability reporting to handle duplicates faster
-        original_auto_retry = self.auto_retry
-        self.auto_retry = False
+        # Grants are sent with retry=False so duplicates (which the backend reports
+        # as 500s) fail fast instead of backing off
 
-        try:
-            for capability_type in capabilities:
-                try:
-                    # Use SDK API endpoint for capability grant
-                    result = self._make_request(
-                        method="POST",
-                        endpoint=f"/api/v1/sdk-api/agents/{self.agent_id}/capabilities",
-                        data={
-                            "capabilityType": capability_type,
-                            "scope": scope or {
-                                "source": "python_sdk_auto_detection",
-                                "detectedAt": datetime.now(timezone.utc).isoformat()
-                            }
-                        }
-                    )
+        # One request for the whole list when the server supports it
+        if self._bulk_capabilities_supported and capabilities:
+            bulk_granted = self._grant_capabilities_bulk(capabilities, scope)
+            if bulk_granted is not None:
+                return {
+                    "granted": bulk_granted,
+                    "total": total_count
+                }
 
-                    if result:
-                        granted_count += 1
+        def grant(capability_type: str) -> bool:
+            try:
+                # Use SDK API endpoint for capability grant
+                result = self._make_request(
+                    method="POST",
+                    endpoint=f"/api/v1/sdk-api/agents/{self.agent_id}/capabilities",
+                    data={
+                        "capabilityType": capability_type,
+                        "scope": scope
+                    },
+                    retry=False
+                )
+                return bool(result)
 
-                except Exception as e:
-                    # Capability might already exist (duplicate key error) - count as granted
-                    # Check both the exception message and type
-                    error_str = str(e).lower()
-                    is_duplicate = (
-                        "duplicate" in error_str or
-                        "already exists" in error_str or
-                        "unique constraint" in error_str or
-                        "500" in error_str  # Backend returns 500 for duplicate key violations
-                    )
-                    if is_duplicate:
-                        granted_count += 1
-                    # Continue even if one capability fails for other reasons
-                    continue
+            except Exception as e:
+                # Capability might already exist (duplicate key error) - count as granted
+                return _DUP_RE.search(str(e)) is not None
 
-        finally:
-            # Restore original auto-retry setting
-            self.auto_retry = original_auto_retry
+        # Grants are independent, so send them concurrently over the pooled session
+        if len(capabilities) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(capabilities))) as executor:
+                granted_count = sum(executor.map(grant, capabilities))
+        else:
+            granted_count = sum(map(grant, capabilities))
 
         return {
             "granted": granted_count,
             "total": total_count
         }
 
+    def _grant_capabilities_bulk(self, capabilities: List[str], scope: Dict[str, Any]) -> Optional[int]:
+        """
+        Grant all capabilities with a single batch request.
+
+        Returns:
+            Number granted (new + already existing), or None if the caller should
+            fall back to one request per capability.
+        """
+        try:
+            result = self._make_request(
+                method="POST",
+                endpoint=f"/api/v1/sdk-api/agents/{self.agent_id}/capabilities:batch",
+                data={
+                    "capabilities": [
+                        {"capabilityType": capability_type, "scope": scope}
+                        for capability_type in capabilities
+                    ]
+                },
+                retry=False
+            )
+        except Exception as e:
+            response = getattr(e.__cause__, "response", None)
+            if response is not None and response.status_code in (404, 405):
+                # Server has no batch endpoint - don't try again for this client
+                self._bulk_capabilities_supported = False
+            return None
+
+        if not isinstance(result, dict):
+            return None
+        return len(result.get("granted") or ()) + len(result.get("duplicates") or ())
+
     def report_sdk_integration(
         self,
         sdk_version: str,
@@ -966,7 +2156,7 @@ class AIMClient:
             AuthenticationError: If authentication fails
             VerificationError: If request fails
         """
-        try:
+        def send() -> Dict:
             # Create SDK integration detection event
             detection_event = {
                 "mcpServer": "aim-sdk-integration",
@@ -981,12 +2171,18 @@ class AIMClient:
                 "timestamp": datetime.now(timezone.utc).isoformat()
             }
 
-            result = self._make_request(
+            return self._make_request(
                 method="POST",
                 endpoint=f"/api/v1/sdk-api/agents/{self.agent_id}/detection/report",
                 data={"detections": [detection_event]}
             )
-            return result
+
+        try:
+            # Everything but the timestamp identifies the report
+            return self._send_report_once(
+                b"sdk:" + _dumps_sorted([sdk_version, platform, capabilities or []]),
+                send
+            )
 
         except (AuthenticationError, VerificationError):
             raise
@@ -1072,38 +2268,17 @@ class AIMClient:
         if not name or not isinstance(name, str):
             raise ConfigurationError("name is required and must be a non-empty string")
 
-        # Generate Ed25519 keypair for the new agent
-        from nacl.signing import SigningKey
-        from nacl.encoding import Base64Encoder
-
-        signing_key = SigningKey.generate()
-        private_key_bytes = bytes(signing_key)  # 32-byte seed
-        public_key_bytes = signing_key.verify_key.encode()  # 32-byte public key
-
-        # For Go compatibility, create 64-byte private key (seed + public key)
-        private_key_full = private_key_bytes + public_key_bytes
-        private_key_b64 = base64.b64encode(private_key_full).decode('utf-8')
-        public_key_b64 = base64.b64encode(public_key_bytes).decode('utf-8')
-
-        # Prepare registration payload
-        registration_data = {
-            "name": name,
-            "displayName": display_name or name,
-            "description": description or f"Agent {name} created via AIM SDK",
-            "agentType": agent_type,
-            "publicKey": public_key_b64
-        }
-
-        if version:
-            registration_data["version"] = version
-        if repository_url:
-            registration_data["repositoryUrl"] = repository_url
-        if documentation_url:
-            registration_data["documentationUrl"] = documentation_url
-        if capabilities:
-            registration_data["capabilities"] = capabilities
-        if talks_to:
-            registration_data["talksTo"] = talks_to
+        registration_data, private_key_b64 = _new_agent_registration(
+            name=name,
+            display_name=display_name,
+            description=description,
+            agent_type=agent_type,
+            version=version,
+            repository_url=repository_url,
+            documentation_url=documentation_url,
+            capabilities=capabilities,
+            talks_to=talks_to
+        )
 
         try:
             # Use authenticated endpoint
@@ -1112,31 +2287,87 @@ class AIMClient:
                 endpoint="/api/v1/agents",
                 data=registration_data
             )
-
-            # Add the private key to the result (backend doesn't store it)
-            if result:
-                result["private_key"] = private_key_b64
-                
-                # CRITICAL: Use the backend's public key (what's in database), not what we generated
-                # The backend's public key is the source of truth since it's stored in the database
-                backend_pub_key = result.get('public_key') or result.get('publicKey')
-                if backend_pub_key:
-                    result["public_key"] = backend_pub_key
-                else:
-                    # Fallback: use generated key if backend didn't return one
-                    result["public_key"] = public_key_b64
-
-                # Normalize agent_id field
-                if "id" in result and "agent_id" not in result:
-                    result["agent_id"] = result["id"]
-
-            return result
+            return _with_new_agent_keys(result, registration_data["publicKey"], private_key_b64)
 
         except (AuthenticationError, VerificationError):
             raise
         except Exception as e:
             raise VerificationError(f"Agent creation failed: {e}")
 
+    def create_new_agents(self, specs: List[Dict[str, Any]]) -> List[Dict]:
+        """
+        Create/register several agents at once.
+
+        Sends one bulk request when the server supports it, otherwise creates
+        the agents concurrently with one request each.
+
+        Args:
+            specs: One dict per agent with create_new_agent keyword arguments
+                   (name is required)
+
+        Returns:
+            List of created agent dicts (as returned by create_new_agent),
+            in the same order as specs
+
+        Example:
+            agents = client.create_new_agents([
+                {"name": "ingest-agent", "capabilities": ["read_files"]},
+                {"name": "report-agent", "talks_to": ["github"]}
+            ])
+            for agent in agents:
+                print(f"Created {agent['name']}: {agent['agent_id']}")
+
+        Raises:
+            ConfigurationError: If a spec is missing a name
+            AuthenticationError: If authentication fails
+            VerificationError: If agent creation fails
+        """
+        specs = list(specs)
+        for spec in specs:
+            if not spec.get("name") or not isinstance(spec["name"], str):
+                raise ConfigurationError("name is required and must be a non-empty string")
+
+        if self._bulk_agents_supported and len(specs) > 1:
+            created = self._create_agents_bulk(specs)
+            if created is not None:
+                return created
+
+        if len(specs) <= 1:
+            return [self.create_new_agent(**spec) for spec in specs]
+        with ThreadPoolExecutor(max_workers=min(8, len(specs))) as executor:
+            return list(executor.map(lambda spec: self.create_new_agent(**spec), specs))
+
+    def _create_agents_bulk(self, specs: List[Dict[str, Any]]) -> Optional[List[Dict]]:
+        """
+        Create all agents with a single bulk request.
+
+        Returns:
+            Created agents in input order, or None if the server has no bulk
+            endpoint and the caller should fall back to one request per agent.
+        """
+        registrations = [_new_agent_registration(**spec) for spec in specs]
+        try:
+            result = self._make_request(
+                method="POST",
+                endpoint="/api/v1/agents:bulk",
+                data={"agents": [registration_data for registration_data, _ in registrations]}
+            )
+        except VerificationError as e:
+            response = getattr(e.__cause__, "response", None)
+            if response is not None and response.status_code in (404, 405):
+                # Server has no bulk endpoint - don't try again for this client
+                self._bulk_agents_supported = False
+                return None
+            raise
+
+        agents = result.get("agents") if isinstance(result, dict) else None
+        if not isinstance(agents, list) or len(agents) != len(registrations):
+            raise VerificationError("Agent creation failed: unexpected bulk response")
+        return [
+            _with_new_agent_keys(agent, registration_data["publicKey"], private_key_b64)
+            for agent, (registration_data, private_key_b64) in zip(agents, registrations)
+        ]
+
     def list_agents(
         self,
         limit: int = 50,
@@ -1169,16 +2400,14 @@ class AIMClient:
             AuthenticationError: If authentication fails
             VerificationError: If request fails
         """
-        # Build query params
-        params = []
-        params.append(f"limit={min(limit, 100)}")
-        params.append(f"offset={offset}")
+        # Build query params (urlencode escapes filter values)
+        params = {"limit": min(limit, 100), "offset": offset}
         if status:
-            params.append(f"status={status}")
+            params["status"] = status
         if agent_type:
-            params.append(f"agent_type={agent_type}")
+            params["agent_type"] = agent_type
 
-        query_string = "&".join(params)
+        query_string = urlencode(params)
 
         try:
             result = self._make_request(
@@ -1231,11 +2460,19 @@ class AIMClient:
         """
         target_agent_id = agent_id or self.agent_id
 
+        cached = self._agent_cache.get(target_agent_id)
+        if cached is not None and cached[0] > time.monotonic():
+            return dict(cached[1])
+
         try:
             result = self._make_request(
                 method="GET",
                 endpoint=f"/api/v1/agents/{target_agent_id}"
             )
+            if self.agent_cache_ttl > 0 and isinstance(result, dict):
+                if len(self._agent_cache) >= 256:
+                    self._agent_cache.clear()
+                self._agent_cache[target_agent_id] = (time.monotonic() + self.agent_cache_ttl, dict(result))
             return result
 
         except (AuthenticationError, VerificationError):
@@ -1302,6 +2539,7 @@ class AIMClient:
                 endpoint=f"/api/v1/agents/{target_agent_id}",
                 data=update_data
             )
+            self._agent_cache.pop(target_agent_id, None)
             return result
 
         except (AuthenticationError, VerificationError):
@@ -1344,6 +2582,7 @@ class AIMClient:
                 method="DELETE",
                 endpoint=f"/api/v1/agents/{agent_id}"
             )
+            self._agent_cache.pop(agent_id, None)
             return result or {"success": True, "message": "Agent deleted successfully"}
 
         except (AuthenticationError, VerificationError):
@@ -1407,7 +2646,7 @@ class AIMClient:
                     result = func(*args, **kwargs)
 
                     # Log success
-                    self.log_action_result(
+                    self._submit_action_result(
                         verification_id=verification_id,
                         success=True,
                         result_summary=f"Action '{action_type}' completed successfully"
@@ -1417,7 +2656,7 @@ class AIMClient:
 
                 except Exception as e:
                     # Log failure
-                    self.log_action_result(
+                    self._submit_action_result(
                         verification_id=verification_id,
                         success=False,
                         error_message=str(e)
@@ -1431,7 +2670,8 @@ class AIMClient:
         self,
         risk_level: str = "low",
         action_name: Optional[str] = None,
-        resource: Optional[str] = None
+        resource: Optional[str] = None,
+        verification_ttl: Optional[float] = None
     ):
         """
         Decorator for automatic action tracking and verification.
@@ -1443,6 +2683,12 @@ class AIMClient:
             risk_level: Risk level of the action ("low", "medium", "high", "critical")
             action_name: Custom action name (default: function name)
             resource: Resource being accessed (optional)
+            verification_ttl: Seconds a successful verification is reused instead of
+                              verifying every call (default: verify every call).
+                              "low" risk reuses it for the same action and resource,
+                              "medium" risk only for a call with identical arguments
+                              (plain JSON data only; other calls are always verified).
+                              Not supported for "high"/"critical" actions.
 
         Example:
             @agent.track_action(risk_level="low")
@@ -1458,6 +2704,9 @@ class AIMClient:
             - "high": Sensitive operations (may require approval)
             - "critical": Destructive operations (requires approval)
         """
+        if verification_ttl and risk_level not in ("low", "medium"):
+            raise ConfigurationError("verification_ttl is only supported for risk_level='low' or 'medium'")
+
         def decorator(func: Callable) -> Callable:
             @functools.wraps(func)
             def wrapper(*args, **kwargs):
@@ -1473,117 +2722,147 @@ class AIMClient:
 
                 # Add args/kwargs to context (for audit trail)
                 if args:
-                    context["args"] = str(args)
+                    context["args"] = _CONTEXT_REPR.repr(args)
                 if kwargs:
-                    context["kwargs"] = str(kwargs)
+                    context["kwargs"] = _CONTEXT_REPR.repr(kwargs)
+
+                cached = None
+                cache_key = None
+                if verification_ttl:
+                    cache_key = (action, resource)
+                    if risk_level == "medium":
+                        # Medium-risk verifications are only reused for an identical call,
+                        # which can only be told reliably for plain JSON arguments
+                        digest = _call_digest(args, kwargs)
+                        cache_key = None if digest is None else cache_key + (digest,)
+                if cache_key is not None:
+                    cached = self._reusable_verifications.get(cache_key)
+                if cached is not None and cached[0] > time.monotonic():
+                    # Reuse a recent verification for this action
+                    verification_id = cached[1]
+                else:
+                    # Request verification
+                    try:
+                        verification_result, error = self.verify_action(
+                            action_type=action,
+                            resource=resource,
+                            context=context,
+                            timeout_seconds=300
+                        ), None
+                    except Exception as e:
+                        verification_result, error = None, e
+                    rejected = self._verification_rejection(action, verification_result, error)
+                    if rejected is not None:
+                        return rejected
+
+                    verification_id = verification_result.get("verification_id")
+                    if cache_key is not None:
+                        self._remember_verification(cache_key, verification_ttl, verification_id)
 
-                # Request verification
                 try:
-                    verification_result = self.verify_action(
-                        action_type=action,
-                        resource=resource,
-                        context=context,
-                        timeout_seconds=300
-                    )
+                    # Execute the function
+                    result = func(*args, **kwargs)
                 except Exception as e:
-                    # Handle any exceptions during verification
-                    print(f"  Warning: Verification request failed: {type(e).__name__}: {str(e)}")
-                    print(f"   Action '{action}' cannot proceed without verification.")
-                    print(f"   Returning error result instead of raising exception.")
-                    return {
-                        "error": True,
-                        "error_type": type(e).__name__,
-                        "error_message": str(e),
-                        "action": action,
-                        "status": "verification_failed"
-                    }
+                    return self._action_failed(action, verification_id, e)
+                self._action_succeeded(action, verification_id)
+                return result
 
-                # Check if verification result has an error
-                if verification_result.get("error"):
-                    error_msg = verification_result.get("error", "Unknown verification error")
-                    print(f"  Warning: Verification returned error: {error_msg}")
-                    print(f"   Action '{action}' cannot proceed without successful verification.")
-                    return {
-                        "error": True,
-                        "error_type": "VerificationError",
-                        "error_message": error_msg,
-                        "action": action,
-                        "status": "verification_failed"
-                    }
+            return wrapper
+        return decorator
 
-                if not verification_result.get("verified", False):
-                    reason = verification_result.get("reason", verification_result.get("error", "Unknown reason"))
-                    print(f" Warning: Action '{action}' not verified: {reason}")
-                    return {
-                        "error": True,
-                        "error_type": "ActionDenied",
-                        "error_message": f"Action '{action}' denied: {reason}",
-                        "action": action,
-                        "status": "denied"
-                    }
+    def _remember_verification(self, cache_key: tuple, ttl: float, verification_id: Any) -> None:
+        """Keep a successful verification for reuse by track_action(verification_ttl=...)."""
+        now = time.monotonic()
+        if len(self._reusable_verifications) >= _REUSABLE_VERIFICATIONS_MAX:
+            # Per-call keys (medium risk) can pile up - drop expired entries, then the oldest
+            self._reusable_verifications = {
+                key: entry for key, entry in self._reusable_verifications.items() if entry[0] > now
+            }
+            while len(self._reusable_verifications) >= _REUSABLE_VERIFICATIONS_MAX:
+                del self._reusable_verifications[next(iter(self._reusable_verifications))]
+        self._reusable_verifications[cache_key] = (now + ttl, verification_id)
 
-                verification_id = verification_result.get("verification_id")
+    def _verification_rejection(
+        self,
+        action: str,
+        verification_result: Optional[Dict],
+        error: Optional[Exception],
+        denied: str = "denied"
+    ) -> Optional[Dict]:
+        """Error result for the decorators if a verification doesn't allow the action, else None."""
+        if error is not None:
+            # Handle any exceptions during verification
+            logger.warning(
+                "Verification request failed: %s: %s. Action '%s' cannot proceed without verification.",
+                type(error).__name__, error, action
+            )
+            return _action_error(action, "verification_failed", type(error).__name__, str(error))
+
+        # Check if verification result has an error
+        if verification_result.get("error"):
+            error_msg = verification_result.get("error", "Unknown verification error")
+            logger.warning(
+                "Verification returned error: %s. Action '%s' cannot proceed without successful verification.",
+                error_msg, action
+            )
+            return _action_error(action, "verification_failed", "VerificationError", error_msg)
 
-                try:
-                    # Execute the function
-                    result = func(*args, **kwargs)
+        if not verification_result.get("verified", False):
+            reason = verification_result.get("reason", verification_result.get("error", "Unknown reason"))
+            logger.warning("Action '%s' %s or not verified: %s", action, denied, reason)
+            return _action_error(action, "denied", "ActionDenied", f"Action '{action}' {denied}: {reason}")
 
-                    # Log success (handle errors in logging gracefully)
-                    try:
-                        self.log_action_result(
-                            verification_id=verification_id,
-                            success=True,
-                            result_summary=f"Action '{action}' completed successfully"
-                        )
-                    except Exception as log_error:
-                        # Don't fail the function if logging fails
-                        print(f" Warning: Failed to log action result: {str(log_error)}")
+        return None
 
-                    return result
+    def _action_succeeded(self, action: str, verification_id: str) -> None:
+        """Log a decorated action's success without letting logging errors reach the caller."""
+        try:
+            self._submit_action_result(
+                verification_id=verification_id,
+                success=True,
+                result_summary=f"Action '{action}' completed successfully"
+            )
+        except Exception as log_error:
+            # Don't fail the function if logging fails
+            logger.warning("Failed to log action result: %s", log_error)
 
-                except Exception as e:
-                    # Log failure (handle errors in logging gracefully)
-                    try:
-                        self.log_action_result(
-                            verification_id=verification_id,
-                            success=False,
-                            error_message=str(e)
-                        )
-                    except Exception as log_error:
-                        # Don't fail if logging fails
-                        print(f"  Warning: Failed to log action failure: {str(log_error)}")
-                    
-                    # Return error result instead of raising
-                    print(f" Error executing action '{action}': {type(e).__name__}: {str(e)}")
-                    return {
-                        "error": True,
-                        "error_type": type(e).__name__,
-                        "error_message": str(e),
-                        "action": action,
-                        "status": "execution_failed"
-                    }
+    def _action_failed(self, action: str, verification_id: str, e: Exception) -> Dict:
+        """Log a decorated action's failure and return its error result instead of raising."""
+        try:
+            self._submit_action_result(
+                verification_id=verification_id,
+                success=False,
+                error_message=str(e)
+            )
+        except Exception as log_error:
+            # Don't fail if logging fails
+            logger.warning("Failed to log action failure: %s", log_error)
 
-            return wrapper
-        return decorator
+        logger.warning("Error executing action '%s': %s: %s", action, type(e).__name__, e)
+        return _action_error(action, "execution_failed", type(e).__name__, str(e))
 
     def require_approval(
         self,
         risk_level: str = "high",
         action_name: Optional[str] = None,
         resource: Optional[str] = None,
-        timeout_seconds: int = 3600
+        timeout_seconds: Optional[int] = None
     ):
         """
         Decorator for actions requiring human approval before execution.
 
         This decorator pauses execution until an admin approves the action
         in the AIM dashboard. Use for high-risk or destructive operations.
+        Pending approvals are polled by one background thread per client;
+        decorated coroutine functions await approval without blocking a thread.
 
         Args:
             risk_level: Risk level ("high" or "critical")
             action_name: Custom action name (default: function name)
             resource: Resource being accessed (optional)
-            timeout_seconds: Max time to wait for approval (default: 1 hour)
+            timeout_seconds: Max time to wait for approval (default: the client's
+                             approval_timeout, 1 hour unless configured). An action
+                             still pending at the timeout is denied, never run.
 
         Example:
             @agent.require_approval(risk_level="critical")
@@ -1605,10 +2884,11 @@ class AIMClient:
                 f"require_approval() only supports 'high' or 'critical' risk levels, "
                 f"got: {risk_level}. Use track_action() for lower risk levels."
             )
+        if timeout_seconds is None:
+            timeout_seconds = self.approval_timeout
 
         def decorator(func: Callable) -> Callable:
-            @functools.wraps(func)
-            def wrapper(*args, **kwargs):
+            def submit(args, kwargs) -> Tuple[str, Future]:
                 # Use function name if action_name not provided
                 action = action_name or func.__name__
 
@@ -1623,107 +2903,100 @@ class AIMClient:
 
                 # Add args/kwargs to context
                 if args:
-                    context["args"] = str(args)
+                    context["args"] = _CONTEXT_REPR.repr(args)
                 if kwargs:
-                    context["kwargs"] = str(kwargs)
+                    context["kwargs"] = _CONTEXT_REPR.repr(kwargs)
 
-                print(f"\n⏸️  Waiting for approval: {action}...")
-                print(f"   Risk Level: {risk_level.upper()}")
-                print(f"   Check AIM dashboard to approve/deny this action")
-                print(f"   Timeout: {timeout_seconds} seconds")
+                logger.info(
+                    "Waiting for approval: %s (risk level %s, timeout %ss). "
+                    "Check AIM dashboard to approve/deny this action",
+                    action, risk_level.upper(), timeout_seconds
+                )
 
-                # Request verification with extended timeout
-                try:
-                    verification_result = self.verify_action(
-                        action_type=action,
-                        resource=resource,
-                        context=context,
-                        timeout_seconds=timeout_seconds
-                    )
-                except Exception as e:
-                    # Handle any exceptions during verification
-                    print(f" Warning: Verification request failed: {type(e).__name__}: {str(e)}")
-                    print(f"   Action '{action}' cannot proceed without verification.")
-                    print(f"   Returning error result instead of raising exception.")
-                    return {
-                        "error": True,
-                        "error_type": type(e).__name__,
-                        "error_message": str(e),
-                        "action": action,
-                        "status": "verification_failed"
-                    }
+                # Request verification; pending approvals are polled in the background
+                return action, self.submit_for_approval(
+                    action_type=action,
+                    resource=resource,
+                    context=context,
+                    timeout_seconds=timeout_seconds
+                )
 
-                # Check if verification result has an error
-                if verification_result.get("error"):
-                    error_msg = verification_result.get("error", "Unknown verification error")
-                    print(f" Warning: Verification returned error: {error_msg}")
-                    print(f"   Action '{action}' cannot proceed without successful verification.")
-                    return {
-                        "error": True,
-                        "error_type": "VerificationError",
-                        "error_message": error_msg,
-                        "action": action,
-                        "status": "verification_failed"
-                    }
+            def rejection(action: str, verification_result: Optional[Dict], error: Optional[Exception]) -> Optional[Dict]:
+                """Error result if the action may not run, else None."""
+                if isinstance(error, ApprovalTimeoutError):
+                    # Fail closed: no decision in time is a denial
+                    logger.warning("Action '%s' DENIED: no approval within %s seconds", action, timeout_seconds)
+                    return _action_error(action, "denied", "ApprovalTimeout", str(error))
+                if isinstance(error, ApprovalCapacityError):
+                    logger.warning("Action '%s' DENIED: %s", action, error)
+                    return _action_error(action, "denied", "ApprovalCapacity", str(error))
+                rejected = self._verification_rejection(action, verification_result, error, denied="DENIED")
+                if rejected is None:
+                    logger.info("Action '%s' APPROVED by admin", action)
+                return rejected
+
+            if inspect.iscoroutinefunction(func):
+                # The verification request and result logging are blocking HTTP calls,
+                # so they run in the loop's default executor; the approval itself is
+                # awaited on the shared waiter without tying up a thread
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    import asyncio  # Already loaded by the caller's event loop
+                    loop = asyncio.get_running_loop()
+                    action, future = await loop.run_in_executor(None, submit, args, kwargs)
+                    try:
+                        verification_result, error = await asyncio.wrap_future(future), None
+                    except Exception as e:
+                        verification_result, error = None, e
+                    rejected = rejection(action, verification_result, error)
+                    if rejected is not None:
+                        return rejected
+
+                    verification_id = verification_result.get("verification_id")
+                    try:
+                        # Execute the function
+                        result = await func(*args, **kwargs)
+                    except Exception as e:
+                        return await loop.run_in_executor(None, self._action_failed, action, verification_id, e)
+                    await loop.run_in_executor(None, self._action_succeeded, action, verification_id)
+                    return result
 
-                if not verification_result.get("verified", False):
-                    reason = verification_result.get("reason", verification_result.get("error", "Unknown reason"))
-                    print(f" Action '{action}' DENIED or not verified: {reason}")
-                    return {
-                        "error": True,
-                        "error_type": "ActionDenied",
-                        "error_message": f"Action '{action}' DENIED: {reason}",
-                        "action": action,
-                        "status": "denied"
-                    }
+                return async_wrapper
 
-                print(f"✅ Action '{action}' APPROVED by admin")
-                verification_id = verification_result.get("verification_id")
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                action, future = submit(args, kwargs)
+                try:
+                    verification_result, error = future.result(), None
+                except Exception as e:
+                    verification_result, error = None, e
+                rejected = rejection(action, verification_result, error)
+                if rejected is not None:
+                    return rejected
 
+                verification_id = verification_result.get("verification_id")
                 try:
                     # Execute the function
                     result = func(*args, **kwargs)
-
-                    # Log success (handle errors in logging gracefully)
-                    try:
-                        self.log_action_result(
-                            verification_id=verification_id,
-                            success=True,
-                            result_summary=f"Action '{action}' completed successfully"
-                        )
-                    except Exception as log_error:
-                        # Don't fail the function if logging fails
-                        print(f"  Warning: Failed to log action result: {str(log_error)}")
-
-                    return result
-
                 except Exception as e:
-                    # Log failure (handle errors in logging gracefully)
-                    try:
-                        self.log_action_result(
-                            verification_id=verification_id,
-                            success=False,
-                            error_message=str(e)
-                        )
-                    except Exception as log_error:
-                        # Don't fail if logging fails
-                        print(f"  Warning: Failed to log action failure: {str(log_error)}")
-                    
-                    # Return error result instead of raising
-                    print(f" Error executing action '{action}': {type(e).__name__}: {str(e)}")
-                    return {
-                        "error": True,
-                        "error_type": type(e).__name__,
-                        "error_message": str(e),
-                        "action": action,
-                        "status": "execution_failed"
-                    }
+                    return self._action_failed(action, verification_id, e)
+                self._action_succeeded(action, verification_id)
+                return result
 
             return wrapper
         return decorator
 
     def close(self):
-        """Close the HTTP session."""
+        """Send queued detections and background action results, then close the HTTP session."""
+        with self._detection_lock:
+            timer = self._detection_timer
+        if timer is not None:
+            timer.cancel()
+            self._flush_detections()
+        if self._result_batcher is not None:
+            self._result_batcher.flush()
+        if self._http2_client is not None:
+            self._http2_client.close()
         self.session.close()
 
     def __enter__(self):
@@ -1741,14 +3014,27 @@ class AIMClient:
 
 import os
 import pathlib
+import tempfile
+
+# Shared by register_agent calls so repeated registrations (fleet spin-up,
+# force_new) reuse pooled connections instead of a new TLS handshake each.
+# No automatic retries: registration POSTs aren't idempotent.
+_REGISTRATION_SESSION = requests.Session()
+_REGISTRATION_SESSION.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=8))
+_REGISTRATION_SESSION.mount('http://', HTTPAdapter(pool_connections=8, pool_maxsize=8))
+
+# Cleared once the server rejects a gzip-encoded registration body
+_registration_gzip_supported = True
 
 
+# ((path, st_mtime_ns, st_size), parsed contents) of the last credentials file read
+_credentials_file_cache: Optional[Tuple[Tuple[str, int, int], Dict[str, Any]]] = None
+
+
+@functools.lru_cache(maxsize=1)
 def _get_credentials_path():
-    """Get path to credentials file (~/.aim/credentials.json)."""
-    home = pathlib.Path.home()
-    aim_dir = home / ".aim"
-    aim_dir.mkdir(exist_ok=True)
-    return aim_dir / "credentials.json"
+    """Get path to credentials file (~/.aim/credentials.json), resolved once per process."""
+    return pathlib.Path.home() / ".aim" / "credentials.json"
 
 
 def _save_credentials(agent_name: str, credentials: Dict[str, Any]):
@@ -1760,15 +3046,15 @@ def _save_credentials(agent_name: str, credentials: Dict[str, Any]):
         credentials: Credentials dict from registration response
     """
     creds_path = _get_credentials_path()
+    # Only writes need ~/.aim to exist
+    creds_path.parent.mkdir(exist_ok=True)
 
     # Load existing credentials
     all_creds = {}
-    if creds_path.exists():
-        try:
-            with open(creds_path, 'r') as f:
-                all_creds = json.load(f)
-        except Exception:
-            pass  # Start fresh if corrupted
+    try:
+        all_creds = dict(_read_credentials_file(creds_path))
+    except Exception:
+        pass  # Start fresh if missing or corrupted
 
     # Add new agent credentials
     all_creds[agent_name] = {
@@ -1781,10 +3067,24 @@ def _save_credentials(agent_name: str, credentials: Dict[str, Any]):
         "registered_at": datetime.now(timezone.utc).isoformat()
     }
 
-    # Save with secure permissions (owner read/write only)
-    with open(creds_path, 'w') as f:
-        json.dump(all_creds, f, indent=2)
-    os.chmod(creds_path, 0o600)  # -rw------- (owner only)
+    if ORJSON_AVAILABLE:
+        content = orjson.dumps(all_creds, option=orjson.OPT_INDENT_2)
+    else:
+        content = json.dumps(all_creds, indent=2).encode('utf-8')
+
+    # Write a uniquely named temp file with secure permissions (owner read/write
+    # only), then atomically swap it into place so readers never see a partial
+    # file and concurrent saves never share a temp file
+    fd, tmp_path = tempfile.mkstemp(dir=creds_path.parent, prefix='.credentials-', suffix='.tmp')
+    try:
+        if hasattr(os, 'fchmod'):
+            os.fchmod(fd, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, creds_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
 
 def _load_credentials(agent_name: str) -> Optional[Dict[str, Any]]:
@@ -1797,16 +3097,27 @@ def _load_credentials(agent_name: str) -> Optional[Dict[str, Any]]:
     Returns:
         Credentials dict if found, None otherwise
     """
-    creds_path = _get_credentials_path()
-    if not creds_path.exists():
-        return None
-
     try:
-        with open(creds_path, 'r') as f:
-            all_creds = json.load(f)
-        return all_creds.get(agent_name)
+        agent_creds = _read_credentials_file(_get_credentials_path()).get(agent_name)
     except Exception:
         return None
+    # Copy, so callers can't alter the cached file contents
+    return dict(agent_creds) if isinstance(agent_creds, dict) else agent_creds
+
+
+def _read_credentials_file(creds_path: pathlib.Path) -> Dict[str, Any]:
+    """
+    Parse the credentials file, reusing the last parse while the file is unchanged.
+
+    Raises OSError if the file is missing and ValueError if it isn't valid JSON.
+    """
+    global _credentials_file_cache
+    st = creds_path.stat()
+    cached = _credentials_file_cache
+    if cached is None or cached[0] != (str(creds_path), st.st_mtime_ns, st.st_size):
+        with open(creds_path, 'rb') as f:
+            cached = _credentials_file_cache = ((str(creds_path), st.st_mtime_ns, st.st_size), _loads(f.read()))
+    return cached[1]
 
 
 def register_agent(
@@ -1894,8 +3205,7 @@ def register_agent(
             token_manager = None
             if "refresh_token" in existing_creds or "access_token" in existing_creds:
                 # Create a temporary credentials file for the token manager
-                from pathlib import Path
-                temp_creds_path = Path.home() / ".aim" / f"temp_{name}_creds.json"
+                temp_creds_path = pathlib.Path.home() / ".aim" / f"temp_{name}_creds.json"
                 token_manager = OAuthTokenManager(str(temp_creds_path))
                 # Directly set the credentials with OAuth tokens
                 token_manager.credentials = existing_creds
@@ -1948,13 +3258,10 @@ def register_agent(
         )
 
     # 3. Auto-detect capabilities and MCPs (unless manually specified)
+    mcp_detections = None
     if auto_detect:
-       
-
         # Auto-detect capabilities (unless manually provided)
         if not capabilities:
-            from .detection import auto_detect_mcps
-
             detected_caps = auto_detect_capabilities()
             if detected_caps:
                 capabilities = detected_caps
@@ -1964,9 +3271,7 @@ def register_agent(
 
         # Auto-detect MCP servers (unless manually provided)
         if not talks_to:
-            from .detection import auto_detect_mcps
-
-            mcp_detections = auto_detect_mcps()
+            mcp_detections = _auto_detect_mcps()
             if mcp_detections:
                 talks_to = [d["mcpServer"] for d in mcp_detections]
                 print(f"   ✅ Detected {len(talks_to)} MCP servers: {', '.join(talks_to[:3])}{' ...' if len(talks_to) > 3 else ''}")
@@ -2004,7 +3309,8 @@ def register_agent(
                 sdk_creds=sdk_creds,
                 registration_data=registration_data,
                 sdk_token_id=sdk_token_id,
-                talks_to=talks_to
+                talks_to=talks_to,
+                mcp_detections=mcp_detections
             )
         else:
             # API Key Mode: Use public endpoint with API key header
@@ -2014,7 +3320,8 @@ def register_agent(
                 api_key=api_key,
                 registration_data=registration_data,
                 sdk_token_id=sdk_token_id,
-                talks_to=talks_to
+                talks_to=talks_to,
+                mcp_detections=mcp_detections
             )
 
     except requests.RequestException as e:
@@ -2023,28 +3330,49 @@ def register_agent(
         raise ConfigurationError(f"Registration failed: {e}")
 
 
+def _queue_mcp_detections(client: AIMClient, mcp_detections: Optional[List[Dict[str, Any]]]) -> None:
+    """
+    Queue a new agent's MCP detections for reporting in the background.
+
+    Registration doesn't wait for (or fail on) the report; report_detection
+    sends it from its timer thread and logs failures.
+    """
+    if mcp_detections is None:
+        # register_agent didn't scan (talks_to was given), so scan now
+        mcp_detections = _auto_detect_mcps()
+    for detection in mcp_detections:
+        client.report_detection(detection)
+
+
+def _post_registration(url: str, registration_data: Dict[str, Any], headers: Dict[str, str]) -> requests.Response:
+    """POST a registration body, gzip-compressed when it's large and the server accepts that."""
+    global _registration_gzip_supported
+    body = _dumps(registration_data)
+    if _registration_gzip_supported and len(body) > _REGISTRATION_GZIP_MIN:
+        response = _REGISTRATION_SESSION.post(
+            url,
+            data=gzip.compress(body, compresslevel=1),
+            headers={**headers, "Content-Encoding": "gzip"},
+            timeout=_REGISTRATION_TIMEOUT
+        )
+        if response.status_code not in (400, 415):
+            return response
+        # Servers that don't decode request bodies can't parse the compressed
+        # one; nothing was registered, so resend it (and later ones) as-is.
+        _registration_gzip_supported = False
+    return _REGISTRATION_SESSION.post(url, data=body, headers=headers, timeout=_REGISTRATION_TIMEOUT)
+
+
 def _register_via_oauth(
     name: str,
     aim_url: str,
     sdk_creds: Dict[str, Any],
     registration_data: Dict[str, Any],
     sdk_token_id: Optional[str],
-    talks_to: Optional[List[str]]
+    talks_to: Optional[List[str]],
+    mcp_detections: Optional[List[Dict[str, Any]]] = None
 ) -> AIMClient:
     """Register agent using OAuth token from SDK credentials"""
-    # Generate Ed25519 keypair client-side (for OAuth mode)
-    
-    signing_key = SigningKey.generate()
-    private_key_bytes = bytes(signing_key) + bytes(signing_key.verify_key)  # 64 bytes (seed + public)
-    public_key_bytes = bytes(signing_key.verify_key)
-
-    private_key_b64 = base64.b64encode(private_key_bytes).decode('utf-8')
-    public_key_b64 = base64.b64encode(public_key_bytes).decode('utf-8')
-
-    # Add public key to registration data (use camelCase)
-    registration_data["publicKey"] = public_key_b64
-
-
     # Initialize OAuth token manager - let it discover credentials automatically
     # OAuthTokenManager._discover_credentials_path() checks:
     # 1. Home directory (~/.aim/credentials.json)
@@ -2056,6 +3384,15 @@ def _register_via_oauth(
     if not access_token:
         raise ConfigurationError("Failed to obtain OAuth access token")
 
+    # Generate Ed25519 keypair client-side (for OAuth mode). Key generation takes
+    # microseconds, so it runs inline once a token is in hand rather than
+    # being prepared ahead on another thread.
+    public_key_bytes, private_key_bytes = _generate_keypair()  # 64-byte private key (seed + public)
+    public_key_b64 = _base64.b64encode(public_key_bytes).decode('ascii')
+
+    # Add public key to registration data (use camelCase)
+    registration_data["publicKey"] = public_key_b64
+
     # Call authenticated endpoint
     url = f"{aim_url.rstrip('/')}/api/v1/agents"
 
@@ -2067,35 +3404,16 @@ def _register_via_oauth(
     if sdk_token_id:
         headers["X-SDK-Token"] = sdk_token_id
 
-    response = requests.post(
-        url,
-        json=registration_data,
-        headers=headers,
-        timeout=30
-    )
+    response = _post_registration(url, registration_data, headers)
 
     if response.status_code not in [200, 201]:
         error_msg = response.json().get("error", "Unknown error")
         raise ConfigurationError(f"Registration failed: {error_msg}")
 
-    credentials = response.json()
-
-    # Backend returns 'id' but we need 'agent_id' for consistency
-    if "id" in credentials and "agent_id" not in credentials:
-        credentials["agent_id"] = credentials["id"]
-
-    # Add client-side generated private key to credentials (backend doesn't send it back)
-    credentials["private_key"] = private_key_b64
-    
-    # CRITICAL: Use the backend's public key (what's in database), not what we generated
-    # The backend's public key is the source of truth since it's stored in the database
-    backend_pub_key = credentials.get('public_key') or credentials.get('publicKey')
-    if backend_pub_key:
-        credentials["public_key"] = backend_pub_key
-    else:
-        # Fallback: use generated key if backend didn't return one
-        credentials["public_key"] = public_key_b64
-    
+    # Add the client-side keys (backend doesn't send the private key back).
+    # The private key is only encoded once there's an agent to save it for.
+    private_key_b64 = _base64.b64encode(private_key_bytes).decode('ascii')
+    credentials = _with_new_agent_keys(_loads(response.content), public_key_b64, private_key_b64)
     credentials["aim_url"] = aim_url  # Ensure URL is in response
 
     # Add OAuth tokens to credentials so they can be used for future API calls
@@ -2118,14 +3436,7 @@ def _register_via_oauth(
     )
 
     if talks_to:
-        from .detection import auto_detect_mcps
-        mcp_detections = auto_detect_mcps()
-        if mcp_detections:
-            try:
-                result = client.report_detections(mcp_detections)
-                print(f"   📡 Reported {result.get('detectionsProcessed', 0)} MCP detections")
-            except Exception:
-                pass  # Don't fail registration if reporting fails
+        _queue_mcp_detections(client, mcp_detections)
 
     _print_registration_success(credentials)
     return client
@@ -2137,7 +3448,8 @@ def _register_via_api_key(
     api_key: str,
     registration_data: Dict[str, Any],
     sdk_token_id: Optional[str],
-    talks_to: Optional[List[str]]
+    talks_to: Optional[List[str]],
+    mcp_detections: Optional[List[Dict[str, Any]]] = None
 ) -> AIMClient:
     """Register agent using API key (manual mode)"""
     # Call public registration endpoint
@@ -2151,18 +3463,13 @@ def _register_via_api_key(
     if sdk_token_id:
         headers["X-SDK-Token"] = sdk_token_id
 
-    response = requests.post(
-        url,
-        json=registration_data,
-        headers=headers,
-        timeout=30
-    )
+    response = _post_registration(url, registration_data, headers)
 
     if response.status_code != 201:
         error_msg = response.json().get("error", "Unknown error")
         raise ConfigurationError(f"Registration failed: {error_msg}")
 
-    credentials = response.json()
+    credentials = _loads(response.content)
 
     # Save credentials locally
     _save_credentials(name, credentials)
@@ -2176,14 +3483,7 @@ def _register_via_api_key(
     )
 
     if talks_to:
-        from .detection import auto_detect_mcps
-        mcp_detections = auto_detect_mcps()
-        if mcp_detections:
-            try:
-                result = client.report_detections(mcp_detections)
-                print(f"   📡 Reported {result.get('detectionsProcessed', 0)} MCP detections")
-            except Exception:
-                pass  # Don't fail registration if reporting fails
+        _queue_mcp_detections(client, mcp_detections)
 
     _print_registration_success(credentials)
     return client
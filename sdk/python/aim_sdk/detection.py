@@ -35,6 +35,9 @@ __version__ = "1.0.0"
 # Global MCP call tracker for runtime detection
 _mcp_call_tracker = {}
 
+# Last auto_detect_mcps scan: ((sdk_version, len(sys.modules), config mtime), detections)
+_last_scan: Optional[tuple] = None
+
 
 class MCPDetector:
     """
@@ -117,6 +120,7 @@ class MCPDetector:
 
             # Extract MCP servers from config
             mcp_servers = config.get("mcpServers", {})
+            timestamp = datetime.now(timezone.utc).isoformat()
 
             for server_name, server_config in mcp_servers.items():
                 detection = {
@@ -129,7 +133,7 @@ class MCPDetector:
                         "args": server_config.get("args", [])
                     },
                     "sdkVersion": self.sdk_version,
-                    "timestamp": datetime.now(timezone.utc).isoformat()
+                    "timestamp": timestamp
                 }
                 detections.append(detection)
 
@@ -169,7 +173,8 @@ class MCPDetector:
             except Exception:
                 pass
 
-        # Create detection events
+        # Create detection events (one timestamp for the whole scan)
+        timestamp = datetime.now(timezone.utc).isoformat()
         for package_name in detected_packages:
             detection = {
                 "mcpServer": package_name,
@@ -180,7 +185,7 @@ class MCPDetector:
                     "detectionSource": "import_scan"
                 },
                 "sdkVersion": self.sdk_version,
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": timestamp
             }
             detections.append(detection)
 
@@ -297,6 +302,7 @@ class MCPDetector:
             List of detection events with method 'sdk_runtime'
         """
         detections = []
+        timestamp = datetime.now(timezone.utc).isoformat()
 
         for mcp_server, stats in _mcp_call_tracker.items():
             # Convert tools_used set to list for JSON serialization
@@ -313,7 +319,7 @@ class MCPDetector:
                     "tools_used": tools_list
                 },
                 "sdkVersion": sdk_version,
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": timestamp
             }
             detections.append(detection)
 
@@ -384,6 +390,24 @@ def auto_detect_mcps(
         client = AIMClient(...)
         detections = auto_detect_mcps()
         result = client.report_detections(detections)
+
+    Results are reused until a new module is imported or the Claude config
+    file changes, so repeated calls (e.g. registering many agents in one
+    process) don't re-read the config and re-scan sys.modules.
     """
+    global _last_scan
+
     detector = MCPDetector(sdk_version=sdk_version)
-    return detector.detect_all()
+    config_path = detector._get_claude_config_path()
+    try:
+        config_mtime = config_path.stat().st_mtime_ns if config_path else None
+    except OSError:
+        config_mtime = None
+    key = (sdk_version, len(sys.modules), config_mtime)
+
+    last_scan = _last_scan
+    if last_scan is None or last_scan[0] != key:
+        last_scan = _last_scan = (key, detector.detect_all())
+
+    # Copies, so callers can't alter the cached scan
+    return [dict(detection) for detection in last_scan[1]]
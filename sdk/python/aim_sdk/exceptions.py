@@ -18,6 +18,16 @@ class VerificationError(AIMError):
     pass
 
 
+class ApprovalTimeoutError(VerificationError):
+    """Raised when a pending action is neither approved nor denied in time"""
+    pass
+
+
+class ApprovalCapacityError(VerificationError):
+    """Raised when too many actions are already waiting for approval"""
+    pass
+
+
 class ActionDeniedError(AIMError):
     """Raised when AIM denies permission to perform an action"""
     pass
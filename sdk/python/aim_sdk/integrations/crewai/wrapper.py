@@ -209,7 +209,7 @@ class AIMCrewWrapper:
 
         # Verify with AIM
         try:
-            verification_result = self.aim_agent.verify_action(
+            verification_result = await self.aim_agent.averify_action(
                 action_type="crewai_crew:kickoff_async",
                 resource=resource,
                 context={
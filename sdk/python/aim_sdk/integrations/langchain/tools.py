@@ -124,9 +124,9 @@ class AIMToolWrapper(BaseTool):
             first_value = next(iter(kwargs.values()), "")
             resource = str(first_value)[:100]
 
-        # Verify with AIM (synchronous verification for now)
+        # Verify with AIM without blocking the event loop
         try:
-            verification_result = self.aim_agent.verify_action(
+            verification_result = await self.aim_agent.averify_action(
                 action_type=f"langchain_tool:{self.name}",
                 resource=resource,
                 context={
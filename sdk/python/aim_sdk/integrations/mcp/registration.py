@@ -4,11 +4,33 @@ AIM MCP Server Registration
 Helper functions for registering and managing MCP servers with AIM.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from aim_sdk.client import AIMClient
 
+# Seconds, or a (connect, read) tuple, bounding a single request
+_Timeout = Union[float, Tuple[float, float]]
+
+# (connect, read) timeouts in seconds for the helpers that call AIM directly
+_DEFAULT_TIMEOUT = (3.0, 30.0)
+
+# Shared by the helpers that call AIM directly, so sequential MCP management
+# calls reuse pooled keep-alive connections instead of a new TLS handshake each.
+# Only GET/DELETE go through it, so gateway errors and rate limiting are safe to
+# retry; urllib3 waits out a 429/503's Retry-After before retrying.
+_SESSION = requests.Session()
+_SESSION.headers["Content-Type"] = "application/json"
+_ADAPTER = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504], raise_on_status=False)
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
 
 def register_mcp_server(
     aim_client: AIMClient,
@@ -18,7 +40,8 @@ def register_mcp_server(
     capabilities: List[str],
     description: str = "",
     version: str = "1.0.0",
-    verification_url: Optional[str] = None
+    verification_url: Optional[str] = None,
+    timeout: Optional[_Timeout] = None
 ) -> Dict[str, Any]:
     """
     Register an MCP server with the AIM backend.
@@ -36,6 +59,7 @@ def register_mcp_server(
         description: Optional description of the MCP server
         version: Server version (default: "1.0.0")
         verification_url: Optional URL for verification challenges
+        timeout: Seconds or (connect, read) tuple for the request (default: aim_client's timeout)
 
     Returns:
         Dictionary containing server registration details:
@@ -97,7 +121,8 @@ def register_mcp_server(
     response = aim_client._make_request(
         method="POST",
         endpoint=f"/api/v1/sdk-api/agents/{aim_client.agent_id}/mcp-servers",
-        data=payload
+        data=payload,
+        timeout=timeout
     )
 
     # _make_request already handles errors and returns parsed JSON on success
@@ -107,7 +132,8 @@ def register_mcp_server(
 def list_mcp_servers(
     aim_client: AIMClient,
     limit: int = 50,
-    offset: int = 0
+    offset: int = 0,
+    timeout: Optional[_Timeout] = None
 ) -> List[Dict[str, Any]]:
     """
     List all MCP servers registered with AIM for the current organization.
@@ -116,6 +142,8 @@ def list_mcp_servers(
         aim_client: AIMClient instance for authentication
         limit: Maximum number of servers to return (default: 50)
         offset: Number of servers to skip (for pagination, default: 0)
+        timeout: Seconds or (connect, read) tuple for the request (default: aim_client's
+            timeout, or (3, 30) for the direct fallback)
 
     Returns:
         List of MCP server dictionaries
@@ -132,19 +160,18 @@ def list_mcp_servers(
     try:
         response = aim_client._make_request(
             method="GET",
-            endpoint=f"/api/v1/sdk-api/agents/{aim_client.agent_id}/mcp-servers?limit={limit}&offset={offset}"
+            endpoint=f"/api/v1/sdk-api/agents/{aim_client.agent_id}/mcp-servers?limit={limit}&offset={offset}",
+            timeout=timeout
         )
         return response if isinstance(response, list) else response.get("servers", [])
     except AttributeError:
         # Fallback: Make request manually if _make_request doesn't exist
-        headers = {"Content-Type": "application/json"}
         params = {"limit": limit, "offset": offset}
 
-        response = requests.get(
+        response = _SESSION.get(
             f"{aim_client.aim_url}/api/v1/mcp-servers",
-            headers=headers,
             params=params,
-            timeout=10
+            timeout=timeout or _DEFAULT_TIMEOUT
         )
 
         if response.status_code == 200:
@@ -159,7 +186,8 @@ def list_mcp_servers(
 
 def get_mcp_server(
     aim_client: AIMClient,
-    server_id: str
+    server_id: str,
+    timeout: Optional[_Timeout] = None
 ) -> Dict[str, Any]:
     """
     Get details of a specific MCP server.
@@ -167,6 +195,7 @@ def get_mcp_server(
     Args:
         aim_client: AIMClient instance for authentication
         server_id: UUID of the MCP server
+        timeout: Seconds or (connect, read) tuple for the request (default: (3, 30))
 
     Returns:
         Dictionary containing server details
@@ -175,12 +204,9 @@ def get_mcp_server(
         requests.exceptions.RequestException: If request fails
         ValueError: If server not found
     """
-    headers = {"Content-Type": "application/json"}
-
-    response = requests.get(
+    response = _SESSION.get(
         f"{aim_client.aim_url}/api/v1/mcp-servers/{server_id}",
-        headers=headers,
-        timeout=10
+        timeout=timeout or _DEFAULT_TIMEOUT
     )
 
     if response.status_code == 200:
@@ -197,7 +223,8 @@ def get_mcp_server(
 
 def delete_mcp_server(
     aim_client: AIMClient,
-    server_id: str
+    server_id: str,
+    timeout: Optional[_Timeout] = None
 ) -> bool:
     """
     Delete an MCP server registration from AIM.
@@ -205,6 +232,7 @@ def delete_mcp_server(
     Args:
         aim_client: AIMClient instance for authentication
         server_id: UUID of the MCP server to delete
+        timeout: Seconds or (connect, read) tuple for the request (default: (3, 30))
 
     Returns:
         True if deletion was successful
@@ -212,12 +240,9 @@ def delete_mcp_server(
     Raises:
         requests.exceptions.RequestException: If deletion fails
     """
-    headers = {"Content-Type": "application/json"}
-
-    response = requests.delete(
+    response = _SESSION.delete(
         f"{aim_client.aim_url}/api/v1/mcp-servers/{server_id}",
-        headers=headers,
-        timeout=10
+        timeout=timeout or _DEFAULT_TIMEOUT
     )
 
     if response.status_code == 204:
@@ -237,7 +262,8 @@ def use_mcp_tool(
     server_id: str,
     tool_name: str,
     mcp_url: str = "",
-    mcp_name: str = ""
+    mcp_name: str = "",
+    timeout: Optional[_Timeout] = None
 ) -> Dict[str, Any]:
     """
     Record that this agent is using an MCP server tool.
@@ -252,6 +278,7 @@ def use_mcp_tool(
         tool_name: Name of the tool being used (e.g., "read_file", "search")
         mcp_url: URL of the MCP server (optional, for first connection)
         mcp_name: Name of the MCP server (optional, for first connection)
+        timeout: Seconds or (connect, read) tuple for the request (default: aim_client's timeout)
 
     Returns:
         Dictionary containing connection response:
@@ -305,7 +332,8 @@ def use_mcp_tool(
     response = aim_client._make_request(
         method="POST",
         endpoint=f"/api/v1/sdk-api/agents/{aim_client.agent_id}/mcp-connections",
-        data=payload
+        data=payload,
+        timeout=timeout
     )
 
     return response
@@ -319,7 +347,8 @@ def attest_mcp_server(
     capabilities_found: List[str],
     connection_successful: bool = True,
     health_check_passed: bool = True,
-    connection_latency_ms: float = 0.0
+    connection_latency_ms: float = 0.0,
+    timeout: Optional[_Timeout] = None
 ) -> Dict[str, Any]:
     """
     Submit cryptographically signed attestation for an MCP server.
@@ -337,6 +366,7 @@ def attest_mcp_server(
         connection_successful: Whether connection to MCP was successful (default: True)
         health_check_passed: Whether health check passed (default: True)
         connection_latency_ms: Connection latency in milliseconds (default: 0.0)
+        timeout: Seconds or (connect, read) tuple for the request (default: aim_client's timeout)
 
     Returns:
         Dictionary containing attestation response:
@@ -414,7 +444,8 @@ def attest_mcp_server(
     response = aim_client._make_request(
         method="POST",
         endpoint=f"/api/v1/mcp-servers/{server_id}/attest",
-        data=payload
+        data=payload,
+        timeout=timeout
     )
 
     return response
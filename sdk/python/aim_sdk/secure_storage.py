@@ -5,6 +5,7 @@ Uses system keyring for encryption keys and stores encrypted credentials.
 Falls back to plaintext with warning if keyring is unavailable.
 """
 
+import importlib.util
 import json
 import os
 from pathlib import Path
@@ -16,11 +17,9 @@ try:
 except ImportError:
     CRYPTOGRAPHY_AVAILABLE = False
 
-try:
-    import keyring
-    KEYRING_AVAILABLE = True
-except ImportError:
-    KEYRING_AVAILABLE = False
+# keyring (and the platform backends it probes) is only imported once a
+# SecureCredentialStorage needs its cipher, keeping `import aim_sdk` fast
+KEYRING_AVAILABLE = importlib.util.find_spec("keyring") is not None
 
 
 class SecureCredentialStorage:
@@ -85,6 +84,8 @@ class SecureCredentialStorage:
             RuntimeError: If keyring access fails
         """
         try:
+            import keyring
+
             # Try to get existing key from keyring
             key = keyring.get_password(self.SERVICE_NAME, self.KEY_NAME)
 
@@ -45,7 +45,14 @@ setup(
             "black>=23.0.0",
             "flake8>=6.0.0",
             "mypy>=1.0.0",
-        ]
+        ],
+        "speedups": [
+            "pybase64>=1.3.0",  # SIMD base64 for request signing
+            "orjson>=3.9.0",  # Fast JSON for request/response bodies
+        ],
+        "http2": [
+            "httpx[http2]>=0.24.0",  # AIMClient(use_http2=True)
+        ],
     },
     keywords="aim agent identity management verification security cryptography ed25519",
     project_urls={
@@ -108,6 +108,34 @@ def test_detection_format():
             print(f"  ⚠️  Detection method not standard: {method}")
 
 
+def test_auto_detect_reuses_scan():
+    """Repeat auto_detect_mcps() calls reuse the scan until a new module is imported."""
+    from unittest.mock import patch
+    from aim_sdk import detection
+
+    detection._last_scan = None
+    scans = []
+
+    def detect_all(self):
+        scans.append(self)
+        return [{"mcpServer": "filesystem-mcp"}]
+
+    with patch.object(MCPDetector, "detect_all", detect_all):
+        first = auto_detect_mcps()
+        first[0]["mcpServer"] = "changed"
+        assert auto_detect_mcps() == [{"mcpServer": "filesystem-mcp"}]
+        assert len(scans) == 1
+
+        sys.modules["_aim_test_new_module"] = type(sys)("_aim_test_new_module")
+        try:
+            auto_detect_mcps()
+        finally:
+            del sys.modules["_aim_test_new_module"]
+        assert len(scans) == 2
+
+    detection._last_scan = None
+
+
 def main():
     """Run all tests."""
     print("\n🔍 AIM SDK - MCP Auto-Detection Tests\n")
@@ -47,6 +47,15 @@ class TestCapabilityDetector:
             # Should not detect unknown packages
             assert len(capabilities) == 0
 
+    def test_detect_from_imports_with_dotted_package(self):
+        """Test import detection with dotted package mappings"""
+        detector = CapabilityDetector()
+
+        with patch.dict(sys.modules, {"google": MagicMock(), "google.cloud": MagicMock()}, clear=True):
+            capabilities = detector.detect_from_imports()
+
+            assert capabilities == ["access_cloud_services"]
+
     def test_detect_from_config_file_exists(self):
         """Test config file detection when file exists"""
         detector = CapabilityDetector()
@@ -94,6 +103,23 @@ class TestCapabilityDetector:
                 # Should return empty list on parse error
                 assert len(capabilities) == 0
 
+    def test_detect_from_config_rereads_changed_file(self):
+        """Test config file contents are cached until the file changes"""
+        detector = CapabilityDetector()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = pathlib.Path(tmpdir) / "capabilities.json"
+            config_path.write_text(json.dumps({"capabilities": ["first"]}))
+
+            with patch.object(detector, '_get_capabilities_config_path', return_value=config_path):
+                assert detector.detect_from_config() == ["first"]
+
+                with patch('builtins.open', side_effect=AssertionError("config re-read")):
+                    assert detector.detect_from_config() == ["first"]
+
+                config_path.write_text(json.dumps({"capabilities": ["first", "second"]}))
+                assert detector.detect_from_config() == ["first", "second"]
+
     def test_detect_all_combines_sources(self):
         """Test that detect_all combines all detection methods"""
         detector = CapabilityDetector()
@@ -137,6 +163,156 @@ class TestCapabilityDetector:
                     # Should be sorted alphabetically
                     assert capabilities == ["alpha", "bravo", "zulu"]
 
+    def test_scan_file_for_decorators(self):
+        """Test decorator scanning maps action types to capabilities"""
+        detector = CapabilityDetector()
+
+        source = (
+            "@agent.perform_action(\"read_database\")\n"
+            "def get_users():\n"
+            "    pass\n"
+            "\n"
+            "@client.perform_action(action_type=\"custom_action\")\n"
+            "def custom():\n"
+            "    pass\n"
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source_path = pathlib.Path(tmpdir) / "agent.py"
+            source_path.write_text(source)
+
+            capabilities = detector._scan_file_for_decorators(str(source_path))
+
+            assert capabilities == {"access_database", "custom_action"}
+
+    def test_scan_file_for_decorators_in_classes(self):
+        """Test decorator scanning covers methods and async functions"""
+        detector = CapabilityDetector()
+
+        source = (
+            "class Tools:\n"
+            "    @agent.perform_action(\"call_api\")\n"
+            "    def fetch(self):\n"
+            "        pass\n"
+            "\n"
+            "@agent.perform_action(\"browse_web\")\n"
+            "async def browse():\n"
+            "    pass\n"
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source_path = pathlib.Path(tmpdir) / "agent.py"
+            source_path.write_text(source)
+
+            capabilities = detector._scan_file_for_decorators(str(source_path))
+
+            assert capabilities == {"make_api_calls", "web_automation"}
+
+    def test_detect_from_decorators_scans_sibling_of_sdk_dir(self):
+        """Test a caller in a directory that merely starts with the SDK path isn't skipped"""
+        from aim_sdk import capability_detection
+
+        source = (
+            "@agent.perform_action(\"read_database\")\n"
+            "def get_users():\n"
+            "    pass\n"
+            "\n"
+            "capabilities = detector.detect_from_decorators()\n"
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source_path = pathlib.Path(tmpdir) / "aim_sdk_extras" / "agent.py"
+            source_path.parent.mkdir()
+            source_path.write_text(source)
+            with patch.object(capability_detection, "_SDK_DIR", str(pathlib.Path(tmpdir) / "aim_sdk")):
+                namespace = {"__file__": str(source_path), "detector": CapabilityDetector(), "agent": MagicMock()}
+                exec(compile(source, str(source_path), "exec"), namespace)
+
+            assert namespace["capabilities"] == ["access_database"]
+
+    def test_scan_file_for_decorators_skips_parse_without_decorators(self):
+        """Test files without perform_action calls are never parsed"""
+        detector = CapabilityDetector()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source_path = pathlib.Path(tmpdir) / "plain.py"
+            source_path.write_text("def helper():\n    return 42\n")
+
+            with patch('ast.parse') as mock_parse:
+                capabilities = detector._scan_file_for_decorators(str(source_path))
+
+            assert capabilities == set()
+            mock_parse.assert_not_called()
+
+    def test_scan_file_for_decorators_reparses_changed_file(self):
+        """Test parsed ASTs are cached until the file changes"""
+        from aim_sdk.capability_detection import _parse_cached
+
+        detector = CapabilityDetector()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source_path = pathlib.Path(tmpdir) / "agent.py"
+            source_path.write_text("@agent.perform_action(\"send_email\")\ndef f():\n    pass\n")
+
+            assert detector._scan_file_for_decorators(str(source_path)) == {"send_email"}
+            hits = _parse_cached.cache_info().hits
+            assert detector._scan_file_for_decorators(str(source_path)) == {"send_email"}
+            assert _parse_cached.cache_info().hits == hits + 1
+
+            source_path.write_text("@agent.perform_action(\"run_code\")\ndef f():\n    pass\n\n")
+
+            assert detector._scan_file_for_decorators(str(source_path)) == {"execute_code"}
+
+    def test_detect_from_decorators_scans_calling_module(self):
+        """Test decorator detection finds the user module on the call stack"""
+        import importlib.util
+
+        source = (
+            "from aim_sdk.capability_detection import CapabilityDetector\n"
+            "\n"
+            "@agent.perform_action(\"write_file\")\n"
+            "def save():\n"
+            "    pass\n"
+            "\n"
+            "def detect():\n"
+            "    return CapabilityDetector().detect_from_decorators()\n"
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            module_path = pathlib.Path(tmpdir) / "user_agent.py"
+            module_path.write_text(source)
+
+            spec = importlib.util.spec_from_file_location("user_agent", module_path)
+            module = importlib.util.module_from_spec(spec)
+            module.agent = MagicMock()
+            spec.loader.exec_module(module)
+
+            assert module.detect() == ["write_files"]
+
+    def test_detect_all_reuses_cached_results(self):
+        """Test that detect_all memoizes import/config detection"""
+        detector = CapabilityDetector()
+
+        with patch.object(detector, 'detect_from_imports', return_value=["import_cap"]) as imports:
+            with patch.object(detector, 'detect_from_config', return_value=[]):
+                with patch.object(detector, 'detect_from_decorators', return_value=[]):
+                    assert detector.detect_all() == ["import_cap"]
+                    assert detector.detect_all() == ["import_cap"]
+
+                    assert imports.call_count == 1
+
+    def test_detect_all_invalidates_on_new_import(self):
+        """Test that detect_all recomputes when sys.modules grows"""
+        detector = CapabilityDetector()
+
+        with patch.object(detector, 'detect_from_decorators', return_value=[]):
+            with patch.object(detector, '_get_capabilities_config_path', return_value=None):
+                with patch.dict(sys.modules, {"unknown_package": MagicMock()}, clear=True):
+                    assert detector.detect_all() == []
+
+                    sys.modules["smtplib"] = MagicMock()
+                    assert detector.detect_all() == ["send_email"]
+
     def test_import_to_capability_mappings(self):
         """Test known import-to-capability mappings"""
         detector = CapabilityDetector()
@@ -196,6 +372,10 @@ class TestSaveCapabilitiesConfig:
                 assert "last_updated" in config
                 assert config["version"] == "1.0.0"
 
+                # Written with owner-only permissions, no temp file left behind
+                assert config_path.stat().st_mode & 0o777 == 0o600
+                assert not list(aim_dir.glob("*.tmp"))
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -2,14 +2,19 @@
 Tests for AIMClient
 """
 
+import asyncio
 import base64
 import json
 import pytest
+import re
+import requests
 import responses
+import threading
 from nacl.signing import SigningKey
 from nacl.encoding import Base64Encoder
 
 from aim_sdk import AIMClient
+from aim_sdk import client as client_module
 from aim_sdk.exceptions import (
     ConfigurationError,
     AuthenticationError,
@@ -70,6 +75,53 @@ class TestClientInitialization:
         )
         assert client.aim_url == "https://aim.example.com"
 
+    def test_init_reuses_parsed_private_key(self, test_keys):
+        """Test clients built from the same private key share the parsed key"""
+        clients = [
+            AIMClient(
+                agent_id="550e8400-e29b-41d4-a716-446655440000",
+                public_key=test_keys['public_key'],
+                private_key=test_keys['private_key'],
+                aim_url="https://aim.example.com"
+            )
+            for _ in range(2)
+        ]
+        assert clients[0].signing_key is clients[1].signing_key
+        assert base64.b64decode(clients[1]._sign_message("m")) == test_keys['signing_key'].sign(b"m").signature
+
+    def test_init_reads_sdk_credentials_once(self, test_keys, monkeypatch):
+        """Test the SDK token ID is read from disk once per process, or not at all with a token manager"""
+        calls = []
+        monkeypatch.setattr(
+            client_module, "load_sdk_credentials",
+            lambda **kwargs: calls.append(kwargs) or {"sdk_token_id": "disk-token"}
+        )
+        client_module._default_sdk_token_id.cache_clear()
+        keys = dict(public_key=test_keys['public_key'], private_key=test_keys['private_key'])
+        try:
+            first = AIMClient(agent_id="agent-1", aim_url="https://aim.example.com", **keys)
+            second = AIMClient(agent_id="agent-1", aim_url="https://aim.example.com", **keys)
+
+            class TokenManager:
+                credentials = {"sdk_token_id": "memory-token"}
+
+            third = AIMClient(
+                agent_id="agent-1", aim_url="https://aim.example.com",
+                oauth_token_manager=TokenManager(), **keys
+            )
+        finally:
+            client_module._default_sdk_token_id.cache_clear()
+
+        assert first.sdk_token_id == second.sdk_token_id == "disk-token"
+        assert third.sdk_token_id == "memory-token"
+        assert len(calls) == 1
+
+    @pytest.mark.skipif(client_module.HTTPX_AVAILABLE, reason="httpx is installed")
+    def test_init_http2_requires_httpx(self):
+        """Test use_http2 fails clearly when httpx isn't installed"""
+        with pytest.raises(ConfigurationError, match="use_http2 requires httpx"):
+            AIMClient(agent_id="agent-1", api_key="aim_test_key", aim_url="https://aim.example.com", use_http2=True)
+
     def test_init_missing_agent_id(self, test_keys):
         """Test initialization fails without agent_id"""
         with pytest.raises(ConfigurationError, match="agent_id is required"):
@@ -134,6 +186,41 @@ class TestSigning:
         verify_key.verify(message.encode('utf-8'), signature_bytes)
 
 
+    @responses.activate
+    def test_signed_request_covers_raw_body(self, aim_client, test_keys):
+        """Test the signature covers METHOD, path, timestamp and the exact body bytes sent"""
+        responses.add(responses.POST, "https://aim.example.com/api/v1/agents", json={"ok": True}, status=200)
+
+        aim_client._make_request("POST", "/api/v1/agents", data={"b": 1, "a": "\u00e9"})
+
+        request = responses.calls[0].request
+        message = b"\n".join([
+            b"POST", b"/api/v1/agents", request.headers["X-Timestamp"].encode(), request.body
+        ])
+        signature = base64.b64decode(request.headers["X-Signature"])
+        test_keys['signing_key'].verify_key.verify(message, signature)
+        assert json.loads(request.body) == {"a": "\u00e9", "b": 1}
+
+    @responses.activate
+    def test_signed_request_without_body(self, aim_client, test_keys):
+        """Test body-less requests sign METHOD, path and timestamp only"""
+        responses.add(responses.GET, "https://aim.example.com/api/v1/agents", json={}, status=200)
+
+        aim_client._make_request("get", "/api/v1/agents")
+
+        request = responses.calls[0].request
+        message = b"GET\n/api/v1/agents\n" + request.headers["X-Timestamp"].encode()
+        signature = base64.b64decode(request.headers["X-Signature"])
+        test_keys['signing_key'].verify_key.verify(message, signature)
+
+    def test_dumps_sorted_matches_without_orjson(self, monkeypatch):
+        """Test the stdlib fallback produces the same compact sorted JSON for ASCII data"""
+        data = {"b": [1, 2.5, None], "a": {"d": True, "c": "x"}}
+        fast = client_module._dumps_sorted(data)
+        monkeypatch.setattr(client_module, "ORJSON_AVAILABLE", False)
+        assert client_module._dumps_sorted(data) == fast == b'{"a":{"c":"x","d":true},"b":[1,2.5,null]}'
+
+
 class TestVerifyAction:
     """Test action verification flow"""
 
@@ -236,6 +323,454 @@ class TestVerifyAction:
             )
 
 
+    @responses.activate
+    def test_verify_action_sends_signed_body(self, aim_client, test_keys):
+        """Test the request body is sent pre-serialized and carries a valid signature"""
+        responses.add(
+            responses.POST,
+            "https://aim.example.com/api/v1/sdk-api/verifications",
+            json={"id": "verification-123", "status": "approved"},
+            status=200
+        )
+
+        aim_client.verify_action(action_type="read_database", resource="users_table")
+
+        body = responses.calls[0].request.body
+        assert isinstance(body, bytes)
+        payload = json.loads(body)
+        assert payload["public_key"] == test_keys['public_key']
+
+        # Signature covers the canonical payload without signature/public_key
+        signature = base64.b64decode(payload.pop("signature"))
+        del payload["public_key"]
+        message = json.dumps(payload, sort_keys=True, separators=(', ', ': '))
+        test_keys['signing_key'].verify_key.verify(message.encode('utf-8'), signature)
+
+
+    @responses.activate
+    def test_averify_action(self, aim_client):
+        """Test async verification returns the same result as verify_action"""
+        responses.add(
+            responses.POST,
+            "https://aim.example.com/api/v1/sdk-api/verifications",
+            json={"id": "verification-123", "status": "approved", "approved_by": "system"},
+            status=200
+        )
+
+        result = asyncio.run(aim_client.averify_action("read_database", resource="users_table"))
+
+        assert result["verified"] is True
+        assert result["verification_id"] == "verification-123"
+
+    @responses.activate
+    def test_averify_action_pending_approvals_leave_executor_free(self, aim_client, monkeypatch):
+        """Test pending async verifications wait on the approval waiter, not default executor threads"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        monkeypatch.setattr("aim_sdk.client._APPROVAL_POLL_MIN", 0.05)
+        aim_client._batch_status_supported = False
+        created = []
+
+        def create(request):
+            created.append(f"verification-{len(created)}")
+            return (200, {}, json.dumps({"id": created[-1], "status": "pending"}))
+
+        approved = threading.Event()
+        responses.add_callback(
+            responses.POST, "https://aim.example.com/api/v1/sdk-api/verifications", callback=create
+        )
+        responses.add_callback(
+            responses.GET,
+            re.compile(r"https://aim\.example\.com/api/v1/sdk-api/verifications/verification-\d+$"),
+            callback=lambda request: (200, {}, json.dumps({"status": "approved" if approved.is_set() else "pending"}))
+        )
+
+        async def main():
+            loop = asyncio.get_running_loop()
+            loop.set_default_executor(ThreadPoolExecutor(max_workers=2))
+            pending = [
+                asyncio.ensure_future(aim_client.averify_action("delete_users", timeout_seconds=30))
+                for _ in range(8)
+            ]
+            try:
+                deadline = loop.time() + 2
+                while len(created) < 8:
+                    assert loop.time() < deadline, "pending approvals are holding executor threads"
+                    await asyncio.sleep(0.01)
+                # Every approval is still pending, yet the executor runs other work right away
+                assert await asyncio.wait_for(loop.run_in_executor(None, lambda: "free"), 1) == "free"
+                assert not any(task.done() for task in pending)
+            finally:
+                approved.set()
+            return await asyncio.gather(*pending)
+
+        results = asyncio.run(main())
+
+        assert all(result["verified"] for result in results)
+        assert sorted(result["verification_id"] for result in results) == sorted(created)
+
+
+class TestVerifyActionsBatch:
+    """Test concurrent verification of several actions"""
+
+    @responses.activate
+    def test_results_in_input_order(self, aim_client):
+        """Test each action gets its own result and denials don't raise"""
+        def callback(request):
+            action = json.loads(request.body)["action_type"]
+            status = "denied" if action == "delete_database" else "approved"
+            return 200, {}, json.dumps({"id": f"v-{action}", "status": status, "denial_reason": "No"})
+
+        responses.add_callback(
+            responses.POST,
+            "https://aim.example.com/api/v1/sdk-api/verifications",
+            callback=callback
+        )
+
+        results = aim_client.verify_actions_batch([
+            {"action_type": "read_database", "resource": "users_table"},
+            {"action_type": "delete_database"},
+            {"action_type": "send_email", "context": {"to": "a@example.com"}},
+        ])
+
+        assert [r["verified"] for r in results] == [True, False, True]
+        assert results[0]["verification_id"] == "v-read_database"
+        assert results[1]["status"] == "denied"
+        assert results[2]["verification_id"] == "v-send_email"
+
+
+class TestWaitForApproval:
+    """Test waiting on pending verifications"""
+
+    @responses.activate
+    def test_long_poll_returns_decision(self, aim_client):
+        """Test a held-open wait request resolves the verification in one call"""
+        responses.add(
+            responses.GET,
+            "https://aim.example.com/api/v1/sdk-api/verifications/verification-123/wait",
+            json={"id": "verification-123", "status": "approved", "approved_by": "admin@example.com"},
+            status=200
+        )
+
+        result = aim_client._wait_for_approval("verification-123", timeout_seconds=300)
+
+        assert result["verified"] is True
+        assert result["approved_by"] == "admin@example.com"
+        assert len(responses.calls) == 1
+        assert "timeout=60" in responses.calls[0].request.url  # Each wait is capped at 60s
+
+    @responses.activate
+    def test_long_poll_reauthenticates_after_401(self, aim_client):
+        """Test an access token expiring mid-wait is refreshed once instead of failing the approval"""
+        tokens = iter(["expired-token", "fresh-token"])
+
+        class TokenManager:
+            def get_access_token(self):
+                return next(tokens)
+
+        aim_client.oauth_token_manager = TokenManager()
+        wait_url = "https://aim.example.com/api/v1/sdk-api/verifications/verification-123/wait"
+        responses.add(responses.GET, wait_url, status=401)
+        responses.add(responses.GET, wait_url, json={"id": "verification-123", "status": "approved"}, status=200)
+
+        assert aim_client._wait_for_approval("verification-123", timeout_seconds=300)["verified"] is True
+        assert [call.request.headers["Authorization"] for call in responses.calls] == [
+            "Bearer expired-token", "Bearer fresh-token"
+        ]
+
+    @responses.activate
+    def test_falls_back_to_polling_without_wait_endpoint(self, aim_client, monkeypatch):
+        """Test a 404 on the wait endpoint disables long-polling and polls instead"""
+        monkeypatch.setattr("aim_sdk.client.time.sleep", lambda s: None)
+        responses.add(
+            responses.GET,
+            "https://aim.example.com/api/v1/sdk-api/verifications/verification-123/wait",
+            status=404
+        )
+        status_url = "https://aim.example.com/api/v1/sdk-api/verifications/verification-123"
+        responses.add(responses.GET, status_url, json={"status": "pending"}, status=200)
+        responses.add(responses.GET, status_url, json={"status": "denied", "denial_reason": "No"}, status=200)
+
+        with pytest.raises(ActionDeniedError, match="No"):
+            aim_client._wait_for_approval("verification-123", timeout_seconds=30)
+
+        assert aim_client._long_poll_supported is False
+        assert len(responses.calls) == 3
+
+    @responses.activate
+    def test_polling_backs_off_from_100ms(self, aim_client, monkeypatch):
+        """Test status polls start 100ms apart and double from there"""
+        aim_client._long_poll_supported = False
+        sleeps = []
+        monkeypatch.setattr("aim_sdk.client.time.sleep", sleeps.append)
+        status_url = "https://aim.example.com/api/v1/sdk-api/verifications/verification-123"
+        for _ in range(3):
+            responses.add(responses.GET, status_url, json={"status": "pending"}, status=200)
+        responses.add(responses.GET, status_url, json={"status": "approved"}, status=200)
+
+        assert aim_client._wait_for_approval("verification-123", timeout_seconds=30)["verified"] is True
+        assert sleeps == [0.1, 0.2, 0.4]
+
+    @responses.activate
+    def test_polling_reauthenticates_once_on_401(self, aim_client, monkeypatch):
+        """Test a 401 while polling re-fetches auth once, and a second 401 raises"""
+        aim_client._long_poll_supported = False
+        fetches = []
+        real_build = aim_client._build_auth_headers
+        monkeypatch.setattr(aim_client, "_build_auth_headers", lambda: fetches.append(1) or real_build())
+        status_url = "https://aim.example.com/api/v1/sdk-api/verifications/verification-123"
+        responses.add(responses.GET, status_url, status=401)
+        responses.add(responses.GET, status_url, status=401)
+
+        with pytest.raises(AuthenticationError):
+            aim_client._wait_for_approval("verification-123", timeout_seconds=30)
+
+        assert len(responses.calls) == 2
+        assert len(fetches) == 2
+
+
+class TestSubmitForApproval:
+    """Test non-blocking approval futures"""
+
+    @pytest.fixture(autouse=True)
+    def fast_polling(self, monkeypatch):
+        monkeypatch.setattr("aim_sdk.client._APPROVAL_POLL_MIN", 0.01)
+        monkeypatch.setattr("aim_sdk.client._APPROVAL_POLL_MAX", 0.02)
+
+    def add_pending_verification(self, *statuses):
+        responses.add(
+            responses.POST,
+            "https://aim.example.com/api/v1/sdk-api/verifications",
+            json={"id": "verification-123", "status": "pending"},
+            status=200
+        )
+        for status in statuses:
+            responses.add(
+                responses.GET,
+                "https://aim.example.com/api/v1/sdk-api/verifications/verification-123",
+                json=status,
+                status=200
+            )
+
+    @responses.activate
+    def test_future_resolves_when_approved(self, aim_client):
+        """Test a pending verification is polled in the background until approved"""
+        self.add_pending_verification({"status": "pending"}, {"status": "approved", "approved_by": "admin"})
+
+        future = aim_client.submit_for_approval("delete_all_users", resource="users")
+        result = future.result(timeout=5)
+
+        assert result["verified"] is True
+        assert result["approved_by"] == "admin"
+        assert len(responses.calls) == 3
+
+    @responses.activate
+    def test_future_raises_when_denied(self, aim_client):
+        """Test a denial is raised from the future"""
+        self.add_pending_verification({"status": "denied", "denial_reason": "Too risky"})
+
+        future = aim_client.submit_for_approval("delete_all_users")
+
+        with pytest.raises(ActionDeniedError, match="Too risky"):
+            future.result(timeout=5)
+
+    @responses.activate
+    def test_require_approval_denies_on_timeout(self, aim_client):
+        """Test an action still pending at the approval timeout is denied, not run"""
+        self.add_pending_verification({"status": "pending"})
+        aim_client.approval_timeout = 0.05
+        ran = []
+
+        @aim_client.require_approval(risk_level="critical")
+        def delete_all_users():
+            ran.append(True)
+
+        result = delete_all_users()
+
+        assert result["status"] == "denied"
+        assert result["error_type"] == "ApprovalTimeout"
+        assert ran == []
+
+    @responses.activate
+    def test_require_approval_denies_over_capacity(self, aim_client):
+        """Test approvals beyond max_pending_approvals are denied without contacting the server"""
+        self.add_pending_verification({"status": "pending"})
+        aim_client.max_pending_approvals = 1
+        first = aim_client.submit_for_approval("delete_users", timeout_seconds=0.2)
+
+        @aim_client.require_approval(risk_level="critical")
+        def drop_tables():
+            pass
+
+        result = drop_tables()
+
+        assert result["status"] == "denied"
+        assert result["error_type"] == "ApprovalCapacity"
+        with pytest.raises(client_module.ApprovalTimeoutError):
+            first.result(timeout=5)
+        posts = [call for call in responses.calls if call.request.method == "POST"]
+        assert len(posts) == 1
+
+    @responses.activate
+    @pytest.mark.parametrize("stream_status", [200, 404])
+    def test_stream_approvals(self, test_keys, stream_status):
+        """Test decisions pushed over the status stream resolve futures, with polling as the fallback"""
+        client = AIMClient(
+            agent_id="550e8400-e29b-41d4-a716-446655440000",
+            public_key=test_keys['public_key'],
+            private_key=test_keys['private_key'],
+            aim_url="https://aim.example.com",
+            auto_retry=False,
+            stream_approvals=True
+        )
+        responses.add(
+            responses.GET,
+            "https://aim.example.com/api/v1/sdk-api/verifications:stream",
+            # A truncated event is skipped without stopping the waiter
+            body=(
+                ': keep-alive\n\ndata: {"id": "verif\n\n'
+                'data: {"id": "verification-123",\ndata:  "status": "approved"}\n\n'
+            ),
+            content_type="text/event-stream",
+            status=stream_status
+        )
+        if stream_status == 200:
+            self.add_pending_verification({"status": "pending"})
+        else:
+            self.add_pending_verification({"status": "approved"})
+
+        result = client.submit_for_approval("delete_all_users").result(timeout=5)
+
+        assert result["verified"] is True
+        assert client._stream_supported is (stream_status == 200)
+
+    @responses.activate
+    def test_waiter_failure_fails_pending_and_restarts(self, aim_client, monkeypatch):
+        """Test a crashed waiter thread fails its futures and the next wait starts a new thread"""
+        self.add_pending_verification({"status": "approved"})
+        waiter = aim_client._approval_waiter
+        run_until_idle = waiter._run_until_idle
+        calls = []
+
+        def crash_once():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            run_until_idle()
+
+        monkeypatch.setattr(waiter, "_run_until_idle", crash_once)
+        monkeypatch.setattr(threading, "excepthook", lambda args: None)
+
+        with pytest.raises(VerificationError, match="stopped unexpectedly"):
+            aim_client.submit_for_approval("delete_all_users").result(timeout=5)
+        assert aim_client.submit_for_approval("delete_all_users").result(timeout=5)["verified"] is True
+
+    @responses.activate
+    def test_pending_verifications_polled_in_one_batch(self, aim_client, monkeypatch):
+        """Test all pending verifications are checked with a single batch status request"""
+        monkeypatch.setattr("aim_sdk.client._APPROVAL_POLL_MIN", 0.2)
+        for verification_id in ("verification-1", "verification-2"):
+            responses.add(
+                responses.POST,
+                "https://aim.example.com/api/v1/sdk-api/verifications",
+                json={"id": verification_id, "status": "pending"},
+                status=200
+            )
+        responses.add(
+            responses.POST,
+            "https://aim.example.com/api/v1/sdk-api/verifications:batchStatus",
+            json={"verifications": [
+                {"id": "verification-1", "status": "approved"},
+                {"id": "verification-2", "status": "denied", "denial_reason": "No"}
+            ]},
+            status=200
+        )
+
+        first = aim_client.submit_for_approval("read_users")
+        second = aim_client.submit_for_approval("delete_users")
+
+        assert first.result(timeout=5)["verification_id"] == "verification-1"
+        with pytest.raises(ActionDeniedError, match="No"):
+            second.result(timeout=5)
+        assert len(responses.calls) == 3
+        assert json.loads(responses.calls[2].request.body) == {"ids": ["verification-1", "verification-2"]}
+
+    @responses.activate
+    def test_batch_polling_falls_back_per_verification(self, aim_client):
+        """Test a 404 on the batch status endpoint falls back to one poll per verification for good"""
+        responses.add(
+            responses.POST,
+            "https://aim.example.com/api/v1/sdk-api/verifications:batchStatus",
+            status=404
+        )
+        for verification_id in ("verification-1", "verification-2"):
+            responses.add(
+                responses.GET,
+                f"https://aim.example.com/api/v1/sdk-api/verifications/{verification_id}",
+                json={"status": "approved"},
+                status=200
+            )
+
+        futures = [aim_client._approval_waiter.wait(vid, 5) for vid in ("verification-1", "verification-2")]
+
+        assert [f.result(timeout=5)["verification_id"] for f in futures] == ["verification-1", "verification-2"]
+        assert aim_client._batch_status_supported is False
+        assert len(responses.calls) == 3
+
+    @responses.activate
+    def test_require_approval_awaits_coroutine(self, aim_client):
+        """Test decorated coroutine functions await approval and run once approved"""
+        self.add_pending_verification({"status": "approved"})
+        responses.add(
+            responses.POST,
+            "https://aim.example.com/api/v1/sdk-api/verifications/verification-123/result",
+            json={"status": "logged"},
+            status=200
+        )
+
+        @aim_client.require_approval(risk_level="critical")
+        async def delete_all_users():
+            return "deleted"
+
+        assert asyncio.run(delete_all_users()) == "deleted"
+
+    @responses.activate
+    def test_require_approval_coroutine_keeps_loop_responsive(self, aim_client):
+        """Test a slow verification request doesn't block the event loop"""
+        import time
+
+        def slow_verification(request):
+            time.sleep(0.5)
+            return (200, {}, json.dumps({"id": "verification-123", "status": "approved"}))
+
+        responses.add_callback(
+            responses.POST, "https://aim.example.com/api/v1/sdk-api/verifications", callback=slow_verification
+        )
+        responses.add(
+            responses.POST,
+            "https://aim.example.com/api/v1/sdk-api/verifications/verification-123/result",
+            json={"status": "logged"},
+            status=200
+        )
+
+        @aim_client.require_approval(risk_level="critical")
+        async def delete_all_users():
+            return "deleted"
+
+        async def main():
+            ticks = 0
+            task = asyncio.ensure_future(delete_all_users())
+            while not task.done():
+                await asyncio.sleep(0.01)
+                ticks += 1
+            return task.result(), ticks
+
+        result, ticks = asyncio.run(main())
+
+        assert result == "deleted"
+        assert ticks >= 10  # The loop kept running other coroutines during the 0.5s request
+
+
 class TestLogActionResult:
     """Test action result logging"""
 
@@ -394,6 +929,756 @@ class TestPerformActionDecorator:
         assert "Database connection failed" in log_request["error_message"]
 
 
+class TestTrackActionDecorator:
+    """Test @track_action decorator"""
+
+    @responses.activate
+    def test_low_risk_verification_reused_within_ttl(self, aim_client, monkeypatch):
+        """Test a low-risk verification is reused until verification_ttl passes"""
+        now = [1000.0]
+        monkeypatch.setattr("aim_sdk.client.time.monotonic", lambda: now[0])
+        verify_url = "https://aim.example.com/api/v1/sdk-api/verifications"
+        responses.add(responses.POST, verify_url, json={"id": "verification-123", "status": "approved"}, status=200)
+        responses.add(
+            responses.POST,
+            "https://aim.example.com/api/v1/sdk-api/verifications/verification-123/result",
+            json={"status": "logged"},
+            status=200
+        )
+
+        @aim_client.track_action(risk_level="low", verification_ttl=60)
+        def get_weather(city):
+            return f"sunny in {city}"
+
+        assert get_weather("Paris") == "sunny in Paris"
+        assert get_weather("Rome") == "sunny in Rome"
+        now[0] += 61
+        get_weather("Oslo")
+
+        verify_calls = [call for call in responses.calls if call.request.url == verify_url]
+        assert len(verify_calls) == 2
+        assert len(responses.calls) == 5  # 2 verifications + 3 result logs
+
+    @responses.activate
+    def test_medium_risk_verification_reused_for_identical_call(self, aim_client):
+        """Test a medium-risk verification is only reused when the arguments match"""
+        verify_url = "https://aim.example.com/api/v1/sdk-api/verifications"
+        responses.add(responses.POST, verify_url, json={"id": "verification-123", "status": "approved"}, status=200)
+        responses.add(
+            responses.POST,
+            "https://aim.example.com/api/v1/sdk-api/verifications/verification-123/result",
+            json={"status": "logged"},
+            status=200
+        )
+
+        @aim_client.track_action(risk_level="medium", verification_ttl=60)
+        def update_profile(user_id, name=None):
+            return name
+
+        update_profile(1, name="Ada")
+        update_profile(1, name="Ada")
+        update_profile(2, name="Ada")
+
+        verify_calls = [call for call in responses.calls if call.request.url == verify_url]
+        assert len(verify_calls) == 2
+
+    @responses.activate
+    def test_medium_risk_verification_not_reused_for_equal_reprs(self, aim_client):
+        """Test arguments whose reprs match but values differ are verified every call"""
+        verify_url = "https://aim.example.com/api/v1/sdk-api/verifications"
+        responses.add(responses.POST, verify_url, json={"id": "verification-123", "status": "approved"}, status=200)
+        responses.add(
+            responses.POST,
+            "https://aim.example.com/api/v1/sdk-api/verifications/verification-123/result",
+            json={"status": "logged"},
+            status=200
+        )
+
+        class Transfer:
+            def __init__(self, account, amount):
+                self.account, self.amount = account, amount
+
+            def __repr__(self):
+                return f"Transfer({self.account})"  # Leaves out the amount
+
+        @aim_client.track_action(risk_level="medium", verification_ttl=60)
+        def send(transfer):
+            return transfer.amount
+
+        assert repr(Transfer("acct-1", 10)) == repr(Transfer("acct-1", 10000))
+        send(Transfer("acct-1", 10))
+        send(Transfer("acct-1", 10000))
+
+        verify_calls = [call for call in responses.calls if call.request.url == verify_url]
+        assert len(verify_calls) == 2
+
+    @responses.activate
+    def test_large_arguments_truncated_in_context(self, aim_client):
+        """Test args/kwargs sent as verification context have a bounded repr"""
+        verify_url = "https://aim.example.com/api/v1/sdk-api/verifications"
+        responses.add(responses.POST, verify_url, json={"id": "verification-123", "status": "approved"}, status=200)
+        responses.add(
+            responses.POST,
+            "https://aim.example.com/api/v1/sdk-api/verifications/verification-123/result",
+            json={"status": "logged"},
+            status=200
+        )
+
+        @aim_client.track_action(risk_level="low")
+        def upload(content, rows=None):
+            return len(content)
+
+        upload("x" * 100000, rows=list(range(100000)))
+
+        verify_call = next(call for call in responses.calls if call.request.url == verify_url)
+        context = json.loads(verify_call.request.body)["context"]
+        assert context["args"].startswith("('xxx")
+        assert len(context["args"]) < 300
+        assert "rows" in context["kwargs"]
+        assert len(context["kwargs"]) < 300
+
+    @responses.activate
+    def test_failures_logged_not_printed(self, aim_client, caplog, capsys):
+        """Test decorator diagnostics go to the aim_sdk logger instead of stdout"""
+        responses.add(
+            responses.POST,
+            "https://aim.example.com/api/v1/sdk-api/verifications",
+            json={"id": "verification-123", "status": "approved"},
+            status=200
+        )
+        responses.add(
+            responses.POST,
+            "https://aim.example.com/api/v1/sdk-api/verifications/verification-123/result",
+            json={"status": "logged"},
+            status=200
+        )
+
+        @aim_client.track_action(risk_level="low")
+        def fail():
+            raise ValueError("boom")
+
+        with caplog.at_level("WARNING", logger="aim_sdk"):
+            result = fail()
+
+        assert result["status"] == "execution_failed"
+        assert "Error executing action 'fail': ValueError: boom" in caplog.text
+        assert capsys.readouterr().out == ""
+
+    @responses.activate
+    def test_background_logging(self, test_keys):
+        """Test results are logged off the caller's thread and flushed on close"""
+        client = AIMClient(
+            agent_id="550e8400-e29b-41d4-a716-446655440000",
+            public_key=test_keys['public_key'],
+            private_key=test_keys['private_key'],
+            aim_url="https://aim.example.com",
+            background_logging=True
+        )
+        release = threading.Event()
+        logged = []
+
+        def log_result(request):
+            release.wait(5)
+            logged.append(json.loads(request.body)["result"])
+            return (200, {}, json.dumps({"status": "logged"}))
+
+        responses.add(
+            responses.POST,
+            "https://aim.example.com/api/v1/sdk-api/verifications",
+            json={"id": "verification-123", "status": "approved"},
+            status=200
+        )
+        responses.add_callback(
+            responses.POST,
+            "https://aim.example.com/api/v1/sdk-api/verifications/verification-123/result",
+            callback=log_result
+        )
+
+        @client.track_action(risk_level="low")
+        def get_weather(city):
+            return f"sunny in {city}"
+
+        assert get_weather("Paris") == "sunny in Paris"
+        assert logged == []
+
+        release.set()
+        client.close()
+        assert logged == ["success"]
+
+    @responses.activate
+    @pytest.mark.parametrize("batch_status", [200, 404])
+    def test_background_logging_batches_results(self, test_keys, batch_status):
+        """Test queued results go out in one batch request, or one request each without the batch endpoint"""
+        client = AIMClient(
+            agent_id="550e8400-e29b-41d4-a716-446655440000",
+            public_key=test_keys['public_key'],
+            private_key=test_keys['private_key'],
+            aim_url="https://aim.example.com",
+            background_logging=True
+        )
+        batch_url = "https://aim.example.com/api/v1/sdk-api/verifications/results:batch"
+        result_url = "https://aim.example.com/api/v1/sdk-api/verifications/verification-123/result"
+        responses.add(
+            responses.POST,
+            "https://aim.example.com/api/v1/sdk-api/verifications",
+            json={"id": "verification-123", "status": "approved"},
+            status=200
+        )
+        responses.add(responses.POST, batch_url, json={"status": "logged"}, status=batch_status)
+        responses.add(responses.POST, result_url, json={"status": "logged"}, status=200)
+
+        @client.track_action(risk_level="low", verification_ttl=60)
+        def get_weather(city):
+            return f"sunny in {city}"
+
+        for city in ("Paris", "Rome", "Oslo"):
+            get_weather(city)
+        client.close()
+
+        batch_calls = [call for call in responses.calls if call.request.url == batch_url]
+        result_calls = [call for call in responses.calls if call.request.url == result_url]
+        assert len(batch_calls) == 1
+        if batch_status == 200:
+            results = json.loads(batch_calls[0].request.body)["results"]
+            assert [r["verification_id"] for r in results] == ["verification-123"] * 3
+            assert all(r["result"] == "success" and r["timestamp"] for r in results)
+            assert result_calls == []
+        else:
+            assert len(result_calls) == 3
+            assert client._batch_results_supported is False
+
+    def test_verification_ttl_requires_low_risk(self, aim_client):
+        """Test verification reuse cannot be enabled for risky actions"""
+        with pytest.raises(ConfigurationError, match="verification_ttl"):
+            aim_client.track_action(risk_level="high", verification_ttl=60)
+
+
+class TestMakeRequestRetry:
+    """Test retry behavior of _make_request"""
+
+    @responses.activate
+    def test_retries_server_error_then_succeeds(self, aim_client, monkeypatch):
+        """Test 5xx responses are retried with backoff until success"""
+        sleeps = []
+        monkeypatch.setattr("aim_sdk.client.time.sleep", sleeps.append)
+        aim_client.auto_retry = True
+        url = "https://aim.example.com/api/v1/agents"
+        responses.add(responses.GET, url, json={"error": "boom"}, status=503)
+        responses.add(responses.GET, url, json={"error": "boom"}, status=503)
+        responses.add(responses.GET, url, json={"agents": []}, status=200)
+
+        result = aim_client._make_request("GET", "/api/v1/agents")
+
+        assert result == {"agents": []}
+        assert len(responses.calls) == 3
+        assert sleeps == [1, 2]
+        # Same signed headers are reused across attempts
+        assert len({call.request.headers["X-Signature"] for call in responses.calls}) == 1
+
+    @responses.activate
+    def test_connection_errors_exhaust_retries(self, aim_client, monkeypatch):
+        """Test connection failures raise VerificationError after max_retries"""
+        monkeypatch.setattr("aim_sdk.client.time.sleep", lambda s: None)
+        aim_client.auto_retry = True
+        aim_client.max_retries = 2
+        responses.add(
+            responses.GET,
+            "https://aim.example.com/api/v1/agents",
+            body=requests.exceptions.ConnectionError("refused")
+        )
+
+        with pytest.raises(VerificationError, match="Connection failed"):
+            aim_client._make_request("GET", "/api/v1/agents")
+        assert len(responses.calls) == 3
+
+    @responses.activate
+    def test_backoff_is_capped(self, aim_client, monkeypatch):
+        """Test a large max_retries cannot stall for more than 30s per attempt"""
+        sleeps = []
+        monkeypatch.setattr("aim_sdk.client.time.sleep", sleeps.append)
+        aim_client.auto_retry = True
+        aim_client.max_retries = 7
+        responses.add(responses.GET, "https://aim.example.com/api/v1/agents", status=503)
+
+        with pytest.raises(VerificationError):
+            aim_client._make_request("GET", "/api/v1/agents")
+        assert sleeps == [1, 2, 4, 8, 16, 30, 30]
+
+    def test_http2_request_uses_per_call_timeout(self, aim_client, monkeypatch):
+        """Test a (connect, read) timeout is converted for httpx and passed on the HTTP/2 path"""
+        class Timeout:
+            def __init__(self, timeout, connect=None):
+                self.read, self.connect = timeout, connect
+
+        class Response:
+            status_code = 200
+            content = b'{"agents": []}'
+
+            def raise_for_status(self):
+                pass
+
+        sent = []
+
+        class Http2Client:
+            def request(self, method, url, **kwargs):
+                sent.append(kwargs)
+                return Response()
+
+        monkeypatch.setattr(client_module, "httpx", type("httpx", (), {"Timeout": Timeout}), raising=False)
+        monkeypatch.setattr(aim_client, "_http2_client", Http2Client())
+
+        assert aim_client._make_request("GET", "/api/v1/agents", timeout=(3, 30)) == {"agents": []}
+        timeout = sent[0]["timeout"]
+        assert (timeout.connect, timeout.read) == (3, 30)
+
+        aim_client._make_request("GET", "/api/v1/agents")
+        assert sent[1]["timeout"] == 10
+
+    @responses.activate
+    def test_rate_limit_honors_retry_after(self, aim_client, monkeypatch):
+        """Test 429/503 responses wait for Retry-After instead of the backoff, capped at 30s"""
+        sleeps = []
+        monkeypatch.setattr("aim_sdk.client.time.sleep", sleeps.append)
+        aim_client.auto_retry = True
+        url = "https://aim.example.com/api/v1/agents"
+        responses.add(responses.GET, url, status=429, headers={"Retry-After": "0.25"})
+        responses.add(responses.GET, url, status=503, headers={"Retry-After": "120"})
+        responses.add(responses.GET, url, status=429)
+        responses.add(responses.GET, url, json={"agents": []}, status=200)
+
+        assert aim_client._make_request("GET", "/api/v1/agents", timeout=(3, 30)) == {"agents": []}
+        assert sleeps == [0.25, 30, 4]
+
+    @responses.activate
+    def test_no_retry_when_disabled(self, aim_client):
+        """Test auto_retry=False returns the server error without retrying"""
+        responses.add(
+            responses.GET,
+            "https://aim.example.com/api/v1/agents",
+            json={"error": "boom"},
+            status=500
+        )
+
+        with pytest.raises(VerificationError, match="Request failed"):
+            aim_client._make_request("GET", "/api/v1/agents")
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_retry_guard_stops_retries_during_error_storm(self, aim_client, monkeypatch):
+        """Test retries stop once most recent requests failed, until the cooldown ends"""
+        now = [1000.0]
+        monkeypatch.setattr("aim_sdk.client.time.sleep", lambda s: None)
+        monkeypatch.setattr("aim_sdk.client.time.monotonic", lambda: now[0])
+        aim_client.auto_retry = True
+        aim_client._retry_guard = client_module._RetryGuard(min_samples=4, cooldown=15)
+        responses.add(responses.GET, "https://aim.example.com/api/v1/agents", status=503)
+
+        # 4 failed attempts trip the guard, so the second call is not retried
+        for _ in range(2):
+            with pytest.raises(VerificationError):
+                aim_client._make_request("GET", "/api/v1/agents")
+        assert len(responses.calls) == 5
+
+        now[0] += 16
+        with pytest.raises(VerificationError):
+            aim_client._make_request("GET", "/api/v1/agents")
+        assert len(responses.calls) == 9
+
+
+class TestReportDetections:
+    """Test MCP detection reporting"""
+
+    @responses.activate
+    def test_report_detections_accepts_generator(self, aim_client):
+        """Test detections can be streamed from a generator"""
+        responses.add(
+            responses.POST,
+            "https://aim.example.com/api/v1/detection/agents/550e8400-e29b-41d4-a716-446655440000/report",
+            json={"success": True, "detectionsProcessed": 2},
+            status=200
+        )
+
+        detections = (
+            {"mcpServer": name, "detectionMethod": "sdk_import", "confidence": 95.0}
+            for name in ("server-a", "server-b")
+        )
+        result = aim_client.report_detections(detections)
+
+        assert result["detectionsProcessed"] == 2
+        sent = json.loads(responses.calls[0].request.body)["detections"]
+        assert [d["mcpServer"] for d in sent] == ["server-a", "server-b"]
+
+    @responses.activate
+    def test_report_detection_coalesces(self, aim_client):
+        """Test single detections queued together are sent in one request"""
+        responses.add(
+            responses.POST,
+            "https://aim.example.com/api/v1/detection/agents/550e8400-e29b-41d4-a716-446655440000/report",
+            json={"success": True},
+            status=200
+        )
+
+        for name in ("server-a", "server-b", "server-c"):
+            aim_client.report_detection({"mcpServer": name, "detectionMethod": "sdk_runtime", "confidence": 100.0})
+        timer = aim_client._detection_timer
+        timer.join(5)
+
+        assert not timer.is_alive()
+        assert len(responses.calls) == 1
+        detections = json.loads(responses.calls[0].request.body)["detections"]
+        assert [d["mcpServer"] for d in detections] == ["server-a", "server-b", "server-c"]
+
+    @responses.activate
+    def test_close_flushes_queued_detections(self, aim_client):
+        """Test close() sends queued detections without waiting for the timer"""
+        responses.add(
+            responses.POST,
+            "https://aim.example.com/api/v1/detection/agents/550e8400-e29b-41d4-a716-446655440000/report",
+            json={"success": True},
+            status=200
+        )
+
+        aim_client.report_detection({"mcpServer": "server-a", "detectionMethod": "sdk_runtime", "confidence": 100.0})
+        aim_client.close()
+
+        assert len(responses.calls) == 1
+        assert aim_client._detection_timer is None
+
+    @responses.activate
+    def test_identical_sdk_integration_reports_sent_once(self, aim_client, monkeypatch):
+        """Test repeated identical SDK integration reports reuse the first response until the TTL passes"""
+        now = [1000.0]
+        monkeypatch.setattr("aim_sdk.client.time.monotonic", lambda: now[0])
+        responses.add(
+            responses.POST,
+            "https://aim.example.com/api/v1/sdk-api/agents/550e8400-e29b-41d4-a716-446655440000/detection/report",
+            json={"success": True, "detectionsProcessed": 1},
+            status=200
+        )
+
+        for _ in range(3):
+            result = aim_client.report_sdk_integration("aim-sdk-python@1.0.0", capabilities=["auto_detect_mcps"])
+        assert result["detectionsProcessed"] == 1
+        assert len(responses.calls) == 1
+
+        aim_client.report_sdk_integration("aim-sdk-python@1.0.0", capabilities=["capability_detection"])
+        assert len(responses.calls) == 2
+
+        now[0] += 301
+        aim_client.report_sdk_integration("aim-sdk-python@1.0.0", capabilities=["auto_detect_mcps"])
+        assert len(responses.calls) == 3
+
+
+class TestReportCapabilities:
+    """Test capability reporting in API key mode"""
+
+    @pytest.fixture
+    def api_key_client(self):
+        return AIMClient(agent_id="agent-1", api_key="aim_test_key", aim_url="https://aim.example.com")
+
+    @responses.activate
+    def test_batch_request(self, api_key_client):
+        """Test all capabilities are granted with one batch request"""
+        responses.add(
+            responses.POST,
+            "https://aim.example.com/api/v1/sdk-api/agents/agent-1/capabilities:batch",
+            json={"granted": ["read_files"], "duplicates": ["network_access"], "errors": []},
+            status=200
+        )
+
+        result = api_key_client.report_capabilities(["read_files", "network_access", "execute_code"])
+
+        assert result == {"granted": 2, "total": 3}
+        assert len(responses.calls) == 1
+        sent = json.loads(responses.calls[0].request.body)["capabilities"]
+        assert [c["capabilityType"] for c in sent] == ["read_files", "network_access", "execute_code"]
+
+    @responses.activate
+    def test_falls_back_without_batch_endpoint(self, api_key_client):
+        """Test a 404 on the batch endpoint falls back to per-capability grants for good"""
+        responses.add(
+            responses.POST,
+            "https://aim.example.com/api/v1/sdk-api/agents/agent-1/capabilities:batch",
+            status=404
+        )
+        responses.add(
+            responses.POST,
+            "https://aim.example.com/api/v1/sdk-api/agents/agent-1/capabilities",
+            json={"id": "cap"},
+            status=200
+        )
+
+        assert api_key_client.report_capabilities(["read_files", "network_access"]) == {"granted": 2, "total": 2}
+        assert api_key_client._bulk_capabilities_supported is False
+        assert api_key_client.report_capabilities(["read_files"]) == {"granted": 1, "total": 1}
+        assert len(responses.calls) == 4
+
+    @responses.activate
+    def test_concurrent_fallback_counts_duplicates(self, api_key_client):
+        """Test concurrent per-capability grants count duplicates but not other failures"""
+        api_key_client._bulk_capabilities_supported = False
+        auto_retry_during_grants = []
+
+        def grant(request):
+            # Other threads sharing the client keep their retries while grants run
+            auto_retry_during_grants.append(api_key_client.auto_retry)
+            capability = json.loads(request.body)["capabilityType"]
+            if capability == "network_access":
+                return (500, {}, json.dumps({"error": "duplicate key value violates unique constraint"}))
+            if capability == "execute_code":
+                return (403, {}, json.dumps({"error": "forbidden"}))
+            return (200, {}, json.dumps({"id": capability}))
+
+        responses.add_callback(
+            responses.POST,
+            "https://aim.example.com/api/v1/sdk-api/agents/agent-1/capabilities",
+            callback=grant
+        )
+
+        result = api_key_client.report_capabilities(["read_files", "network_access", "execute_code", "write_files"])
+
+        assert result == {"granted": 3, "total": 4}
+        assert len(responses.calls) == 4
+        assert api_key_client.auto_retry is True
+        assert auto_retry_during_grants == [True] * 4
+
+
+class TestCreateNewAgent:
+    """Test agent creation through an authenticated client"""
+
+    @responses.activate
+    def test_generates_go_compatible_keypair(self):
+        """Test the returned private key is seed + public key and matches the key sent"""
+        client = AIMClient(agent_id="agent-1", api_key="aim_test_key", aim_url="https://aim.example.com")
+        responses.add(responses.POST, "https://aim.example.com/api/v1/agents", json={"id": "new-agent"}, status=201)
+
+        result = client.create_new_agent(name="new-agent")
+
+        sent_public_key = json.loads(responses.calls[0].request.body)["publicKey"]
+        private_key = base64.b64decode(result["private_key"])
+        assert len(private_key) == 64
+        assert private_key[32:] == base64.b64decode(sent_public_key)
+        assert SigningKey(private_key[:32]).verify_key.encode() == private_key[32:]
+        assert result["public_key"] == sent_public_key
+        assert result["agent_id"] == "new-agent"
+
+    @responses.activate
+    def test_only_set_optional_fields_are_sent(self):
+        """Test unset optional fields are left out of the registration payload"""
+        client = AIMClient(agent_id="agent-1", api_key="aim_test_key", aim_url="https://aim.example.com")
+        responses.add(responses.POST, "https://aim.example.com/api/v1/agents", json={"id": "new-agent"}, status=201)
+
+        client.create_new_agent(name="new-agent", version="1.0.0", capabilities=[], talks_to=["github"])
+
+        sent = json.loads(responses.calls[0].request.body)
+        assert sent["version"] == "1.0.0"
+        assert sent["talksTo"] == ["github"]
+        assert sent["displayName"] == "new-agent"
+        assert not {"repositoryUrl", "documentationUrl", "capabilities"} & sent.keys()
+
+    @responses.activate
+    def test_bulk_request(self):
+        """Test several agents are created with one bulk request, in input order"""
+        client = AIMClient(agent_id="agent-1", api_key="aim_test_key", aim_url="https://aim.example.com")
+        responses.add(
+            responses.POST,
+            "https://aim.example.com/api/v1/agents:bulk",
+            json={"agents": [{"id": "a1", "name": "first"}, {"id": "a2", "name": "second"}]},
+            status=201
+        )
+
+        agents = client.create_new_agents([{"name": "first"}, {"name": "second", "version": "2.0"}])
+
+        sent = json.loads(responses.calls[0].request.body)["agents"]
+        assert [a["name"] for a in sent] == ["first", "second"]
+        assert sent[1]["version"] == "2.0"
+        assert [a["agent_id"] for a in agents] == ["a1", "a2"]
+        assert [a["public_key"] for a in agents] == [a["publicKey"] for a in sent]
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_falls_back_without_bulk_endpoint(self):
+        """Test a 404 on the bulk endpoint falls back to one request per agent, in input order"""
+        client = AIMClient(agent_id="agent-1", api_key="aim_test_key", aim_url="https://aim.example.com")
+        responses.add(responses.POST, "https://aim.example.com/api/v1/agents:bulk", status=404)
+        responses.add_callback(
+            responses.POST,
+            "https://aim.example.com/api/v1/agents",
+            callback=lambda request: (201, {}, json.dumps({"id": json.loads(request.body)["name"]}))
+        )
+
+        names = [f"agent-{i}" for i in range(5)]
+        agents = client.create_new_agents([{"name": name} for name in names])
+
+        assert [a["agent_id"] for a in agents] == names
+        assert client._bulk_agents_supported is False
+        assert len(responses.calls) == 6
+
+    def test_bulk_requires_names(self):
+        """Test every spec needs a name before anything is sent"""
+        client = AIMClient(agent_id="agent-1", api_key="aim_test_key", aim_url="https://aim.example.com")
+        with pytest.raises(ConfigurationError, match="name is required"):
+            client.create_new_agents([{"name": "ok"}, {"display_name": "missing"}])
+
+
+class TestListAgents:
+    """Test listing agents in the organization"""
+
+    @responses.activate
+    def test_query_string_is_escaped(self):
+        """Test filters are URL-encoded and limit is capped"""
+        client = AIMClient(agent_id="agent-1", api_key="aim_test_key", aim_url="https://aim.example.com")
+        responses.add(responses.GET, "https://aim.example.com/api/v1/agents", json={"agents": []}, status=200)
+
+        client.list_agents(limit=500, status="verified&x=1")
+
+        assert responses.calls[0].request.url == (
+            "https://aim.example.com/api/v1/agents?limit=100&offset=0&status=verified%26x%3D1"
+        )
+
+
+class TestGetAgentDetails:
+    """Test agent detail lookups and their short-lived cache"""
+
+    @pytest.fixture
+    def api_key_client(self):
+        return AIMClient(agent_id="agent-1", api_key="aim_test_key", aim_url="https://aim.example.com")
+
+    @responses.activate
+    def test_cached_until_ttl_expires(self, api_key_client, monkeypatch):
+        """Test repeated lookups reuse the response until the TTL passes"""
+        now = [1000.0]
+        monkeypatch.setattr("aim_sdk.client.time.monotonic", lambda: now[0])
+        responses.add(responses.GET, "https://aim.example.com/api/v1/agents/agent-2", json={"id": "agent-2"}, status=200)
+
+        first = api_key_client.get_agent_details("agent-2")
+        first["trust_score"] = 0
+        assert api_key_client.get_agent_details("agent-2") == {"id": "agent-2"}
+        assert len(responses.calls) == 1
+
+        now[0] += 31
+        api_key_client.get_agent_details("agent-2")
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_update_invalidates_cache(self, api_key_client):
+        """Test updating an agent drops its cached details"""
+        url = "https://aim.example.com/api/v1/agents/agent-2"
+        responses.add(responses.GET, url, json={"id": "agent-2", "version": "1"}, status=200)
+        responses.add(responses.PUT, url, json={"id": "agent-2", "version": "2"}, status=200)
+
+        api_key_client.get_agent_details("agent-2")
+        api_key_client.update_agent(agent_id="agent-2", version="2")
+        api_key_client.get_agent_details("agent-2")
+
+        assert [call.request.method for call in responses.calls] == ["GET", "PUT", "GET"]
+
+    @responses.activate
+    def test_cache_disabled(self):
+        """Test agent_cache_ttl=0 always fetches"""
+        client = AIMClient(
+            agent_id="agent-1", api_key="aim_test_key", aim_url="https://aim.example.com", agent_cache_ttl=0
+        )
+        responses.add(responses.GET, "https://aim.example.com/api/v1/agents/agent-1", json={"id": "agent-1"}, status=200)
+
+        client.get_agent_details()
+        client.get_agent_details()
+        assert len(responses.calls) == 2
+
+
+class TestAuthModes:
+    """Test the auth mode picked at construction time"""
+
+    @responses.activate
+    def test_api_key_mode(self):
+        """Test API-key clients send X-API-Key and no signature"""
+        client = AIMClient(agent_id="agent-1", api_key="aim_test_key", aim_url="https://aim.example.com")
+        responses.add(responses.GET, "https://aim.example.com/api/v1/agents", json={}, status=200)
+
+        client._make_request("GET", "/api/v1/agents")
+
+        headers = responses.calls[0].request.headers
+        assert headers["X-API-Key"] == "aim_test_key"
+        assert "X-Signature" not in headers
+
+    @responses.activate
+    def test_api_key_mode_serializes_body(self):
+        """Test unsigned bodies are sent as compact JSON with a JSON content type"""
+        client = AIMClient(agent_id="agent-1", api_key="aim_test_key", aim_url="https://aim.example.com")
+        responses.add(responses.POST, "https://aim.example.com/api/v1/agents", json={}, status=200)
+
+        client._make_request("POST", "/api/v1/agents", data={"name": "agent", "tags": ["a", "é"]})
+
+        request = responses.calls[0].request
+        assert request.headers["Content-Type"] == "application/json"
+        assert json.loads(request.body) == {"name": "agent", "tags": ["a", "é"]}
+        assert b", " not in request.body
+
+    def test_signing_takes_priority_over_api_key(self, test_keys):
+        """Test Ed25519 signing wins when both keys and an API key are given"""
+        client = AIMClient(
+            agent_id="agent-1",
+            public_key=test_keys['public_key'],
+            private_key=test_keys['private_key'],
+            api_key="aim_test_key",
+            aim_url="https://aim.example.com"
+        )
+        assert client._auth_for_request == client._ed25519_auth
+
+
+class TestBuildAuthHeaders:
+    """Test cached headers for status and result requests"""
+
+    def test_rebuilt_only_when_token_changes(self, test_keys):
+        """Test the OAuth header dict is reused until the access token rotates"""
+        class TokenManager:
+            token = "token-1"
+
+            def get_access_token(self):
+                return self.token
+
+        manager = TokenManager()
+        client = AIMClient(
+            agent_id="550e8400-e29b-41d4-a716-446655440000",
+            public_key=test_keys['public_key'],
+            private_key=test_keys['private_key'],
+            aim_url="https://aim.example.com",
+            sdk_token_id="sdk-token",
+            oauth_token_manager=manager
+        )
+
+        first = client._build_auth_headers()
+        assert first["Authorization"] == "Bearer token-1"
+        assert first["X-SDK-Token"] == "sdk-token"
+        assert client._build_auth_headers() is first
+
+        manager.token = "token-2"
+        rotated = client._build_auth_headers()
+        assert rotated is not first
+        assert rotated["Authorization"] == "Bearer token-2"
+
+
+class TestPreparedRequestCache:
+    """Test reuse of prepared request templates"""
+
+    @responses.activate
+    def test_template_reused_without_leaking_auth_headers(self, aim_client):
+        """Test repeat calls share one template that never holds per-call headers"""
+        url = "https://aim.example.com/api/v1/agents"
+        responses.add(responses.POST, url, json={"ok": True}, status=200)
+
+        aim_client._make_request("POST", "/api/v1/agents", data={"name": "a"})
+        aim_client._make_request("POST", "/api/v1/agents", data={"name": "b"})
+
+        assert len(aim_client._prep_cache) == 1
+        template, _ = aim_client._prep_cache[("POST", "/api/v1/agents")]
+        assert template.url == url
+        assert "X-Signature" not in template.headers
+        assert template.body is None
+        assert [json.loads(call.request.body) for call in responses.calls] == [{"name": "a"}, {"name": "b"}]
+        assert responses.calls[1].request.headers["X-Agent-ID"] == aim_client.agent_id
+
+
 class TestContextManager:
     """Test context manager support"""
 
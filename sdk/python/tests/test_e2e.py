@@ -103,10 +103,11 @@ def test_zero_config_registration():
                     mock_token_manager.return_value = mock_tm_instance
 
                     # Mock the HTTP POST request
-                    with patch('aim_sdk.client.requests.post') as mock_post:
+                    with patch('aim_sdk.client._REGISTRATION_SESSION.post') as mock_post:
                         mock_response = MagicMock()
                         mock_response.status_code = 201
                         mock_response.json.return_value = mock_registration_response
+                        mock_response.content = json.dumps(mock_registration_response).encode()
                         mock_post.return_value = mock_response
 
                         # Mock MCP detection reporting
@@ -163,10 +164,11 @@ def test_api_key_registration():
     with patch('aim_sdk.client.load_sdk_credentials', return_value=None):
         with patch('aim_sdk.client._load_credentials', return_value=None):  # No existing creds
             with patch('aim_sdk.client._save_credentials'):  # Don't save to disk
-                with patch('aim_sdk.client.requests.post') as mock_post:
+                with patch('aim_sdk.client._REGISTRATION_SESSION.post') as mock_post:
                     mock_response = MagicMock()
                     mock_response.status_code = 201
                     mock_response.json.return_value = mock_registration_response
+                    mock_response.content = json.dumps(mock_registration_response).encode()
                     mock_post.return_value = mock_response
 
                     with patch.object(sys.modules['aim_sdk.client'].AIMClient, 'report_detections'):
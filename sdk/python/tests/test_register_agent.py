@@ -124,6 +124,8 @@ class TestRegisterAgent:
                         call_args = mock_oauth.call_args
                         talks_to = call_args.kwargs['talks_to']
                         assert talks_to == ["filesystem-mcp", "github-mcp"]
+                        # Detections are handed on for reporting instead of re-scanned
+                        assert call_args.kwargs['mcp_detections'] == mcp_detections
 
     def test_register_agent_disable_auto_detect(self):
         """Test disabling auto-detection"""
@@ -223,6 +225,54 @@ class TestRegisterAgent:
                     # Should call registration, not use existing credentials
                     mock_oauth.assert_called_once()
 
+    def test_large_registration_gzipped_until_rejected(self, monkeypatch):
+        """Test large registration bodies are gzipped, and sent plain once the server rejects gzip"""
+        import gzip
+        from aim_sdk import client as client_module
+
+        monkeypatch.setattr(client_module, "_registration_gzip_supported", True)
+        registration_data = {"name": "big-agent", "capabilities": [f"capability-{i}" for i in range(200)]}
+        headers = {"Content-Type": "application/json"}
+
+        with patch('aim_sdk.client._REGISTRATION_SESSION.post') as mock_post:
+            mock_post.return_value = MagicMock(status_code=201)
+            client_module._post_registration("https://aim.example.com/api/v1/agents", registration_data, headers)
+
+            sent = mock_post.call_args[1]
+            assert sent["headers"]["Content-Encoding"] == "gzip"
+            assert json.loads(gzip.decompress(sent["data"])) == registration_data
+
+            mock_post.reset_mock()
+            mock_post.side_effect = [MagicMock(status_code=415), MagicMock(status_code=201), MagicMock(status_code=201)]
+            client_module._post_registration("https://aim.example.com/api/v1/agents", registration_data, headers)
+            client_module._post_registration("https://aim.example.com/api/v1/agents", {"name": "small"}, headers)
+
+        assert mock_post.call_count == 3
+        for call in mock_post.call_args_list[1:]:
+            assert "Content-Encoding" not in call[1]["headers"]
+        assert json.loads(mock_post.call_args_list[1][1]["data"]) == registration_data
+        assert client_module._registration_gzip_supported is False
+
+    def test_save_credentials_owner_only_despite_stale_temp_file(self, tmp_path, monkeypatch):
+        """Test saved credentials are owner-only even when a crashed run left a world-readable temp file"""
+        import os
+        from aim_sdk import client as client_module
+
+        creds_path = tmp_path / ".aim" / "credentials.json"
+        creds_path.parent.mkdir()
+        stale = creds_path.parent / "credentials.json.tmp"
+        stale.write_text("{}")
+        os.chmod(stale, 0o644)
+        monkeypatch.setattr(client_module, "_get_credentials_path", lambda: creds_path)
+
+        client_module._save_credentials("agent-a", {
+            "agent_id": "agent-id", "public_key": "pub", "private_key": "priv", "aim_url": "https://aim.example.com"
+        })
+
+        assert creds_path.stat().st_mode & 0o777 == 0o600
+        assert json.loads(creds_path.read_text())["agent-a"]["private_key"] == "priv"
+        assert sorted(p.name for p in creds_path.parent.iterdir()) == ["credentials.json", "credentials.json.tmp"]
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])